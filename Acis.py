@@ -6,7 +6,8 @@ Collection of classes necessary to read and analyse Standard ACIS Text (*.sat) f
 '''
 
 from __future__                 import unicode_literals
-import traceback, Part, Draft, os, FreeCAD, re
+import traceback, Part, Draft, os, FreeCAD, re, threading, hashlib
+from array                      import array
 from importerUtils              import *
 from FreeCAD                    import Vector as VEC, Rotation as ROT, Placement as PLC, Matrix as MAT, Base
 from math                       import pi, fabs, degrees, asin, sin, cos, tan, atan2, ceil, e, cosh, sinh, tanh, acos, acosh, asin, asinh, atan, atanh, log, sqrt, exp, log10
@@ -58,7 +59,10 @@ TAG_ENUM_VALUE    = 21 # value of an enumeration
 TAG_VECTOR_2D     = 22 # U-V-Vector
 TAG_INT64         = 23 # used by AutoCAD ASM int64 attributes
 
-_is64Bit = False
+# markers of the history section's end record - binary names are stored as sub-idents (tag, length, text) followed by the ident.
+HISTORY_END_TEXT   = ('End-of-ACIS-History-Section',)
+HISTORY_END_BINARY = (b'\x0E\x03End\x0E\x02of\x0E\x04ACIS\x0E\x07History\x0D\x07Section', b'\x0E\x03End\x0E\x02of\x0E\x03ASM\x0E\x07History\x0D\x07Section')
+
 
 # TAG_FALSE, TAG_TRUE value mappings
 RANGE           = {TAG_FALSE: 'I',              TAG_TRUE: 'F'}
@@ -91,10 +95,6 @@ CLOSURE     = {0: 'open',   1: 'closed',  2: 'periodic', 0x0B: 'open', 0x0A: 'pe
 SINGULARITY = {0: 'full',   1: 'v',       2: 'none',     0x0B: 'none', 0x0A: 'full'}
 VBL_CIRLE   = {0: 'circle', 1: 'ellipse', 3: 'unknown', 'cylinder': 'circle'}
 CURV_DIR    = {0: 'left',   2: 'right'}
-scale = 1.0
-
-_nameMtchAttr    = {}
-_dcIdxAttributes = {} # dict of an attribute list
 
 LENGTH_TEXT = re.compile('[ \t]*(\d+) +(.*)')
 
@@ -125,20 +125,50 @@ TOKEN_TRANSLATIONS = {
 	'#':          TAG_TERMINATOR
 }
 
-_reader = None
+# Tokens of text files are separated by white spaces, '#(){}' are tokens on their own.
+SAT_WHITESPACE = re.compile(r'[ \t\n\b\f]*')
+SAT_TOKEN      = re.compile(r'[ \t\n\b\f]*([#(){}]|[^ \t\n\b\f#(){}]+)')
+SAT_NUMBER     = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?$')
+SAT_NUMBER_SPC = re.compile(r'[-+]?(?:inf|infinity|nan)$', re.IGNORECASE)
+
+class AcisContext(object):
+	'''
+	The state of reading and building ACIS data: the current reader and the attributes registered by the nodes.
+	Each thread has its own current context => several ACIS streams can be read and built concurrently.
+	'''
+	def __init__(self, reader = None):
+		self.reader       = reader
+		self.version      = 7.0 # used if there is no reader
+		self.nameMatches  = {}
+		self.dcAttributes = {} # dict of an attribute list
+
+_contexts = threading.local()
+
+def getContext():
+	try:
+		return _contexts.current
+	except AttributeError:
+		context = AcisContext()
+		_contexts.current = context
+		return context
+
+def setContext(context):
+	'''
+	Makes the context the current one of this thread and returns the previous one.
+	'''
+	previous = getContext()
+	_contexts.current = context
+	return previous
 
 def getReader():
-	global _reader
-	return _reader
+	return getContext().reader
 
 def setReader(reader):
-	global _reader
 	clearEntities()
-	_reader = reader
+	getContext().reader = reader
 
 def getDcAttributes():
-	global _dcIdxAttributes
-	return _dcIdxAttributes
+	return getContext().dcAttributes
 
 def _getStr_(data, offset, end):
 	txt = data[offset: end].decode('cp1252')
@@ -228,10 +258,8 @@ class Law(object):
 		return None
 
 def init():
-	global _dcIdxAttributes
-
 	clearEntities()
-	_dcIdxAttributes = {}
+	getContext().dcAttributes = {}
 
 def addSubtypeNode(node):
 	getReader().addSubtype(node)
@@ -240,19 +268,19 @@ def getSubtypeNode(ref):
 	return getReader().getSubtyp(ref)
 
 def clearEntities():
-	global _nameMtchAttr
-	_nameMtchAttr.clear()
+	getContext().nameMatches.clear()
 
 def getScale():
 	return getReader().scale
 
 def setVersion(vers):
-	global version
-	version = vers
+	getContext().version = vers
 
 def getVersion():
-	global _reader
-	return _reader.version
+	context = getContext()
+	if (context.reader is None):
+		return context.version
+	return context.reader.version
 
 def isASM():
 	header = getReader().header
@@ -260,8 +288,7 @@ def isASM():
 
 def getAsmMajor():
 	# e.g.: Inventor 2010 -> 215, 2020 -> 225
-	global _reader
-	header = _reader.header
+	header = getReader().header
 	if (hasattr(header, 'asm')):
 		return header.asm[0]
 	return 0
@@ -269,7 +296,8 @@ def getAsmMajor():
 def createNode(entity):
 	if (entity is None): return None
 	if (entity.index < 0): return None
-	if (entity.node): return entity.node
+	if (entity._node): return entity._node
+	entity._resolved = True
 	try:
 		node = RECORD_2_NODE[entity.name]()
 	except:
@@ -291,8 +319,27 @@ def createNode(entity):
 		node.set(entity)
 	return node
 
+def materializeNode(entity):
+	'''
+	Creates the entity's node on first access - with the entity's reader as the current one.
+	'''
+	if (not entity._resolved):
+		entity._resolved = True
+		context = getContext()
+		current = context.reader
+		try:
+			reader = entity.reader
+			if (reader is not None):
+				context.reader = reader
+				if (getRecordKind(entity.name) == RECORD_GEOMETRY):
+					reader.createGeometryNodes(entity.index)
+			_resolveNode(entity)
+		finally:
+			context.reader = current
+	return entity._node
+
 def getValue(chunks, index):
-	val = chunks[index].val
+	val = chunks.valueAt(index)
 	return val, index + 1
 
 def getRefNode(entity, index, name):
@@ -329,7 +376,7 @@ def getIntegers(chunks, index, count):
 	return arr, i
 
 def getDcIndexMappings(chunks, index, attr):
-	global _dcIdxAttributes
+	dcAttributes = getContext().dcAttributes
 	m = []
 	count, i = getInteger(chunks, index)
 	for n in range(count):
@@ -337,10 +384,10 @@ def getDcIndexMappings(chunks, index, attr):
 		value, i = getInteger(chunks, i)
 		m.append((dcIdx, value))
 		try:
-			indexMappings = _dcIdxAttributes[dcIdx]
+			indexMappings = dcAttributes[dcIdx]
 		except:
 			indexMappings = IndexMappings()
-			_dcIdxAttributes[dcIdx] = indexMappings
+			dcAttributes[dcIdx] = indexMappings
 		indexMappings.append(attr)
 	return m, i
 
@@ -381,8 +428,7 @@ def getLength(chunks, index):
 	return l * getScale(), i
 
 def getText(chunks, index):
-	chunk = chunks[index]
-	if (chunk.tag == TAG_DOUBLE):
+	if (chunks.tagAt(index) == TAG_DOUBLE):
 		return getValue(chunks, index+1)
 	return getValue(chunks, index)
 
@@ -456,9 +502,8 @@ def getInterval(chunks, index, defMin, defMax, scale):
 	return Interval(lower, upper), i
 
 def getPoint(chunks, index):
-	chunk = chunks[index]
-	if (chunk.tag in [TAG_POSITION, TAG_VECTOR_3D]):
-		return chunk.val, index + 1
+	if (chunks.tagAt(index) in [TAG_POSITION, TAG_VECTOR_3D]):
+		return chunks.valueAt(index), index + 1
 	x, i =  getFloat(chunks, index)
 	y, i =  getFloat(chunks, i)
 	z, i =  getFloat(chunks, i)
@@ -745,6 +790,41 @@ def eliminateOuterFaces(faces, edges):
 		return faces[0]
 	return faces[0].multiFuse(faces[1:])
 
+def createFaceFromWires(surface, wires):
+	# ACIS lists the face's periphery loop first, all others are holes.
+	face = Part.Face(surface, wires[0])
+	if (len(wires) > 1):
+		face.cutHoles(wires[1:])
+	return face
+
+def shareVertices(edge, vertices):
+	# replace the edge's vertices by the shared ones at the same location
+	try:
+		replacements = []
+		for v in edge.Vertexes:
+			for shared in vertices:
+				if ((shared is not None) and (not shared.isSame(v)) and isEqual(v.Point, shared.Point)):
+					replacements.append((v, shared))
+					break
+		if (len(replacements) > 0):
+			return edge.replaceShape(replacements)
+	except:
+		pass
+	return edge
+
+def isValidFace(face, wires):
+	try:
+		return face.isValid() and (len(face.Wires) == len(wires)) and (face.Area > 0.0)
+	except:
+		return False
+
+def isValidPeriodicFace(face, wires):
+	# fixing adds seam edges and may join the loops => no edge must get lost.
+	try:
+		return face.isValid() and (len(face.Edges) >= sum(len(w.Edges) for w in wires)) and (face.Area > 0.0)
+	except:
+		return False
+
 def createCircle(center, normal, radius):
 	circle = Part.Circle(center, normal, radius.Length)
 	circle.XAxis = radius
@@ -999,7 +1079,7 @@ def getBlendValues(chunks, index):
 	name, i     = getValue(chunks, index)
 	if (getAsmMajor() > 222):
 		b, i = getBoolean(chunks, i)
-	if (chunks[i].tag in [TAG_FLOAT, TAG_LONG]):
+	if (chunks.tagAt(i) in [TAG_FLOAT, TAG_LONG]):
 		t, i = getInteger(chunks, i) # Enum value
 	else:
 		t = 1
@@ -1055,14 +1135,11 @@ def getBlendValues(chunks, index):
 	raise Exception("Unknown BlendValue %s!" %(name))
 
 def getNameMatchAttributes():
-	global _nameMtchAttr
-	return _nameMtchAttr
+	return getContext().nameMatches
 
 def releaseMemory():
-	global _dcIdxAttributes
-
 	clearEntities()
-	_dcIdxAttributes.clear()
+	getContext().dcAttributes.clear()
 
 def pointOnSurface(point, surface): # point should be an ACIS-Point and surface an ACIS-Spline-Surface
 	if (surface.shape is None):
@@ -1439,6 +1516,8 @@ class EndOfAcisData(object): pass
 
 # abstract super class
 class Entity(object):
+	_attributes = None # attribute class name => (position in chain, attribute)
+
 	def __init__(self):
 		self._attrib = None
 		self.entity  = None
@@ -1476,18 +1555,32 @@ class Entity(object):
 	def getSatTextSub(self, index): return ''.join("%s" %(c) for c in self.entity.chunks[index:])
 	def __lt__(self, other):
 		return self.index < other.index
-	def getAttribute(self, clsNames):
+	def indexAttributes(self):
+		'''
+		Indexes the attribute chain by the attributes' class names.
+		'''
+		attributes = {}
 		a = self.attrib
-		if (isString(clsNames)):
-			names = [clsNames]
-		else:
-			names = clsNames
-
+		pos = 0
 		while (a is not None) and (a.index >= 0):
-			if (a.__class__.__name__ in names):
-				return a
+			name = a.__class__.__name__
+			if (name not in attributes):
+				attributes[name] = (pos, a)
 			a = a.getNext()
-		return None
+			pos += 1
+		self._attributes = attributes
+
+	def getAttribute(self, clsNames):
+		if (self._attributes is None):
+			self.indexAttributes()
+		if (isString(clsNames)):
+			attr = self._attributes.get(clsNames)
+			return None if (attr is None) else attr[1]
+		# the first attribute in the chain with one of the class names.
+		found = [self._attributes[name] for name in clsNames if (name in self._attributes)]
+		if (len(found) == 0):
+			return None
+		return min(found, key=lambda attr: attr[0])[1]
 
 	def getName(self):
 		a = self.getAttribute('AttribGenName')
@@ -1706,27 +1799,55 @@ class Face(Topology):
 	def getParent(self):  return None if (self._parent is None)  else self._parent.node
 	def getSurface(self): return None if (self._surface is None) else self._surface.node
 	def buildCoEdges(self):
-		edges = []
+		loops = []
 		loop = self.getLoop()
 		while (loop is not None):
+			edges = []
 			coedges = loop.getCoEdges()
 			for index in coedges:
 				coEdge = coedges[index]
 				edge = coEdge.build()
 				if (edge is not None):
 					edges.append(edge)
+			loops.append(edges)
 			loop = loop.getNext()
-		return edges
+		return loops
+	def buildFromLoops(self, surface, loops):
+		'''Trims the surface directly by the loops' wires, returns None if this fails.'''
+		try:
+			geometry = surface.Surface
+			# a loop without edges would silently get lost!
+			if (all(len(edges) > 0 for edges in loops)):
+				wires = [Part.Wire(Part.__sortEdges__(edges)) for edges in loops]
+				if (all(w.isClosed() for w in wires)):
+					face = createFaceFromWires(geometry, wires)
+					if (geometry.isUPeriodic() or geometry.isVPeriodic()):
+						# loops on periodic surfaces (cylinder, cone, ...) need not to be bounded in the
+						# parameter space => let OCC add the missing seams and orient the wires.
+						tolerance = getReader().header.resabs
+						face.fix(tolerance, tolerance, tolerance * 1000)
+						if (isValidPeriodicFace(face, wires)):
+							return face
+					elif (isValidFace(face, wires)):
+						return face
+		except:
+			pass
+		return None
 	def build(self):
 		if (self.shape is None):
 			self._surface = self.getSurface()
-			edges = self.buildCoEdges()
+			loops = self.buildCoEdges()
+			edges = [edge for edges in loops for edge in edges]
 			if (self._surface is not None):
 				self.shape = self._surface.build()
 				if (self.shape is not None):
 					if (len(edges) > 0):
-						compound, elements = self.shape.generalFuse(edges)
-						self.shape = eliminateOuterFaces(elements[0], edges)
+						face = self.buildFromLoops(self.shape, loops)
+						if (face is None):
+							# fall back to fuse the surface with all edges and select the matching fragment
+							compound, elements = self.shape.generalFuse(edges)
+							face = eliminateOuterFaces(elements[0], edges)
+						self.shape = face
 				# edges can be empty because not all edges can be created right now :(
 			if (self.shape is None):
 				for edge in edges:
@@ -1834,12 +1955,7 @@ class CoEdge(Topology):
 	def getCurve(self):    return None if (self._curve is None)    else self._curve.node
 	def build(self):
 		e = self.getEdge()
-		c = e.getCurve()
-		if (c is not None):
-			p1 = e.getStart() if (e.sense == 'forward') else e.getEnd()
-			p2 = e.getEnd() if (e.sense == 'forward') else e.getStart()
-			return c.build(p1, p2)
-		return None
+		return None if (e is None) else e.build()
 class CoEdgeTolerance(CoEdge):
 	def __init__(self):
 		super(CoEdgeTolerance, self).__init__()
@@ -1849,18 +1965,18 @@ class CoEdgeTolerance(CoEdge):
 		i = super(CoEdgeTolerance, self).set(entity)
 		self.tStart, i  = getFloat(entity.chunks, i)
 		self.tEnd, i    = getFloat(entity.chunks, i)
-		if (entity.chunks[i].tag != TAG_TERMINATOR):
+		if (entity.chunks.tagAt(i) != TAG_TERMINATOR):
 			if (getReader().header.prodVer.startswith('ASM')):
 				asm = getAsmMajor()
 				if (asm > 214):
 					if (asm > 219):
-						if (entity.chunks[i].tag != TAG_ENTITY_REF):
+						if (entity.chunks.tagAt(i) != TAG_ENTITY_REF):
 							b, i = getBoolean(entity.chunks, i)
 					r, i = getRefNode(entity, i, None) # Never seen anything else than '$-1'
-				while (entity.chunks[i].tag != TAG_TERMINATOR):
-					if (entity.chunks[i].tag in [TAG_LONG, TAG_FLOAT]):
+				while (entity.chunks.tagAt(i) != TAG_TERMINATOR):
+					if (entity.chunks.tagAt(i) in [TAG_LONG, TAG_FLOAT]):
 						n, i = getInteger(entity.chunks, i)
-						if (entity.chunks[i].tag == TAG_TERMINATOR):
+						if (entity.chunks.tagAt(i) == TAG_TERMINATOR):
 							break
 					c, i = readCurve(entity.chunks, i)
 			else:
@@ -1876,6 +1992,7 @@ class Edge(Topology):
 		self._curve = None # Lying on one the Adjacent faces
 		self.sense  = 'forward'
 		self.text   = ''
+		self.shape  = None # FreeCAD shape of the edge, shared by both coedges
 	def set(self, entity):
 		i = super(Edge, self).set(entity)
 		self._start, i = getRefNode(entity, i, 'vertex')
@@ -1899,6 +2016,19 @@ class Edge(Topology):
 	def getEnd(self):    return None if (self._end   is None) else self._end.node.getPosition()
 	def getParent(self): return None if (self._owner is None) else self._owner.node
 	def getCurve(self):  return None if (self._curve is None) else self._curve.node
+	def getStartVertex(self): return None if (self._start is None) else self._start.node
+	def getEndVertex(self):   return None if (self._end   is None) else self._end.node
+	def build(self):
+		if (self.shape is None):
+			c = self.getCurve()
+			if (c is not None):
+				p1 = self.getStart() if (self.sense == 'forward') else self.getEnd()
+				p2 = self.getEnd() if (self.sense == 'forward') else self.getStart()
+				edge = c.build(p1, p2)
+				if (edge is not None):
+					vertices = [v.build() for v in (self.getStartVertex(), self.getEndVertex()) if (v is not None)]
+					self.shape = shareVertices(edge, vertices)
+		return self.shape
 	def getPoints(self):
 		points = []
 		ptStart = None if (self._start is None) else self._start.node
@@ -1919,12 +2049,13 @@ class Vertex(Topology):
 		self._owner = None # One of the vertex' owners
 		self._point = None # The vertex' location
 		self.count  = -1   # Number of edges using this vertex
+		self.shape  = None # FreeCAD shape of the vertex, shared by all edges
 	def set(self, entity):
 		i = super(Vertex, self).set(entity)
 		self._owner, i = getRefNode(entity, i, 'edge')
 		if (getAsmMajor() > 217): i += 1
 		# inventor-version: 2010 -> workaround
-		if (entity.chunks[i].tag != 0xC):
+		if (entity.chunks.tagAt(i) != 0xC):
 			i += 1 # number of edges using this vertex
 		self._point, i  = getRefNode(entity, i, 'point')
 		return i
@@ -1933,6 +2064,12 @@ class Vertex(Topology):
 	def getPosition(self):
 		p = self.getPoint()
 		return None if (p is None) else p.position
+	def build(self):
+		if (self.shape is None):
+			p = self.getPosition()
+			if (p is not None):
+				self.shape = Part.Vertex(p)
+		return self.shape
 class VertexTolerance(Vertex):
 	def __init__(self):
 		super(VertexTolerance, self).__init__()
@@ -2325,7 +2462,7 @@ class CurveInt(Curve):     # interpolated ('Bezier') curve "intcurve-curve"
 		c, i = readCurve(chunks, i)
 		if (inventor):
 			b, i = getBoolean(chunks, i)
-			if (chunks[i].tag == TAG_SUBTYPE_CLOSE):
+			if (chunks.tagAt(i) == TAG_SUBTYPE_CLOSE):
 				return i
 		r, i = getInterval(chunks, i, MIN_INF, MAX_INF, getScale())
 		t, i  = getText(chunks, i)    # something like 'surf1' or 'surf2'
@@ -2385,7 +2522,7 @@ class CurveInt(Curve):     # interpolated ('Bezier') curve "intcurve-curve"
 		else:
 			i += 1  #skip Number
 			i += 1  #skip Boolean
-			if (chunks[i].tag != TAG_SUBTYPE_CLOSE):
+			if (chunks.tagAt(i) != TAG_SUBTYPE_CLOSE):
 			   b2, i = getBoolean(chunks, i) # should be F
 		return i
 	def setSurface(self, chunks, index, inventor):
@@ -2426,7 +2563,7 @@ class CurveInt(Curve):     # interpolated ('Bezier') curve "intcurve-curve"
 	def setSubtype(self, chunks, index):
 		self.sense, i = getEnumByTag(chunks, index, SENSE)
 		i = self.setBulk(chunks, i + 1)
-		assert (chunks[i].tag == TAG_SUBTYPE_CLOSE), u"-%s %s - pending chunks to read: %s" %(self.index, self.subtype, chunks[i:])
+		assert (chunks.tagAt(i) == TAG_SUBTYPE_CLOSE), u"-%s %s - pending chunks to read: %s" %(self.index, self.subtype, chunks[i:])
 		self.range, i = getInterval(chunks, i + 1, MIN_INF, MAX_INF, getScale())
 		return i
 	def build(self, start=None, end=None):
@@ -2510,7 +2647,7 @@ class CurveP(Curve):       # projected curve "pcurve" for each point in CurveP:
 		self.sense, i = getEnumByTag(chunks, index, SENSE)
 		self.curve = CurveInt()
 		i = self.curve.setBulk(chunks, i + 1)
-		assert chunks[i].tag == TAG_SUBTYPE_CLOSE
+		assert chunks.tagAt(i) == TAG_SUBTYPE_CLOSE
 		self.surface = self.curve.getSurface()
 		return i
 	def setRef(self, chunks, index):
@@ -2534,7 +2671,7 @@ class CurveP(Curve):       # projected curve "pcurve" for each point in CurveP:
 	def setSubtype(self, chunks, index):
 		self.sense, i = getEnumByTag(chunks, index, SENSE)
 		i = self.setBulk(chunks, i + 1)
-		assert (chunks[i].tag == TAG_SUBTYPE_CLOSE), u"-%s %s - pending chunks to read: %s" %(self.index, self.subtype, chunks[i:])
+		assert (chunks.tagAt(i) == TAG_SUBTYPE_CLOSE), u"-%s %s - pending chunks to read: %s" %(self.index, self.subtype, chunks[i:])
 		self.u, i = getFloat(chunks, i + 1)
 		self.v, i = getFloat(chunks, i)
 		return i
@@ -2830,7 +2967,7 @@ class SurfaceSpline(Surface):
 			return (txt, srf, cur, bs2, vec, (bs3, num, bs4)), i
 		return (txt, srf, cur, bs2, vec, None), i
 	def _readScaleClLoft(self, chunks, index):
-		if (chunks[index].tag in [TAG_TRUE, TAG_FALSE]):
+		if (chunks.tagAt(index) in [TAG_TRUE, TAG_FALSE]):
 			## FIXME!
 			return None, index
 		n, i = getInteger(chunks, index)
@@ -2840,7 +2977,7 @@ class SurfaceSpline(Surface):
 			ck, i = readCurve(chunks, i)
 			lk, i = self._readLoftData(chunks, i)
 			lofts.append([nk, ck, lk])
-		if (not chunks[i].tag in [TAG_UTF8_U8, TAG_IDENT, TAG_SUBIDENT]):
+		if (not chunks.tagAt(i) in [TAG_UTF8_U8, TAG_IDENT, TAG_SUBIDENT]):
 			## FIXME!
 			return None, index
 		cur, i = readCurve(chunks, i)
@@ -2857,7 +2994,7 @@ class SurfaceSpline(Surface):
 		skin.f1, i   = getFloat(chunks, i)
 		if (inventor):
 			n, i = getInteger(chunks, i)
-			if (not chunks[i].tag in [TAG_UTF8_U8, TAG_IDENT, TAG_SUBIDENT]):
+			if (not chunks.tagAt(i) in [TAG_UTF8_U8, TAG_IDENT, TAG_SUBIDENT]):
 				for k in range(0, n):
 					i += 1
 					curve, i = readCurve(chunks, i)
@@ -3104,7 +3241,7 @@ class SurfaceSpline(Surface):
 		elif (singularity == 'none'):
 			s12, i = getFloats(chunks, i, 9)
 			tol11, i = getLength(chunks, i)
-			if (not chunks[i].tag in [TAG_UTF8_U8, TAG_IDENT, TAG_SUBIDENT]):
+			if (not chunks.tagAt(i) in [TAG_UTF8_U8, TAG_IDENT, TAG_SUBIDENT]):
 				i += 1 # newer Inventor versions (>2017
 			p13, i = readBS2Curve(chunks, i)
 		else:
@@ -3162,7 +3299,7 @@ class SurfaceSpline(Surface):
 		self.sng2, i  = getSingularity(chunks, i)
 		# 1|2, 0?, 0, nubs
 		b, i = getInteger(chunks, i)
-		while (not chunks[i+1].tag in [TAG_UTF8_U8, TAG_IDENT, TAG_SUBIDENT]):
+		while (not chunks.tagAt(i+1) in [TAG_UTF8_U8, TAG_IDENT, TAG_SUBIDENT]):
 			i += 1 ## FIXME
 		i = self.setSurfaceShape(chunks, i, inventor, 'loft_spl_sur')
 		return i
@@ -3198,7 +3335,7 @@ class SurfaceSpline(Surface):
 			e3, i = getBoolean(chunks, i) # 0x0B
 			if (e3):
 				e4, i = getBoolean(chunks, i) # 0x0B
-			if (chunks[i].tag in [TAG_TRUE, TAG_FALSE]):
+			if (chunks.tagAt(i) in [TAG_TRUE, TAG_FALSE]):
 				e5, i = getBoolean(chunks, i) # 0x0B
 		i = self.setSurfaceShape(chunks, i, inventor, 'off_spl_sur')
 		return i
@@ -3231,7 +3368,7 @@ class SurfaceSpline(Surface):
 		if ((vrs > 16.0) and (isASM() == False)): # ??? correct ???
 			r11, i = getText(chunks, i)
 		self.s1, i      = getEnumByTag(chunks, i, SURF_SWEEP)
-		if (chunks[i].tag == TAG_LONG):
+		if (chunks.tagAt(i) == TAG_LONG):
 			n, i = getInteger(chunks, i) # ???? s1 = normal
 			self.profile, i = readCurve(chunks, i) # prfile[0]
 			self.prof_rng, i  = getInterval(chunks, i, MIN_INF, MAX_INF, 1.0)
@@ -3246,7 +3383,7 @@ class SurfaceSpline(Surface):
 			self.v4, i = getVector(chunks, i)       #
 			self.v5, i = getVector(chunks, i)       #
 			self.v6, i = getVector(chunks, i)       #
-			if (chunks[i].tag in [TAG_LONG, TAG_FLOAT]):
+			if (chunks.tagAt(i) in [TAG_LONG, TAG_FLOAT]):
 				n2, i = getInteger(chunks, i)		    # 2
 				bln2, i = getBoolean(chunks, i)		    # F
 				self.path, i = readCurve(chunks, i)     # sweep-path
@@ -3379,17 +3516,17 @@ class SurfaceSpline(Surface):
 		rU, i = getInterval(chunks, i, MIN_INF, MAX_INF, getScale())
 		rV, i = getInterval(chunks, i, MIN_INF, MAX_INF, getScale())
 		typ, i = getInteger(chunks, i)
-		assert (chunks[i].tag == TAG_SUBTYPE_OPEN)
+		assert (chunks.tagAt(i) == TAG_SUBTYPE_OPEN)
 		i += 1
 		# block: ((t_spl_subtrans_object, flag?, values (str))|ref number)
 		if (chunks[i].val == 't_spl_subtrans_object'):
 			self.tSplineText, i = getValue(chunks, i + 1)
-			if (chunks[i].tag != TAG_UTF8_U16): i += 1
+			if (chunks.tagAt(i) != TAG_UTF8_U16): i += 1
 			self.tSplineValues, i = getValue(chunks, i)
 		else:
 			assert (chunks[i].val == 'ref')
 			self.tRef, i = getInteger(chunks, i + 1)
-		assert chunks[i].tag == TAG_SUBTYPE_CLOSE
+		assert chunks.tagAt(i) == TAG_SUBTYPE_CLOSE
 		num, i  = getInteger(chunks, i  + 1)
 		return i
 	def setVertexBlend(self, chunks, index, inventor):
@@ -3559,7 +3696,7 @@ class SurfaceSpline(Surface):
 			self.entity = AcisEntity('spline')
 			self.entity.index = self.index
 		i = self.setBulk(chunks, i + 1)
-		assert (chunks[i].tag == TAG_SUBTYPE_CLOSE), u"-%s %s - pending chunks to read: %s" %(self.index, self.subtype, chunks[i:])
+		assert (chunks.tagAt(i) == TAG_SUBTYPE_CLOSE), u"-%s %s - pending chunks to read: %s" %(self.index, self.subtype, chunks[i:])
 		self.rangeU, i = getInterval(chunks, i + 1, MIN_INF, MAX_INF, getScale())
 		self.rangeV, i = getInterval(chunks, i, MIN_INF, MAX_INF, getScale())
 		return i
@@ -3585,7 +3722,7 @@ class SurfaceSpline(Surface):
 						self.surface.Radius = radius.Length + 1.0
 						self.shape = self.surface.toShape()
 					else:
-						logError("    Can't create cylinder from profile (%r)" %(self.profile))
+						logError("    Can't create cylinder from profile (%r)", self.profile)
 			elif (self.subclass == 'VBL_SURF'):
 				if (self.surface is None):
 					edges = []
@@ -3631,7 +3768,7 @@ class SurfaceSpline(Surface):
 					if (curve is not None):
 						self.shape = Part.SurfaceOfRevolution(curve.Curve, self.loc, self.dir).toShape()
 					else:
-						logError("    Can't create curve for revolution of (%r)" %(self.profile))
+						logError("    Can't create curve for revolution of (%r)", self.profile)
 			elif (self.subclass == 'sum_spl_sur'):
 				rngU = self.tolerance[2]
 				curve1 = self.curve1.build(rngU.getLowerLimit(), rngU.getUpperLimit())
@@ -3642,9 +3779,9 @@ class SurfaceSpline(Surface):
 						self.shape = Part.makeRuledSurface(curve1, curve2)
 						self.shape.translate(self.origin)
 					else:
-						logError("    Can't create ruled surface of 2nd curve - (%r)" %(self.curve2))
+						logError("    Can't create ruled surface of 2nd curve - (%r)", self.curve2)
 				else:
-					logError("    Can't create ruled surface of 1st curve - (%r)" %(self.curve1))
+					logError("    Can't create ruled surface of 1st curve - (%r)", self.curve1)
 			elif (self.subclass == 'sweep_spl_sur'):
 				profile = self.profile.build(None, None)
 				if (profile):
@@ -4094,7 +4231,7 @@ class AttribNamingMatchingNMxFeatureOrientation(AttribNamingMatching):
 		super(AttribNamingMatchingNMxFeatureOrientation, self).__init__()
 	def set(self, entity):
 		i = super(AttribNamingMatchingNMxFeatureOrientation, self).set(entity)
-		if (entity.chunks[i].tag != TAG_ENTITY_REF): i += 1
+		if (entity.chunks.tagAt(i) != TAG_ENTITY_REF): i += 1
 		self.ref1, i = getRefNode(entity, i, 'curve')
 		self.ref2, i = getRefNode(entity, i, 'curve')
 		return i
@@ -4251,15 +4388,15 @@ class AttribNamingMatchingNMxBrepTagNameGenerated(AttribNamingMatchingNMxBrepTag
 	# n1, n2, n3
 	def __init__(self): super(AttribNamingMatchingNMxBrepTagNameGenerated, self).__init__()
 	def set(self, entity):
-		global _nameMtchAttr
+		nameMatches = getContext().nameMatches
 		i = super(AttribNamingMatchingNMxBrepTagNameGenerated, self).set(entity)
 		self.key, i = getInteger(entity.chunks, i)
 		self.n2,  i = getInteger(entity.chunks, i)
 		self.n3,  i = getInteger(entity.chunks, i)
-		lst = _nameMtchAttr.get(self.key, None)
+		lst = nameMatches.get(self.key, None)
 		if (lst is None):
 			lst = []
-			_nameMtchAttr[self.key] = lst
+			nameMatches[self.key] = lst
 		lst.append(self)
 		return i
 class AttribNamingMatchingNMxBrepTagNameGrillSplitFace(AttribNamingMatchingNMxBrepTagName):
@@ -4380,8 +4517,7 @@ class AcisChunkLong(_AcisChunkNumber_):
 	def __init__(self, value = None):
 		super(AcisChunkLong, self).__init__(TAG_LONG, value)
 	def read(self, data, offset):
-		global _is64Bit
-		self.val, i = getSInt64(data, offset) if _is64Bit else getSInt32(data, offset)
+		self.val, i = getSInt64(data, offset) if (getReader().is64Bit) else getSInt32(data, offset)
 		return i
 class AcisChunkFloat(_AcisChunkNumber_):
 	'''32Bit IEEE float value'''
@@ -4450,8 +4586,7 @@ class AcisChunkEnumValue(_AcisChunk_):
 				pass
 		return u"%s " %(val)
 	def read(self, data, offset):
-		global _is64Bit
-		self.val, i = getUInt64(data, offset) if _is64Bit else getUInt32(data, offset)
+		self.val, i = getUInt64(data, offset) if (getReader().is64Bit) else getUInt32(data, offset)
 		return i
 	def getValue(self):
 		if (values):
@@ -4541,6 +4676,120 @@ ACIS_VALUE_CHUNKS = {
 	TAG_INT64        : AcisChunkHuge,
 }
 
+# storage kinds of the chunks in AcisChunks
+CHUNK_CONST  = 0 # shared instance from ACIS_CONST_CHUNKS
+CHUNK_FLOAT  = 1 # single value in floats
+CHUNK_ARRAY  = 2 # consecutive values in floats
+CHUNK_INT    = 3 # single value in ints
+CHUNK_OBJECT = 4 # chunk instance in objects
+
+ACIS_ARRAY_SIZES = {TAG_POSITION: 3, TAG_VECTOR_3D: 3, TAG_VECTOR_2D: 2}
+
+# python 2 has no 'q' typecode, overflows are stored as objects.
+_INT_TYPECODE = 'q' if (sys.version_info.major > 2) else 'l'
+
+class AcisChunks(object):
+	'''
+	Columnar storage of the chunks of a binary (SAB) entity.
+	Tags, numbers and vectors are kept in typed arrays, only the remaining
+	chunks (texts, references, enumerations) as instances. Number chunks are
+	created when accessed, so the entity's chunks still behave like a list.
+	'''
+	__slots__ = ('tags', 'kinds', 'offsets', 'floats', 'ints', 'objects')
+
+	def __init__(self):
+		self.tags    = array('B')
+		self.kinds   = array('B')
+		self.offsets = array('l')
+		self.floats  = array('d')
+		self.ints    = array(_INT_TYPECODE)
+		self.objects = []
+
+	def _add(self, tag, kind, offset):
+		self.tags.append(tag)
+		self.kinds.append(kind)
+		self.offsets.append(offset)
+
+	def appendConst(self, tag):
+		self._add(tag, CHUNK_CONST, 0)
+
+	def appendFloat(self, tag, value):
+		self._add(tag, CHUNK_FLOAT, len(self.floats))
+		self.floats.append(value)
+
+	def appendFloats(self, tag, values):
+		self._add(tag, CHUNK_ARRAY, len(self.floats))
+		self.floats.extend(values)
+
+	def appendInt(self, tag, value):
+		try:
+			self.ints.append(value)
+			self._add(tag, CHUNK_INT, len(self.ints) - 1)
+		except OverflowError:
+			self.append(ACIS_VALUE_CHUNKS[tag](value))
+
+	def append(self, chunk):
+		self._add(chunk.tag, CHUNK_OBJECT, len(self.objects))
+		self.objects.append(chunk)
+
+	def tagAt(self, index):
+		'''
+		Returns the tag of the chunk without creating the chunk.
+		'''
+		return self.tags[index]
+
+	def valueAt(self, index):
+		'''
+		Returns the value of the chunk without creating the chunk.
+		'''
+		kind = self.kinds[index]
+		if (kind == CHUNK_CONST):
+			return ACIS_CONST_CHUNKS[self.tags[index]].val
+		offset = self.offsets[index]
+		if (kind == CHUNK_OBJECT):
+			return self.objects[offset].val
+		if (kind == CHUNK_FLOAT):
+			return self.floats[offset]
+		if (kind == CHUNK_INT):
+			return self.ints[offset]
+		return tuple(self.floats[offset:offset + ACIS_ARRAY_SIZES[self.tags[index]]])
+
+	def _chunk(self, index):
+		kind = self.kinds[index]
+		tag  = self.tags[index]
+		if (kind == CHUNK_CONST):
+			return ACIS_CONST_CHUNKS[tag]
+		offset = self.offsets[index]
+		if (kind == CHUNK_OBJECT):
+			return self.objects[offset]
+		if (kind == CHUNK_FLOAT):
+			return ACIS_VALUE_CHUNKS[tag](self.floats[offset])
+		if (kind == CHUNK_INT):
+			return ACIS_VALUE_CHUNKS[tag](self.ints[offset])
+		return ACIS_VALUE_CHUNKS[tag](tuple(self.floats[offset:offset + ACIS_ARRAY_SIZES[tag]]))
+
+	def __len__(self):
+		return len(self.tags)
+
+	def __getitem__(self, index):
+		if (isinstance(index, slice)):
+			return [self._chunk(i) for i in range(*index.indices(len(self.tags)))]
+		return self._chunk(index)
+
+	def __setitem__(self, index, chunk):
+		# replaced chunks (e.g. by getBoolean or getEnumByTag) are kept as instances
+		self.tags[index]    = chunk.tag
+		self.kinds[index]   = CHUNK_OBJECT
+		self.offsets[index] = len(self.objects)
+		self.objects.append(chunk)
+
+	def __iter__(self):
+		for i in range(len(self.tags)):
+			yield self._chunk(i)
+
+	def __repr__(self):
+		return repr(self[:])
+
 class History(object):
 	def __init__(self, entity):
 		super(History, self).__init__()
@@ -4622,33 +4871,31 @@ class AcisReader(object):
 		self.resolved   = False
 		self.bodies     = []
 		self._subtypes  = []
+		self._geometry  = 0 # the index of the next geometry record that may have to be created.
+		self.is64Bit    = False # references, longs and enumerations are stored as 64Bit values (ASM BinaryFile8).
+		self.readHistory = isAcisHistoryRequired()
+		self.digest     = None # hash of the raw data - used as key for cached shapes.
+
+	def __getstate__(self):
+		# the stream is only required while reading.
+		state = self.__dict__.copy()
+		state['_stream'] = None
+		return state
 
 	def _hasNext(self):
 		return self._pos < self._length
 
-	def _skipWhiteSpace(self):
-		while (self._hasNext()):
-			if (not self._data[self._pos] in ' \t\n\b\f'):
-				break
-			self._pos += 1
-
-	def _isSingleChar(self):
-		if (self._hasNext()):
-			return (self._data[self._pos] in '#(){}')
-		return False
-
-	def _findEnd(self):
-		while (self._hasNext()):
-			if (self._data[self._pos] in ' \t\n\b\f#(){}'):
-				break
-			self._pos += 1
-
 	def _translateChunk(self, token):
+		tag = TOKEN_TRANSLATIONS.get(token, None)
+		if (tag is not None):
+			return tag, token
+		if (SAT_NUMBER.match(token)):
+			return TAG_DOUBLE, float(token)
 		if (token.startswith('@')):
 			count = int(token[1:])
-			self._skipWhiteSpace()
-			text = self._data[self._pos:self._pos+count]
-			self._pos += count + 1
+			start = SAT_WHITESPACE.match(self._data, self._pos).end()
+			text  = self._data[start:start + count]
+			self._pos = start + count + 1
 			return TAG_UTF8_U16, text
 		if (token.startswith('$')):
 			ref = int(token[1:])
@@ -4666,39 +4913,69 @@ class AcisReader(object):
 			dummy = self._readChunkText()
 			assert (dummy == ')'), "Expected ')' but found '%s'!" %(dummy)
 			return TAG_VECTOR_3D, [float(tokX), float(tokY), float(tokZ)]
-		tag = TOKEN_TRANSLATIONS.get(token, None)
-		val = token
-		if (tag is None):
-			# try to convert the value into a float value
-			tag = TAG_UTF8_U8
-			try:
-				val = float(val)
-				tag = TAG_DOUBLE
-			except:
-				pass
-		return tag, val
+		if (SAT_NUMBER_SPC.match(token)):
+			return TAG_DOUBLE, float(token)
+		return TAG_UTF8_U8, token
 
 	def _readChunkText(self):
-		self._skipWhiteSpace()
-		if (self._isSingleChar()):
-			token = self._data[self._pos]
-			self._pos += 1
-		else:
-			start = self._pos
-			self._findEnd()
-			if (start < self._pos):
-				token = self._data[start:self._pos]
+		match = SAT_TOKEN.match(self._data, self._pos)
+		if (match is None):
+			self._pos = self._length
+			return None
+		self._pos = match.end()
+		return match.group(1)
+
+	def _readChunksBinary(self, chunks):
+		# Reads the chunks of an entity directly into the columns of AcisChunks.
+		data    = self._data
+		pos     = self._pos
+		length  = self._length
+		is64Bit = self.is64Bit
+		while (pos < length):
+			tag, = UINT8(data, pos)
+			if (tag in ACIS_CONST_CHUNKS):
+				chunks.appendConst(tag)
+				pos += 1
+				if (tag == TAG_TERMINATOR):
+					break
+			elif (tag == TAG_DOUBLE):
+				chunks.appendFloat(tag, FLOAT64(data, pos + 1)[0])
+				pos += 9
+			elif (tag == TAG_POSITION or tag == TAG_VECTOR_3D):
+				chunks.appendFloats(tag, FLOAT64_3D(data, pos + 1))
+				pos += 25
+			elif (tag == TAG_VECTOR_2D):
+				chunks.appendFloats(tag, FLOAT64_2D(data, pos + 1))
+				pos += 17
+			elif (tag == TAG_FLOAT):
+				chunks.appendFloat(tag, FLOAT32(data, pos + 1)[0])
+				pos += 5
+			elif (tag == TAG_LONG):
+				if (is64Bit):
+					chunks.appendInt(tag, SINT64(data, pos + 1)[0])
+					pos += 9
+				else:
+					chunks.appendInt(tag, SINT32(data, pos + 1)[0])
+					pos += 5
+			elif (tag == TAG_SHORT):
+				chunks.appendInt(tag, SINT16(data, pos + 1)[0])
+				pos += 3
+			elif (tag == TAG_INT64):
+				chunks.appendInt(tag, SINT64(data, pos + 1)[0])
+				pos += 9
 			else:
-				token = None
-		return token
+				self._pos = pos
+				chunks.append(self._readChunkBinary())
+				pos = self._pos
+		self._pos = pos
+		return
 
 	def _readChunkBinary(self):
 		tag, self._pos = getUInt8(self._data, self._pos)
 		chunk = ACIS_CONST_CHUNKS.get(tag, None)
 		if (chunk is None):
 			if (tag == 	TAG_ENTITY_REF):
-				global _is64Bit
-				refIdx, self._pos = getSInt64(self._data, self._pos) if _is64Bit else getSInt32(self._data, self._pos)
+				refIdx, self._pos = getSInt64(self._data, self._pos) if (self.is64Bit) else getSInt32(self._data, self._pos)
 				try:
 					chunk = self._refChunks[refIdx]
 				except:
@@ -4751,8 +5028,7 @@ class AcisReader(object):
 			self.header.flags, self._pos   = getUInt32(self._data, self._pos)
 			self.header.version = int2version(self.header.version)
 		elif (self._data[0:15] == b'ASM BinaryFile8'):
-			global _is64Bit
-			_is64Bit = True
+			self.is64Bit = True
 			self.header.version, self._pos = getUInt64(self._data, 15)
 			self.header.records, self._pos = getUInt64(self._data, self._pos)
 			self.header.bodies, self._pos  = getUInt64(self._data, self._pos)
@@ -4777,22 +5053,23 @@ class AcisReader(object):
 			name = self._readChunkText()
 		record = AcisEntity(name)
 		record.index = id
-		while (self._hasNext()):
+		record.reader = self
+		chunks = record.chunks
+		token  = self._readChunkText()
+		while (token is not None):
+			tag, val = self._translateChunk(token)
+			if (tag == TAG_ENTITY_REF):
+				chunk = val
+			elif (tag == TAG_FALSE or tag == TAG_TRUE):
+				chunk = AcisChunkEnumValue(tag, tag, BOOLEAN)
+			else:
+				chunk = ACIS_CONST_CHUNKS.get(tag, None)
+				if (chunk is None):
+					chunk = ACIS_VALUE_CHUNKS[tag](val)
+			chunks.append(chunk)
+			if (tag == TAG_TERMINATOR):
+				break
 			token = self._readChunkText()
-			if (token):
-				tag, val = self._translateChunk(token)
-				if (tag == TAG_ENTITY_REF):
-					chunk = val
-				elif (tag in [TAG_FALSE, TAG_TRUE]):
-					chunk = AcisChunkEnumValue(tag, tag, BOOLEAN)
-				else:
-					try:
-						chunk = ACIS_CONST_CHUNKS[tag]
-					except:
-						chunk = ACIS_VALUE_CHUNKS[tag](val)
-				record.chunks.append(chunk)
-				if (chunk.tag == TAG_TERMINATOR):
-					break
 		return record, id + 1
 
 	def _readRecordBinary(self, index):
@@ -4809,12 +5086,10 @@ class AcisReader(object):
 			names.append(chunk.val)
 		record = AcisEntity('-'.join(names))
 		record.index = id
+		record.reader = self
 		if (not record.name.startswith('End-of-')):
-			while (self._hasNext()):
-				chunk = self._readChunkBinary()
-				record.chunks.append(chunk)
-				if (chunk.tag == TAG_TERMINATOR):
-					break
+			record.chunks = AcisChunks()
+			self._readChunksBinary(record.chunks)
 		return record, id + 1
 
 	def _resolfChunkReferences(self):
@@ -4826,9 +5101,34 @@ class AcisReader(object):
 		self._refChunks[-1].entity = None
 		return
 
+	def _skipHistory(self, markers):
+		'''
+		Skips the delta states of the history section without decoding them - continues with the section's end record.
+		'''
+		end = self._length
+		for marker in markers:
+			pos = self._data.find(marker, self._pos)
+			if ((pos >= 0) and (pos < end)):
+				end = pos
+		self._pos = end
+		return
+
 	def addSubtype(self, node):
 		self._subtypes.append(node)
 
+	def createGeometryNodes(self, index):
+		'''
+		Creates the nodes of all geometry records before the index.
+		Sub-types are referenced by the order of their definition => geometry nodes have to be created in file order.
+		'''
+		end = min(index, len(self._entities))
+		while (self._geometry < end):
+			record = self._entities[self._geometry]
+			self._geometry += 1
+			if ((record is not None) and (getRecordKind(record.name) == RECORD_GEOMETRY)):
+				materializeNode(record)
+		return
+
 	def getSubtyp(self, ref):
 		try:
 			return self._subtypes[ref]
@@ -4841,11 +5141,17 @@ class AcisReader(object):
 	def getEntities(self):
 		return self._entities
 
+	def _setData(self, data):
+		self._data   = data
+		self._length = len(data)
+		if (not isinstance(data, bytes)):
+			data = data.encode('utf8')
+		self.digest  = hashlib.sha1(data).hexdigest()
+
 	def readText(self):
 		setReader(self)
 		self._readHeaderText()
-		self._data   = self._stream.read()
-		self._length = len(self._data)
+		self._setData(self._stream.read())
 		self._pos    = 0
 		historySec   = False
 		index        = 0
@@ -4863,9 +5169,12 @@ class AcisReader(object):
 				if (record.name == "Begin-of-ACIS-History-Data"):
 					historySec = True
 					entityIdx = record.index
-					self.history = History(record)
-					self.history.index = entityIdx
 					index = 0
+					if (self.readHistory):
+						self.history = History(record)
+						self.history.index = entityIdx
+					else:
+						self._skipHistory(HISTORY_END_TEXT)
 				elif (record.name == "End-of-ACIS-History-Section"):
 					historySec = False
 					record.index = -1
@@ -4884,8 +5193,8 @@ class AcisReader(object):
 		return True
 
 	def readBinary(self):
-		self._data   = self._stream.read()
-		self._length = len(self._data)
+		setReader(self)
+		self._setData(self._stream.read())
 		historySec   = False
 		index        = 0
 		entityIdx    = 0
@@ -4895,9 +5204,12 @@ class AcisReader(object):
 			if (record.name == "Begin-of-ACIS-History-Data"):
 				historySec = True
 				entityIdx = record.index
-				self.history = History(record)
-				self.history.index = entityIdx
 				index = 0
+				if (self.readHistory):
+					self.history = History(record)
+					self.history.index = entityIdx
+				else:
+					self._skipHistory(HISTORY_END_BINARY)
 			elif (record.name == "End-of-ACIS-History-Section"):
 				historySec = False
 				record.index = -1
@@ -4912,15 +5224,40 @@ class AcisReader(object):
 				else:
 					self._entities.append(record)
 		self._resolfChunkReferences()
-		setReader(self)
 		return True
 
+class AcisChunkList(list):
+	'''
+	The chunks of a text (SAT) entity - with the same accessors as AcisChunks.
+	'''
+	def tagAt(self, index):
+		return self[index].tag
+
+	def valueAt(self, index):
+		return self[index].val
+
 class AcisEntity(object):
 	def __init__(self, name):
-		self.chunks = []
-		self.name   = name
-		self.index  = -1
-		self.node   = None
+		self.chunks    = AcisChunkList()
+		self.name      = name
+		self.index     = -1
+		self.reader    = None
+		self._node     = None
+		self._resolved = False
+
+	@property
+	def node(self):
+		'''
+		The entity's node - created on first access.
+		'''
+		if (self._resolved):
+			return self._node
+		return materializeNode(self)
+
+	@node.setter
+	def node(self, node):
+		self._node     = node
+		self._resolved = True
 
 	def __repr__(self):
 		return "%s %s" %(self.name, ''.join(c.__repr__() for c in self.chunks))
@@ -5302,17 +5639,70 @@ def _resolveNode(entity):
 		logError(u"    Can't resolve '%s' - %s", entity, e)
 	return
 
+RECORD_OTHER    = 0 # created on first access
+RECORD_GEOMETRY = 1 # created on first access, but in file order
+RECORD_REGISTER = 2 # created right after reading, as they register themselves for DC-index or name-matching lookups or update the header
+
+_REGISTERING_NODES = (AsmHeader, AttribNamingMatchingNMxMatchedEntity, AttribNamingMatchingNMxFFColorEntity, AttribNamingMatchingNMxThreadEntity, AttribNamingMatchingNMxBrepTag, AttribNamingMatchingNMxBrepTagNameGenerated)
+_recordKinds = {}
+
+def getRecordKind(name):
+	'''
+	Returns when the node of a record with the given name has to be created.
+	'''
+	kind = _recordKinds.get(name)
+	if (kind is None):
+		types = name.split('-')
+		cls   = None
+		i     = 0
+		while ((cls is None) and (i < len(types))):
+			cls = RECORD_2_NODE.get('-'.join(types[i:]))
+			i += 1
+		if (cls is None):
+			kind = RECORD_OTHER
+		elif (issubclass(cls, _REGISTERING_NODES)):
+			kind = RECORD_REGISTER
+		elif (issubclass(cls, (Curve, Surface))):
+			kind = RECORD_GEOMETRY
+		else:
+			kind = RECORD_OTHER
+		_recordKinds[name] = kind
+	return kind
+
+def createNodes(acis):
+	'''
+	Creates the nodes of the bodies and of the registering records.
+	All other nodes are created on first access, e.g. while traversing the bodies' topology.
+	Returns the nodes of the bodies.
+	'''
+	bodies = []
+	add    = True
+	for entity in acis.getEntities():
+		if (entity is not None):
+			if (add and (entity.name == 'body')):
+				node = materializeNode(entity)
+				if (node is not None):
+					bodies.append(node)
+			elif (getRecordKind(entity.name) == RECORD_REGISTER):
+				materializeNode(entity)
+			if (entity.name in ['Begin-of-ACIS-History-Data', 'End-of-ACIS-data']):
+				add = False
+	return bodies
+
+def createAllNodes(acis):
+	'''
+	Creates the nodes of all records - e.g. to dump the records with their parsed values.
+	'''
+	for entity in acis.getEntities():
+		if (entity is not None):
+			materializeNode(entity)
+	return
+
 def resolveNodes():
 	init()
 	acis = getReader()
 	if (not acis.resolved):
 		acis.resolved = True
-		add = True
-		for entity in acis.getEntities():
-			node = _resolveNode(entity)
-			if ((add) and (entity.name == 'body')):
-				acis.bodies.append(node)
-			if (entity.name in ['Begin-of-ACIS-History-Data', 'End-of-ACIS-data']):
-				add = False
+		acis.bodies   = createNodes(acis)
 
 	return acis.bodies
@@ -8,7 +8,7 @@ from datetime      import datetime
 from importerUtils import isEqual, getDumpFolder
 from FreeCAD       import Vector as VEC, Placement as PLC
 from importerUtils import logInfo, logWarning, logError, logAlways, isEqual1D, getAuthor, getDescription, ENCODING_FS, getColorDefault
-import traceback, inspect, os, sys, Acis, math, re, Part, io
+import traceback, inspect, os, sys, Acis, math, re, Part, io, tempfile
 
 #############################################################
 # private variables
@@ -210,16 +210,15 @@ def _createEdgeCurve(p1, p2, curve, sense):
 		_edgeCurves[key] = ec
 	return ec
 
-def _exportList_(a):
-	step = ''
+def _exportList_(a, stream):
 	for i in a:
 		if (isinstance(i, ExportEntity)):
-			step += i.exportSTEP()
+			i.exportSTEP(stream)
 		elif (type(i) == list):
-			step += _exportList_(i)
+			_exportList_(i, stream)
 		elif (type(i) == tuple):
-			step += _exportList_(i)
-	return step
+			_exportList_(i, stream)
+	return
 
 def _createCurveComp(acisCurve):
     # TODO
@@ -480,7 +479,7 @@ def _createSurfaceFaceShape(acisFace, shape):
 		return _createSurfaceRevolution(surface.profile, surface.center, surface.axis, acisFace.sense)
 	if (isinstance(shape, Part.Toroid)):
 		return _createSurfaceToroid(surface.major, surface.minor, surface.center, surface.axis, acisFace.sense)
-	logWarning("Can't export surface '%s.%s'!" %(shape.__class__.__module__, shape.__class__.__name__))
+	logWarning("Can't export surface '%s.%s'!", shape.__class__.__module__, shape.__class__.__name__)
 	return None
 
 def _createSurface(acisFace):
@@ -625,15 +624,14 @@ def _setExported(l, b):
 	if (isinstance(l, ExportEntity)):
 		l.isexported = b
 
-def _exportList(l):
-	step = u''
+def _exportList(l, stream):
 	if (type(l) == list):
 		d = l
 	else:
 		d = l.values()
 	for p in d:
-		step += p.exportSTEP()
-	return step
+		p.exportSTEP(stream)
+	return
 
 def _createGeometricRepresentationList(*entities):
 	return (GEOMETRIC_REPRESENTATION_CONTEXT(len(entities)),) + entities
@@ -683,34 +681,32 @@ class ExportEntity(AnonymEntity):
 		self.isexported = False
 	def _getClassName(self):
 		return self.__class__.__name__
-	def exportProperties(self):
-		step = u""
+	def exportProperties(self, stream):
 		variables = self._getParameters()
 		for k in variables:
 			try:
 				a = k
 				if (isinstance(a, ReferencedEntity)):
-					step += a.exportSTEP()
+					a.exportSTEP(stream)
 				elif (type(a) == list):
-					step += _exportList_(a)
+					_exportList_(a, stream)
 				elif (type(a) == tuple):
-					step += _exportList_(a)
+					_exportList_(a, stream)
 			except:
 				logError(traceback.format_exc())
-		return step
-	def exportSTEP(self):
+		return
+	def exportSTEP(self, stream):
 		if (self.isexported):
-			return ''
-		step = u""
+			return
 		if (hasattr(self, '__acis__')):
 			if (self.__acis__.subclass == 'ref'):
-				step += u"/*\n * ref = %d\n */\n" %(self.__acis__.ref)
+				stream.write(u"/*\n * ref = %d\n */\n" %(self.__acis__.ref))
 			else:
-				step += u"/*\n * $%d\n */\n" %(self.__acis__.index)
-		step += u"%s;\n" %(self.__repr__())
-		step += self.exportProperties()
+				stream.write(u"/*\n * $%d\n */\n" %(self.__acis__.index))
+		stream.write(u"%s;\n" %(self.__repr__()))
+		self.exportProperties(stream)
 		self.isexported = True
-		return step
+		return
 
 class ReferencedEntity(ExportEntity):
 	def __init__(self):
@@ -897,28 +893,27 @@ class ListEntity(ReferencedEntity):
 		params = super(ListEntity, self)._getParameters() + [self.entities]
 		params = sorted(params)
 		return params
-	def exportSTEP(self):
+	def exportSTEP(self, stream):
 		if (self.isexported):
-			return ''
-		step = u""
+			return
 		if (hasattr(self, '__acis__')):
 			if (self.__acis__.subclass == 'ref'):
-				step += u"/*\n * ref = %d\n */\n" %(self.__acis__.ref)
+				stream.write(u"/*\n * ref = %d\n */\n" %(self.__acis__.ref))
 			else:
-				step += u"/*\n * $%d\n */\n" %(self.__acis__.index)
-		step += u"%r;\n" %(self)
+				stream.write(u"/*\n * $%d\n */\n" %(self.__acis__.index))
+		stream.write(u"%r;\n" %(self))
 		for e in self.entities:
 			try:
 				if (isinstance(e, ExportEntity)):
-					step += e.exportProperties()
+					e.exportProperties(stream)
 				elif (type(e) == list):
-					step += _exportList_(e)
+					_exportList_(e, stream)
 				elif (type(e) == tuple):
-					step += _exportList_(e)
+					_exportList_(e, stream)
 			except:
 				logError(traceback.format_exc())
 		self.isexported = True
-		return step
+		return
 	def __repr__(self):
 		return u"#%d\t= (%s)" %(self.id, " ".join(["%s" % (e.toString()) for e in self.entities]))
 
@@ -1464,35 +1459,40 @@ def export(filename, satHeader, satBodies):
 		bodies += _convertBody(body, appPrtDef)
 	PRODUCT_RELATED_PRODUCT_CATEGORY('part', bodies)
 
-	path, f = os.path.split(filename)
-	name, x = os.path.splitext(f)
-	path = getDumpFolder().replace('\\', '/')
-	stepfile = "%s/%s.step" %(path, name)
-
-	step = u"ISO-10303-21;\n"
-	step += u"HEADER;\n"
-	step += u"FILE_DESCRIPTION(('FreeCAD Model'),'2;1');\n"
-	step += u"FILE_NAME('%s'," %(stepfile)
-	step += u"'%s'," %(dt.strftime("%Y-%m-%dT%H:%M:%S"))
-	if (sys.version_info.major < 3):
-		step += u"('%s')," %(user.decode('utf8'))
+	path = getDumpFolder()
+	if (path is None):
+		# no dumping => FreeCAD's STEP importer requires the file only temporarily.
+		fd, stepfile = tempfile.mkstemp(suffix='.step')
+		os.close(fd)
+		stepfile = stepfile.replace('\\', '/')
 	else:
-		step += u"('%s')," %(user)
-	step += u"('%s')," %(orga)
-	step += u"'%s'," %(proc)
-	step += u"'FreeCAD','%s');\n" %(auth)
-	step += u"FILE_SCHEMA (('AUTOMOTIVE_DESIGN { 1 0 10303 214 1 1 1 1}'));\n"
-	step += u"ENDSEC;\n"
-	step += u"\n"
-	step += u"DATA;\n"
-
-	step += _exportList(_entities)
-
-	step += u"ENDSEC;\n"
-	step += u"END-ISO-10303-21;"
+		f = os.path.basename(filename)
+		name, x = os.path.splitext(f)
+		stepfile = "%s/%s.step" %(path.replace('\\', '/'), name)
 
 	with io.open(stepfile, 'wt', encoding="UTF-8") as stepFile:
-		stepFile.write(step)
+		stepFile.write(u"ISO-10303-21;\n")
+		stepFile.write(u"HEADER;\n")
+		stepFile.write(u"FILE_DESCRIPTION(('FreeCAD Model'),'2;1');\n")
+		stepFile.write(u"FILE_NAME('%s'," %(stepfile))
+		stepFile.write(u"'%s'," %(dt.strftime("%Y-%m-%dT%H:%M:%S")))
+		if (sys.version_info.major < 3):
+			stepFile.write(u"('%s')," %(user.decode('utf8')))
+		else:
+			stepFile.write(u"('%s')," %(user))
+		stepFile.write(u"('%s')," %(orga))
+		stepFile.write(u"'%s'," %(proc))
+		stepFile.write(u"'FreeCAD','%s');\n" %(auth))
+		stepFile.write(u"FILE_SCHEMA (('AUTOMOTIVE_DESIGN { 1 0 10303 214 1 1 1 1}'));\n")
+		stepFile.write(u"ENDSEC;\n")
+		stepFile.write(u"\n")
+		stepFile.write(u"DATA;\n")
+
+		# entities are written as soon as they are exported - no need to keep the whole file in memory.
+		_exportList(_entities, stepFile)
+
+		stepFile.write(u"ENDSEC;\n")
+		stepFile.write(u"END-ISO-10303-21;")
 #		logAlways(u"STEP file written to '%s'.", stepfile)
 		logInfo(u"STEP file written to '%s'.", stepfile)
 
@@ -13,19 +13,23 @@ import os, FreeCAD, FreeCADGui, importerBRep, importerSAT, io, importerUFRxDoc
 from olefile           import OleFileIO
 from importerUtils     import *
 from importerReader    import *
-from importerClasses   import Inventor
+from importerClasses   import Inventor, InventorInfo
 from importerFreeCAD   import FreeCADImporter
 from importerSAT       import importModel, convertModel
 from uuid              import UUID
 from Acis              import setReader
+from importerCache     import loadModel, saveModel, getModelVariant
 
 def ReadIgnorable(fname):
-	logInfo(u"    IGNORED: '%s'" %(fname[-1]))
+	logInfo(u"    IGNORED: '%s'", fname[-1])
 
 def skip():
 	return
 
-def ReadElement(ole, fname, doc, counter, readProperties):
+def isSegment(fname):
+	return (fname[0] == 'RSeStorage') and (not isEmbeddings(fname)) and fname[-1].startswith('M') and (not 'Templates' in fname)
+
+def ReadElement(ole, fname, doc, counter, readProperties, required = None, segments = None):
 	name        = fname[-1]
 	path        = PrintableName(fname)
 
@@ -37,11 +41,18 @@ def ReadElement(ole, fname, doc, counter, readProperties):
 	elif (fname[0]=='RSeStorage'):
 		if (isEmbeddings(fname)):
 			if (name == 'Workbook'):
-				ReadWorkbook(doc, ole.openstream(fname).read(), fname[-2], name)
+				data = ole.openstream(fname).read()
+				read = lambda: ReadWorkbook(doc, data, fname[-2], name)
 			elif (name.endswith('Ole10Native')):
-				ReadOle10Native(doc, ole.openstream(fname).read(), fname)
+				data = ole.openstream(fname).read()
+				read = lambda: ReadOle10Native(doc, data, fname)
 			else:
-				skip()
+				read = skip
+			if (segments is None):
+				read()
+			else:
+				# embeddings are read in between the segments in their directory order.
+				segments.append((None, read))
 		elif (name.startswith('M')):
 			if not ('Templates' in fname):
 				fnameB = []
@@ -51,9 +62,15 @@ def ReadElement(ole, fname, doc, counter, readProperties):
 				seg = ReadRSeMetaDataM(ole.openstream(fname).read(), name[1:])
 				seg.file = name[1:]
 				seg.index = counter
-				getModel().RSeMetaData[seg.name] = seg
-				dataB = ole.openstream(fnameB).read()
-				ReadRSeMetaDataB(dataB, seg)
+				if (isSegmentRequired(seg, required)):
+					getModel().RSeMetaData[seg.name] = seg
+					dataB = ole.openstream(fnameB).read()
+					if (segments is None):
+						ReadRSeMetaDataB(dataB, seg)
+					else:
+						segments.append((seg, dataB))
+				else:
+					logInfo(u"%2d: '%s' ('%s') - skipped: not required for import", seg.index, seg.file, seg.name)
 			else:
 				skip()
 		else:
@@ -127,6 +144,30 @@ def dumpRevisionInfo(revisions):
 				file.write(u"%s\n" %(rev))
 	return
 
+def probe(filename):
+	'''
+	Returns the version, the thumbnail, the iProperties and the segments of an Inventor file.
+	In contrast to read no segment is decompressed and nothing is written.
+	'''
+	info = InventorInfo(filename)
+	ole  = OleFileIO(filename)
+	try:
+		info.version, info.beta, info.build, info.versionText = getInventorVersion(ole)
+		for fname in ole.listdir(streams=True, storages=False):
+			name = fname[-1]
+			if (name.startswith('\x05')):
+				props = ole.getproperties(fname, convert_time=True)
+				setName, values, thumbnail = ProbeProperties(props, fname)
+				info.iProperties[setName] = values
+				if (thumbnail is not None):
+					info.thumbnail = thumbnail
+			elif (isSegment(fname)):
+				fnameB = fname[:-1] + ['B' + name[1:]]
+				info.segments.append(ProbeRSeMetaDataM(ole.openstream(fname).read(), name[1:], ole.get_size(fnameB)))
+	finally:
+		ole.close()
+	return info
+
 def read(doc, filename, readProperties):
 	ufrxDoc        = None
 	rSeDb          = None
@@ -208,11 +249,26 @@ def read(doc, filename, readProperties):
 	dumpRSeDB(getModel().RSeDb)
 #	dumpRevisionInfo(getModel().RSeRevisions)
 
+	required = getRequiredSegmentTypes(getStrategy())
+	variant  = getModelVariant('all' if (required is None) else ','.join(sorted(required)))
+	cached   = loadModel(filename, 'segments', variant)
+	segments = []
 	for fname in list:
-		ReadElement(ole, fname, doc, counter, readProperties)
+		if ((cached is None) or (not isSegment(fname))):
+			ReadElement(ole, fname, doc, counter, readProperties, required, segments if (cached is None) else None)
 		counter += 1
 	ole.close()
 
+	if (cached is None):
+		ReadRSeMetaDataBs(segments)
+		# the colors are set while reading the segments => cache them too.
+		saveModel(filename, 'segments', (getModel().RSeMetaData, getColors(), getColorDefault()), variant)
+	else:
+		getModel().RSeMetaData, colors, colorDefault = cached
+		setColors(colors)
+		if (colorDefault is not None):
+			setColorDefault(*colorDefault)
+
 	now = datetime.datetime.now()
 	if (len(doc.Comment) > 0):
 		doc.Comment += '\n'
@@ -227,6 +283,8 @@ def read(doc, filename, readProperties):
 def resolveLinks():
 	gr = getModel().getGraphics()
 	dc = getModel().getDC()
+	# the references of deferred nodes are resolved when the tree is built.
+	gr.tree
 	grp = gr.elementNodes.get(0x0001)
 	if (grp is not None):
 		parts = grp.get('parts')
@@ -240,7 +298,7 @@ def resolveLinks():
 						if (creator is not None):
 							creator.outline = outline
 						else:
-							logWarning(u"    No outline-creator found for index=%04X!" %(dcIndex))
+							logWarning(u"    No outline-creator found for index=%04X!", dcIndex)
 	return
 
 def create3dModel(root, doc):
@@ -267,7 +267,7 @@ class AppReader(SegmentReader):
 			i = node.ReadUInt16A(i, 2, 'a2')
 			i = node.ReadUUID(i, 'uid_0')
 		else:
-			node.content += u" txt_1='' txt_2='' txt_3='' txt_4='' a2=[0000,0000] uid_0=None "
+			node.appendContent(u" txt_1='' txt_2='' txt_3='' txt_4='' a2=[0000,0000] uid_0=None ")
 		i = node.ReadFloat64A(i, 8, 'a3')
 		i = node.ReadUInt8(i, 'u8_1')
 		i = node.ReadCrossRef(i, 'ref_0')
@@ -293,7 +293,7 @@ class AppReader(SegmentReader):
 			i = node.ReadLen32Text16(i, 'comment')
 			i = node.ReadUInt16(i, 'u16_1')
 		else:
-			node.content += u" comment='' u16_1=0000"
+			node.appendContent(u" comment='' u16_1=0000")
 			node.set('comment', '')
 			node.set('u16_1', 0)
 		i = node.ReadLen32Text16(i, 'longName')
@@ -307,7 +307,7 @@ class AppReader(SegmentReader):
 			i = node.ReadUInt16A(i, 2, 'a2')
 			i = node.ReadUUID(i, 'uid_0')
 		else:
-			node.content += u" u16_2=0000 txt_1='' txt_2='' txt_3='' txt_4='' a2=[0000,0000] uid_0=None"
+			node.appendContent(u" u16_2=0000 txt_1='' txt_2='' txt_3='' txt_4='' a2=[0000,0000] uid_0=None")
 		i = node.ReadMaterial(i, 2)
 		i = node.ReadLen32Text16(i, 'FileMapTexture')
 		i = node.ReadUInt8(i, 'u8_1')
@@ -376,7 +376,7 @@ class AppReader(SegmentReader):
 			if (vers > 2011):
 				i = node.ReadUInt32(i, 'u32_4')
 			else:
-				node.content += ' u8_4=00'
+				node.appendContent(' u8_4=00')
 			i = node.ReadUInt32A(i, 3, 'a5')
 			i = node.ReadUInt8(i, 'u8_2')
 			i = node.ReadUInt32(i, 'u32_3')
@@ -392,7 +392,7 @@ class AppReader(SegmentReader):
 					i = node.ReadLen32Text16(i)
 					i = len(node.data)
 			else:
-				node.content += u" u8_3=01 u8_4=00 u32_5=0001 c_1=#50A5D2FF u32_6=0011 f_4=(0,0,0,1,1) u8_5=01 txt_1='%s'" %(node.name)
+				node.appendContent(u" u8_3=01 u8_4=00 u32_5=0001 c_1=#50A5D2FF u32_6=0011 f_4=(0,0,0,1,1) u8_5=01 txt_1='%s'" %(node.name))
 		else:
 			i = node.ReadUInt32(i, 'u32_3')
 		return i
@@ -506,7 +506,7 @@ class AppReader(SegmentReader):
 		i = node.ReadParentRef(i)
 		i = node.ReadList6(i, importerSegNode._TYP_MAP_KEY_REF_)
 		if (getFileVersion() < 2012):
-			node.content += u" u32_0=000005"
+			node.appendContent(u" u32_0=000005")
 			node.set('u32_0', 5)
 		else:
 			i = node.ReadUInt32(i, 'u32_0')
@@ -604,11 +604,11 @@ class AppReader(SegmentReader):
 			if (getFileVersion() > 2011):
 				i = node.ReadUInt32(i, 'u32_1')
 			else:
-				node.content += u" u32_1=000E"
+				node.appendContent(u" u32_1=000E")
 				node.set('u32_1', 0x0E)
 			i = node.ReadFloat64_2D(i, 'a2')
 		else:
-			node.content += ' u32_0=0013 u32_1=000E a2=(0.25, 0.1)'
+			node.appendContent(' u32_0=0013 u32_1=000E a2=(0.25, 0.1)')
 			node.set('u32_1', 0x0E)
 		i = node.ReadFloat64_2D(i, 'a3')
 		return i
@@ -726,7 +726,7 @@ class AppReader(SegmentReader):
 			uid, i = getUUID(node.data, i)
 			txt, i = getLen32Text16(node.data, i)
 			lst.append((uid, txt))
-		node.content += u" a0=[%s]" %(",".join([u"(%s,'%s')" %(uid, txt) for uid, txt in lst]))
+		node.appendContent(u" a0=[%s]" %(",".join([u"(%s,'%s')" %(uid, txt) for uid, txt in lst])))
 		i = node.ReadUUID(i, 'uid')
 		return i
 
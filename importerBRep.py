@@ -19,6 +19,13 @@ __url__        = "https://www.github.com/jmplonka/InventorLoader"
 class BRepReader(NameTableReader):
 	def __init__(self, segment):
 		super(BRepReader, self).__init__(segment)
+		# Importing the SAT or STEP data requires only the ACIS nodes - unless everything has to be dumped.
+		self.lazy = (getStrategy() != STRATEGY_NATIVE) and (getDumpFolder() is None) and (not readAllSegments())
+
+	def isDecodedEagerly(self, node):
+		if (self.lazy):
+			return (node.uid.time_low == 0xF645595C)
+		return True
 
 	def ReadHeaderNameTableChild3Node(self, node, typeName = None):
 		i = self.ReadHeaderNameTableChild1Node(node, typeName)
@@ -43,7 +50,7 @@ class BRepReader(NameTableReader):
 			a = s(node.data, i)
 			i += 38
 			lst.append(a)
-		node.content += u" a1=[%s]" %(",".join("(%03X,%03X,%1X,%02X,%g,%02X,%02X,%02X%1X,%g,%02X,%02X)" %a for a in lst))
+		node.appendContent(lambda lst: u" a1=[%s]" %(",".join("(%03X,%03X,%1X,%02X,%g,%02X,%02X,%02X%1X,%g,%02X,%02X)" %a for a in lst)), lst)
 		node.set('a1', lst)
 		return i
 
@@ -209,7 +216,7 @@ class BRepReader(NameTableReader):
 			a = s(node.data, i)
 			i += 16
 			lst.append(a)
-		node.content += " a2=[%s]" %(",".join(["(%04X,%04X,%g)" %(a[0], a[1], a[2]) for a in lst]))
+		node.appendContent(lambda lst: " a2=[%s]" %(",".join(["(%04X,%04X,%g)" %(a[0], a[1], a[2]) for a in lst])), lst)
 		node.set('a2', lst)
 		cnt, i = getUInt32(node.data, i)
 		lst = []
@@ -218,7 +225,7 @@ class BRepReader(NameTableReader):
 			t, i = getLen32Text8(node.data, i)
 			a, i = getFloat64A(node.data, i, 6)
 			lst.append((j, t, a))
-		node.content += " a3=[%s]" %(",".join(["(%04X,'%s',(%g,%g,%g),(%g,%g,%g))" %(a[0], a[1], a[2][0], a[2][1], a[2][2], a[2][3], a[2][4], a[2][5]) for a in lst]))
+		node.appendContent(lambda lst: " a3=[%s]" %(",".join(["(%04X,'%s',(%g,%g,%g),(%g,%g,%g))" %(a[0], a[1], a[2][0], a[2][1], a[2][2], a[2][3], a[2][4], a[2][5]) for a in lst])), lst)
 		node.set('a3', lst)
 		return i
 
@@ -257,7 +264,7 @@ class BRepReader(NameTableReader):
 		for k in range(cnt):
 			a, i = getUInt16(node.data, i)
 			lst.append(a)
-		node.content += u" a0=[%s]" %(','.join(["%03X"%(a) for a in lst]))
+		node.appendContent(lambda lst: u" a0=[%s]" %(','.join(["%03X"%(a) for a in lst])), lst)
 		node.set('a0', lst)
 		i = node.ReadUInt32(i, 'u32_2')
 		i = node.ReadUInt16(i, 'u16_2')
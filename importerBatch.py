@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+
+'''
+importerBatch.py:
+Headless batch converter for Autodesk Inventor (IPT), ACIS (SAT, SAB) and DXF files.
+The files are converted to STEP or FCStd by a pool of worker processes - a worker is
+replaced after a number of files or if it crashes or times out, so that a crash or a
+timeout doesn't affect the other files.
+
+Usage (FreeCAD's lib folder and this folder have to be on the PYTHONPATH):
+  python importerBatch.py [-h] [-f {step,fcstd}] [-s {sat,native,step}] [-o OUTPUT]
+                          [-j JOBS] [-n FILES_PER_WORKER] [-t TIMEOUT] [-r] [--skip-existing] [--report CSV]
+                          path [path ...]
+or inside FreeCADCmd:
+  import importerBatch; importerBatch.main(['-f', 'step', '/path/to/parts'])
+'''
+
+import os, sys, time, argparse, traceback, multiprocessing, csv, io
+
+if (sys.version_info.major < 3):
+	from Queue import Empty
+else:
+	from queue import Empty
+
+__author__     = 'Jens M. Plonka'
+__copyright__  = 'Copyright 2018, Germany'
+__url__        = "https://www.github.com/jmplonka/InventorLoader"
+
+EXTENSIONS = ('.ipt', '.sat', '.sab', '.dxf')
+FORMATS    = {'step': '.step', 'fcstd': '.FCStd'}
+STRATEGIES = ('sat', 'native', 'step')
+
+RESULT_OK      = 'ok'
+RESULT_SKIPPED = 'skipped'
+RESULT_FAILED  = 'failed'
+RESULT_CRASHED = 'crashed'
+RESULT_TIMEOUT = 'timeout'
+
+def findFiles(paths, recursive):
+	'''
+	Returns tuples of (root folder, file) of all importable files.
+	'''
+	files = []
+	for path in paths:
+		path = os.path.abspath(path)
+		if (os.path.isfile(path)):
+			files.append((os.path.dirname(path), path))
+		elif (os.path.isdir(path)):
+			for folder, dirs, names in os.walk(path):
+				for name in sorted(names):
+					if (os.path.splitext(name)[1].lower() in EXTENSIONS):
+						files.append((path, os.path.join(folder, name)))
+				if (not recursive):
+					break
+				dirs.sort()
+	return files
+
+def getTarget(root, filename, output, fmt):
+	name = os.path.splitext(filename)[0]
+	if (output is not None):
+		name = os.path.join(os.path.abspath(output), os.path.relpath(name, root))
+	return name + FORMATS[fmt]
+
+def getTargets(files, output, fmt):
+	'''
+	Returns the targets of the files - files with the same name but different extensions
+	(e.g. 'a.ipt' and 'a.sat') keep their extension in the target's name ('a_ipt.step').
+	'''
+	targets = [getTarget(root, filename, output, fmt) for root, filename in files]
+	counts  = {}
+	for target in targets:
+		key = os.path.normcase(target)
+		counts[key] = counts.get(key, 0) + 1
+	for i, (root, filename) in enumerate(files):
+		if (counts[os.path.normcase(targets[i])] > 1):
+			name, ext = os.path.splitext(targets[i])
+			targets[i] = u"%s_%s%s" %(name, os.path.splitext(filename)[1][1:].lower(), ext)
+	return targets
+
+def _isExported(obj):
+	if (not hasattr(obj, 'Shape')) or (obj.Shape.isNull()):
+		return False
+	# only top level shapes - the others are consumed by features.
+	return all(parent.isDerivedFrom('App::DocumentObjectGroup') for parent in obj.InList)
+
+def convertFile(filename, target, strategy, modelCache = False, shapeCache = False):
+	'''
+	Converts a single file - the FreeCAD modules are imported here, as they are only required by the workers.
+	'''
+	import FreeCAD, Import, importerIL, importerUtils
+
+	# the user's preferences must not be changed by the batch conversion.
+	importerUtils.overrideStrategy({'sat': importerUtils.STRATEGY_SAT, 'native': importerUtils.STRATEGY_NATIVE, 'step': importerUtils.STRATEGY_STEP}[strategy])
+	importerUtils.overrideDumpEnabled(False)
+	# nobody watches the document => recompute only if shapes are required and finally.
+	importerUtils.overrideRecomputeDeferred(True)
+	importerUtils.overrideCacheEnabled(modelCache, shapeCache)
+
+	if (not importerIL.isFileValid(filename)):
+		raise Exception(u"Can't import '%s'!" %(filename))
+	name = os.path.splitext(os.path.basename(filename))[0]
+	doc = FreeCAD.newDocument(importerIL.decode(name))
+	try:
+		reader = importerIL.read(doc, filename, True)
+		if (reader is None):
+			raise Exception(u"Can't read '%s'!" %(filename))
+		reader.create3dModel(None, doc)
+		doc.recompute()
+		folder = os.path.dirname(target)
+		if (not os.path.exists(folder)):
+			os.makedirs(folder)
+		if (target.endswith(FORMATS['fcstd'])):
+			doc.saveAs(target)
+		else:
+			objects = [obj for obj in doc.Objects if _isExported(obj)]
+			if (len(objects) == 0):
+				raise Exception(u"No shapes created for '%s'!" %(filename))
+			Import.export(objects, target)
+	finally:
+		importerIL.releaseMemory()
+		FreeCAD.closeDocument(doc.Name)
+	return
+
+def _work(tasks, messages, strategy, caches):
+	'''
+	Converts the files of the tasks until it receives None - FreeCAD and the workbench are only imported once per worker.
+	'''
+	while (True):
+		task = tasks.get()
+		if (task is None):
+			break
+		index, filename, target = task
+		try:
+			convertFile(filename, target, strategy, *caches)
+			messages.put((index, RESULT_OK, ''))
+		except:
+			messages.put((index, RESULT_FAILED, traceback.format_exc()))
+	return
+
+class _Worker(object):
+	def __init__(self, messages, strategy, caches):
+		self.tasks   = multiprocessing.Queue()
+		self.process = multiprocessing.Process(target=_work, args=(self.tasks, messages, strategy, caches))
+		self.process.daemon = True
+		self.process.start()
+		self.task    = None # (index, file, target, start) of the file being converted
+		self.count   = 0
+
+	def submit(self, index, filename, target):
+		self.task   = (index, filename, target, time.time())
+		self.count += 1
+		self.tasks.put((index, filename, target))
+
+	def stop(self):
+		self.tasks.put(None)
+		self.process.join()
+
+	def kill(self):
+		self.process.terminate()
+		self.process.join()
+
+def _toText(text):
+	if ((sys.version_info.major < 3) and isinstance(text, str)):
+		return text.decode(sys.getfilesystemencoding() or 'utf8', 'replace')
+	return text
+
+def _write(log, text):
+	if (sys.version_info.major < 3):
+		# python 2 encodes unicode to the console with ascii.
+		text = text.encode(getattr(log, 'encoding', None) or 'utf8', 'replace')
+	log.write(text)
+
+def convert(files, output, fmt, strategy, jobs, timeout, skipExisting, modelCache = False, shapeCache = False, filesPerWorker = 20, log = sys.stdout):
+	'''
+	Converts the files in parallel and returns a list of (file, target, result, seconds, message) tuples.
+	The workers are reused for filesPerWorker files, a worker that crashes or times out is replaced.
+	'''
+	results  = []
+	messages = multiprocessing.Queue()
+	pending  = list(zip([filename for root, filename in files], getTargets(files, output, fmt)))
+	workers  = []
+	caches   = (modelCache, shapeCache)
+	pending.reverse()
+
+	def finish(worker, result, message):
+		index, filename, target, start = worker.task
+		worker.task = None
+		seconds = time.time() - start
+		results.append((filename, target, result, seconds, message))
+		_write(log, u"[%d/%d] %-7s %6.1fs %s\n" %(len(results), len(files), result, seconds, _toText(filename)))
+
+	def receive(wait):
+		try:
+			index, result, message = messages.get(True, wait)
+		except Empty:
+			return False
+		for worker in workers:
+			if ((worker.task is not None) and (worker.task[0] == index)):
+				finish(worker, result, message)
+		return True
+
+	index = 0
+	while ((len(pending) > 0) or any(worker.task is not None for worker in workers)):
+		for worker in workers[:]:
+			if ((worker.task is None) and ((worker.count >= filesPerWorker) or (len(pending) == 0))):
+				worker.stop()
+				workers.remove(worker)
+		while (len(pending) > 0):
+			filename, target = pending[-1]
+			if (skipExisting and os.path.exists(target)):
+				pending.pop()
+				results.append((filename, target, RESULT_SKIPPED, 0.0, ''))
+				continue
+			idle = [worker for worker in workers if (worker.task is None)]
+			if (len(idle) > 0):
+				worker = idle[0]
+			elif (len(workers) < jobs):
+				worker = _Worker(messages, strategy, caches)
+				workers.append(worker)
+			else:
+				break
+			pending.pop()
+			worker.submit(index, filename, target)
+			index += 1
+		while (receive(0.05)):
+			pass
+		for worker in workers[:]:
+			if (worker.task is None):
+				continue
+			if (not worker.process.is_alive()):
+				# the worker's last message is already in the queue if there is one.
+				while (receive(0.1)):
+					pass
+				if (worker.task is not None):
+					exitcode = worker.process.exitcode
+					finish(worker, RESULT_CRASHED if ((exitcode is not None) and (exitcode < 0)) else RESULT_FAILED, '')
+				workers.remove(worker)
+			elif ((timeout > 0) and (time.time() - worker.task[3] > timeout)):
+				worker.kill()
+				finish(worker, RESULT_TIMEOUT, '')
+				workers.remove(worker)
+	for worker in workers:
+		worker.stop()
+	return results
+
+def writeReport(results, filename):
+	if (sys.version_info.major < 3):
+		report = open(filename, 'wb')
+	else:
+		report = io.open(filename, 'w', encoding='utf8', newline='')
+	with report:
+		writer = csv.writer(report)
+		writer.writerow(['file', 'target', 'result', 'seconds', 'message'])
+		for filename, target, result, seconds, message in results:
+			writer.writerow([filename, target, result, "%.3f" %(seconds), message.strip().split('\n')[-1]])
+	return
+
+def printSummary(results, seconds, log = sys.stdout):
+	counts = {}
+	for r in results:
+		counts[r[2]] = counts.get(r[2], 0) + 1
+	_write(log, u"\nConverted %d files in %.1fs:\n" %(len(results), seconds))
+	for result in (RESULT_OK, RESULT_SKIPPED, RESULT_FAILED, RESULT_CRASHED, RESULT_TIMEOUT):
+		_write(log, u"  %-7s: %d\n" %(result, counts.get(result, 0)))
+	for filename, target, result, t, message in results:
+		if (result in (RESULT_FAILED, RESULT_CRASHED, RESULT_TIMEOUT)):
+			detail = _toText(message.strip().split('\n')[-1]) if (message) else u''
+			_write(log, u"  %s: %s %s\n" %(result.upper(), _toText(filename), detail))
+	return
+
+def main(argv = None):
+	parser = argparse.ArgumentParser(description='Converts Autodesk Inventor, ACIS and DXF files to STEP or FCStd without GUI.')
+	parser.add_argument('paths', nargs='+', help='files or folders to convert')
+	parser.add_argument('-f', '--format', choices=sorted(FORMATS.keys()), default='step', help='target format (default: step)')
+	parser.add_argument('-s', '--strategy', choices=STRATEGIES, default='sat', help='import strategy (default: sat)')
+	parser.add_argument('-o', '--output', default=None, help='output folder (default: next to the source files)')
+	parser.add_argument('-j', '--jobs', type=int, default=multiprocessing.cpu_count(), help='number of worker processes (default: number of CPUs)')
+	parser.add_argument('-n', '--files-per-worker', type=int, default=20, help='number of files a worker converts before it is replaced (default: 20)')
+	parser.add_argument('-t', '--timeout', type=float, default=300.0, help='timeout per file in seconds, 0 = unlimited (default: 300)')
+	parser.add_argument('-r', '--recursive', action='store_true', help='search folders recursively')
+	parser.add_argument('--skip-existing', action='store_true', help="don't convert files whose target already exists")
+	parser.add_argument('--report', default=None, help='write a CSV report to this file')
+	parser.add_argument('--model-cache', action='store_true', help='use and fill the cache of parsed models')
+	parser.add_argument('--shape-cache', action='store_true', help='use and fill the cache of built shapes')
+	args = parser.parse_args(argv)
+
+	files = findFiles(args.paths, args.recursive)
+	start = time.time()
+	results = convert(files, args.output, args.format, args.strategy, max(1, args.jobs), args.timeout, args.skip_existing, args.model_cache, args.shape_cache, max(1, args.files_per_worker))
+	printSummary(results, time.time() - start)
+	if (args.report is not None):
+		writeReport(results, args.report)
+	return 0 if all(r[2] in (RESULT_OK, RESULT_SKIPPED) for r in results) else 1
+
+if __name__ == '__main__':
+	sys.exit(main())
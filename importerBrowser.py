@@ -49,7 +49,7 @@ class BrowserReader(SegmentReader):
 		else:
 			self.__Str53_u16_0 += 1
 			node.set('u16_0', self.__Str53_u16_0)
-			node.content += u' u16_0=%03X' % self.__Str53_u16_0
+			node.appendContent(u' u16_0=%03X' % self.__Str53_u16_0)
 		i = node.ReadUInt16A(i, 3, 'a0')
 		i = self.skipBlockSize(i)
 		return i
@@ -588,7 +588,7 @@ class BrowserReader(SegmentReader):
 		for k in range(cnt):
 			a, i = getUInt32A(node.data, i, 3)
 			lst.append(a)
-		node.content += u" lst4=[%s]" %(",".join(["(%04X,%04X,%04X)"%(a[0], a[1], a[2]) for a in lst]))
+		node.appendContent(u" lst4=[%s]" %(",".join(["(%04X,%04X,%04X)"%(a[0], a[1], a[2]) for a in lst])))
 		node.set('lst4', lst)
 		return i
 
@@ -666,7 +666,7 @@ class BrowserReader(SegmentReader):
 			i = node.ReadLen32Text16(i, 'txt_0')
 			i = node.ReadSInt32(i, 's32_0')
 		else:
-			node.content += u" txt_0='' s32_0=-1"
+			node.appendContent(u" txt_0='' s32_0=-1")
 			node.set('txt_0', '')
 			node.set('s32_0', -1)
 		return i
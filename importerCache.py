@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+
+'''
+importerCache.py:
+Persistent cache of parsed models and built shapes.
+The segments read from Inventor files and the entities read from ACIS files
+are stored on disk - keyed by the file's content and the importer's version -
+so that a later import of the same file can load them instead of parsing them again.
+Shapes built from ACIS data are stored in FreeCAD's native BREP format.
+'''
+
+import os, sys, io, glob, hashlib, pickle, traceback, FreeCAD, Part
+from importerUtils import logInfo, logWarning, isModelCacheEnabled, isShapeCacheEnabled, isAcisHistoryRequired, getDumpFolder
+
+__author__     = 'Jens M. Plonka'
+__copyright__  = 'Copyright 2018, Germany'
+__url__        = "https://www.github.com/jmplonka/InventorLoader"
+
+_importerVersion = None
+_nodeTypes       = {}
+
+def getCacheFolder(name):
+	'''
+	Returns the folder for cached data of the given kind - creates it if necessary.
+	'''
+	folder = os.path.join(FreeCAD.getUserAppDataDir(), 'InventorLoader', name)
+	if (not os.path.exists(folder)):
+		os.makedirs(folder)
+	return folder
+
+def getImporterVersion():
+	'''
+	Returns a key for the importer's version - changes with every update of the importer's sources.
+	'''
+	global _importerVersion
+	if (_importerVersion is None):
+		sha = hashlib.sha1()
+		sha.update(sys.version.encode('utf8'))
+		folder = os.path.dirname(os.path.abspath(__file__))
+		for source in sorted(glob.glob(os.path.join(folder, '*.py'))):
+			stat = os.stat(source)
+			sha.update((u"%s:%d:%d" %(os.path.basename(source), stat.st_size, int(stat.st_mtime))).encode('utf8'))
+		_importerVersion = sha.hexdigest()
+	return _importerVersion
+
+def getContentHash(filename):
+	sha = hashlib.sha1()
+	with open(filename, 'rb') as file:
+		data = file.read(0x100000)
+		while (data):
+			sha.update(data)
+			data = file.read(0x100000)
+	return sha.hexdigest()
+
+def getModelVariant(variant = None):
+	'''
+	Returns the variant key for a cached model - models without ACIS history or without
+	the content of the dumps mustn't be used if these are required.
+	variant: additional key for the model (e.g. the segments required by the import strategy).
+	'''
+	if (getDumpFolder() is not None):
+		return 'dump' if (variant is None) else variant + '+dump'
+	if (isAcisHistoryRequired()):
+		return 'history' if (variant is None) else variant + '+history'
+	return variant
+
+def _getCacheFile(filename, kind, variant):
+	key = hashlib.sha1((u"%s|%s|%s" %(kind, variant, getImporterVersion())).encode('utf8')).hexdigest()
+	return os.path.join(getCacheFolder('models'), "%s_%s.pickle" %(getContentHash(filename), key))
+
+def _isNodeType(cls):
+	# instances of the importer's own classes are the nodes of the (deeply nested) graphs.
+	node = _nodeTypes.get(cls)
+	if (node is None):
+		module = sys.modules.get(cls.__module__)
+		source = getattr(module, '__file__', None)
+		node = (source is not None) and (os.path.dirname(os.path.abspath(source)) == os.path.dirname(os.path.abspath(__file__)))
+		_nodeTypes[cls] = node
+	return node
+
+class _NodePickler(pickle.Pickler):
+	'''
+	Pickles each node separately, references to other nodes are stored as
+	persistent IDs - so the recursion depth doesn't depend on the graph's depth.
+	The shared objects are only referenced - their state isn't pickled.
+	'''
+	def __init__(self, file, shared = ()):
+		pickle.Pickler.__init__(self, file, pickle.HIGHEST_PROTOCOL)
+		self.nodes = []
+		self.ids   = {}
+		for obj in shared:
+			self.ids[id(obj)] = len(self.nodes)
+			self.nodes.append((obj, None))
+
+	def persistent_id(self, obj):
+		key = id(obj)
+		index = self.ids.get(key)
+		if (index is None):
+			if (not _isNodeType(type(obj))):
+				return None
+			try:
+				reduced = obj.__reduce_ex__(2)
+			except:
+				return None
+			if ((len(reduced) < 3) or (reduced[1] != (type(obj),)) or any(reduced[3:])):
+				return None
+			index = len(self.nodes)
+			self.ids[key] = index
+			self.nodes.append((obj, reduced[2]))
+		return (index, type(obj))
+
+	def dumpNodes(self, data):
+		self.dump(data)
+		i = 0
+		while (i < len(self.nodes)):
+			self.dump(self.nodes[i][1])
+			i += 1
+
+class _NodeUnpickler(pickle.Unpickler):
+	def __init__(self, file, shared = ()):
+		pickle.Unpickler.__init__(self, file)
+		# the references to the shared objects are resolved with the objects of this process.
+		self.nodes = list(shared)
+
+	def persistent_load(self, pid):
+		index, cls = pid
+		while (len(self.nodes) <= index):
+			self.nodes.append(None)
+		obj = self.nodes[index]
+		if (obj is None):
+			obj = cls.__new__(cls)
+			self.nodes[index] = obj
+		return obj
+
+	def loadNodes(self):
+		data = self.load()
+		i = 0
+		while (i < len(self.nodes)):
+			_setState(self.nodes[i], self.load())
+			i += 1
+		return data
+
+def _setState(obj, state):
+	# same as pickle's BUILD instruction.
+	if (state is None):
+		return
+	setstate = getattr(obj, '__setstate__', None)
+	if (setstate is not None):
+		setstate(state)
+		return
+	slots = None
+	if (isinstance(state, tuple) and (len(state) == 2)):
+		state, slots = state
+	if (state):
+		obj.__dict__.update(state)
+	if (slots):
+		for name, value in slots.items():
+			setattr(obj, name, value)
+
+def _dump(cacheFile, data):
+	with open(cacheFile, 'wb') as file:
+		_NodePickler(file).dumpNodes(data)
+
+def _load(cacheFile):
+	with open(cacheFile, 'rb') as file:
+		return _NodeUnpickler(file).loadNodes()
+
+def pickleNodes(data, shared = ()):
+	'''
+	Returns the pickled data, e.g. to pass parsed segments from a worker process.
+	shared: the objects that are only referenced - they have to be passed to unpickleNodes in the same order.
+	'''
+	stream = io.BytesIO()
+	_NodePickler(stream, shared).dumpNodes(data)
+	return stream.getvalue()
+
+def unpickleNodes(buffer, shared = ()):
+	'''
+	Returns the data pickled by pickleNodes - the references to the shared objects are replaced by these.
+	'''
+	return _NodeUnpickler(io.BytesIO(buffer), shared).loadNodes()
+
+def loadModel(filename, kind, variant = None):
+	'''
+	Returns the cached model of the file or None if the file wasn't cached yet.
+	kind:    the kind of model (e.g. 'segments' or 'acis').
+	variant: additional key for the model (e.g. the segments required by the import strategy).
+	'''
+	if (not isModelCacheEnabled()):
+		return None
+	try:
+		cacheFile = _getCacheFile(filename, kind, variant)
+		if (os.path.exists(cacheFile)):
+			model = _load(cacheFile)
+			logInfo(u"    Loaded parsed model from cache '%s'", cacheFile)
+			return model
+	except:
+		logWarning(u"    Can't load parsed model from cache - reading file instead:")
+		logWarning(traceback.format_exc())
+	return None
+
+def saveModel(filename, kind, model, variant = None):
+	'''
+	Stores the parsed model of the file in the cache.
+	'''
+	if (not isModelCacheEnabled()):
+		return
+	cacheFile = None
+	try:
+		cacheFile = _getCacheFile(filename, kind, variant)
+		_dump(cacheFile, model)
+		logInfo(u"    Stored parsed model in cache '%s'", cacheFile)
+	except:
+		logWarning(u"    Can't store parsed model in cache:")
+		logWarning(traceback.format_exc())
+		if ((cacheFile is not None) and os.path.exists(cacheFile)):
+			os.remove(cacheFile)
+	return
+
+def _getShapeFile(key):
+	return os.path.join(getCacheFolder('shapes'), "%s.brep" %(key))
+
+def loadShape(key):
+	'''
+	Returns the cached shape for the key or None if the shape wasn't cached yet.
+	'''
+	if (not isShapeCacheEnabled()):
+		return None
+	try:
+		shapeFile = _getShapeFile(key)
+		if (os.path.exists(shapeFile)):
+			shape = Part.Shape()
+			shape.importBrep(shapeFile)
+			return shape
+	except:
+		logWarning(u"    Can't load shape from cache - building it instead:")
+		logWarning(traceback.format_exc())
+	return None
+
+def saveShape(key, shape):
+	'''
+	Stores the shape in the cache.
+	'''
+	if (not isShapeCacheEnabled()):
+		return
+	shapeFile = None
+	try:
+		shapeFile = _getShapeFile(key)
+		shape.exportBrep(shapeFile)
+	except:
+		logWarning(u"    Can't store shape in cache:")
+		logWarning(traceback.format_exc())
+		if ((shapeFile is not None) and os.path.exists(shapeFile)):
+			os.remove(shapeFile)
+	return
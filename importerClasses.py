@@ -6,7 +6,7 @@ Collection of classes necessary to read and analyse Autodesk (R) Invetor (R) fil
 '''
 
 import sys, os, Part
-from importerUtils import IntArr2Str, FloatArr2Str, logWarning, logError, getInventorFile, getUInt16, getUInt16A, getFileVersion, isEqual, isEqual1D
+from importerUtils import IntArr2Str, FloatArr2Str, logWarning, logError, getInventorFile, getUInt16, getUInt16A, getFileVersion, isEqual, isEqual1D, getSession, getDumpFolder
 from math          import degrees, radians, pi
 from FreeCAD       import Vector as VEC
 from PySide.QtCore import *
@@ -16,8 +16,6 @@ __author__     = "Jens M. Plonka"
 __copyright__  = 'Copyright 2018, Germany'
 __url__        = "https://www.github.com/jmplonka/InventorLoader"
 
-model = None
-
 PART_LINE = Part.Line
 if (hasattr(Part, "LineSegment")):
 	PART_LINE = Part.LineSegment
@@ -288,6 +286,31 @@ class RSeRevisions(object):
 	def __del__(self):
 		self.mapping.clear()
 		self.infos[:] = []
+class SegmentInfo(object):
+	def __init__(self, file, sizeB):
+		self.file  = file  # number of the segment's streams
+		self.txt1  = ''
+		self.ver   = 0
+		self.arr1  = []
+		self.name  = ''    # the segment's type, e.g. 'PmBRepSegment'
+		self.segID = None
+		self.sizeB = sizeB # size of the segment's compressed data
+	def __repr__(self):
+		return u"%s: '%s' {%s} (%d bytes)" %(self.file, self.name, self.segID, self.sizeB)
+
+class InventorInfo(object):
+	def __init__(self, filename):
+		self.filename    = filename
+		self.version     = None  # file version as used by the importer, e.g. 2019
+		self.beta        = -1    # beta number or -1 for released versions
+		self.build       = 0     # build number (only for files older than 2010)
+		self.versionText = None  # e.g. '2019 (Build 230224000, 224)'
+		self.thumbnail   = None
+		self.iProperties = {}    # set name -> {key: (name, value)}
+		self.segments    = []    # list of SegmentInfo
+	def __repr__(self):
+		return u"[%s]: %s" %(self.version, os.path.basename(self.filename))
+
 class Inventor(object):
 	def __init__(self):
 		self.UFRxDoc            = None
@@ -787,7 +810,7 @@ class ParameterNode(DataNode):
 				except BaseException as be:
 					# replace by nominal value and unit!
 					value = self.getValue()
-					logWarning(u"    %s - replacing by nominal value %s!" %(be, value))
+					logWarning(u"    %s - replacing by nominal value %s!", be, value)
 			else:
 				value = self.getValue()
 			if (asText):
@@ -1336,10 +1359,34 @@ class Segment(object):
 		self.nodes        = None
 		self.elementNodes = {}
 		self.indexNodes   = {}
-		self.tree         = DataNode(None)
+		self._tree        = DataNode(None)
+		self._treeBuilder = None
 		self.acis         = None
 		self.bodies       = {}
 
+	@property
+	def tree(self):
+		'''
+		The tree of the segment's nodes - built on first access if the nodes are decoded lazily.
+		'''
+		if (self._treeBuilder is not None):
+			builder = self._treeBuilder
+			self._treeBuilder = None
+			self._tree = builder(self.elementNodes)
+		return self._tree
+
+	@tree.setter
+	def tree(self, tree):
+		self._tree        = tree
+		self._treeBuilder = None
+
+	def deferTree(self, builder):
+		'''
+		Postpones building the tree until it's first accessed.
+		builder: The function that builds the tree for the segment's element nodes.
+		'''
+		self._treeBuilder = builder
+
 	def getDcSatAttributes(self):
 		if (self.acis is None): return []
 		return self.acis.get('dcAttributes')
@@ -1552,12 +1599,45 @@ class ModelerTxnMgr(object):
 		return '%04X %04X [%s]' %(self.node, self.dcIdx, s)
 	def __repr__(self): return self.__str__()
 
+def _renderContent(fmt, args):
+	if (callable(fmt)):
+		return fmt(*args)
+	if (args):
+		return fmt %args
+	return fmt
+
+if (sys.version_info.major > 2):
+	from sys import intern
+
+def _intern(name):
+	# only native strings can be interned (e.g. not python 2's unicode).
+	if (type(name) is str):
+		return intern(name)
+	return name
+
+def _getSlots(cls):
+	'''
+	Returns the names of all slots of the class and its base classes.
+	'''
+	slots = _slots.get(cls)
+	if (slots is None):
+		slots = []
+		for c in cls.__mro__:
+			slots += getattr(c, '__slots__', ())
+		_slots[cls] = slots
+	return slots
+
+_slots = {}
+
 class AbstractData(object):
+	# Fixed attribute layout - there are millions of nodes for large files, so no per-instance __dict__.
+	__slots__ = ('uid', 'name', 'index', '_content', 'references', 'properties', 'size', 'visible', 'construction', 'segment', 'geometry', 'sketchIndex', 'sketchPos', 'valid', 'handled', 'node', 'nameSet')
+
 	def __init__(self):
 		self.uid          = None
 		self.name         = None
 		self.index        = -1
-		self.content      = ''
+		self._content     = [] # fragments (format, args) of the content - rendered on demand
 		self.references   = []
 		self.properties   = {}
 		self.size         = 0
@@ -1571,6 +1651,57 @@ class AbstractData(object):
 		self.handled      = False
 		self.node         = None
 
+	@property
+	def content(self):
+		'''
+		The human readable representation of the node's data.
+		Rendered from the recorded fragments only if requested (e.g. for dumping).
+		'''
+		return u"".join([_renderContent(fmt, args) for fmt, args in self._content])
+
+	@content.setter
+	def content(self, content):
+		self._content = [(content, ())] if (content) else []
+
+	def appendContent(self, fmt, *args):
+		'''
+		Appends a fragment to the content without rendering it.
+		fmt:  The format string for the args or a function that renders the args.
+		args: The values to be rendered.
+		'''
+		self._content.append((fmt, args))
+
+	def markContent(self):
+		'''
+		Returns the current position within the content for resetContent.
+		'''
+		return len(self._content)
+
+	def resetContent(self, mark):
+		'''
+		Removes all fragments appended after the given mark.
+		mark: The position returned by markContent.
+		'''
+		del self._content[mark:]
+
+	def __getstate__(self):
+		# format strings are kept with their args, only the lambdas that can't be
+		# pickled are rendered - or dropped if nothing will be dumped.
+		state = dict((name, getattr(self, name)) for name in _getSlots(self.__class__) if hasattr(self, name))
+		dump = not (getDumpFolder() is None)
+		content = []
+		for fmt, args in self._content:
+			if (not callable(fmt)):
+				content.append((fmt, args))
+			elif (dump):
+				content.append((fmt(*args), ()))
+		state['_content'] = content
+		return state
+
+	def __setstate__(self, state):
+		for name, value in state.items():
+			setattr(self, name, value)
+
 	def set(self, name, value):
 		'''
 		Sets the value for the property name.
@@ -1578,7 +1709,8 @@ class AbstractData(object):
 		value: The value of the property.
 		'''
 		if (name):
-			self.properties[name] = value
+			# the same few names are used for all nodes => share the key strings.
+			self.properties[_intern(name)] = value
 
 	def get(self, name):
 		'''
@@ -1653,19 +1785,13 @@ Functions  = Enum([
 FunctionsNotSupported = ['sign', 'random', 'acosh', 'asinh', 'atanh', 'isolate']
 
 def createNewModel():
-	global model
-	model = Inventor()
+	getSession().model = Inventor()
 
 def getModel():
-	global model
-	if ('model' in globals()):
-		return model
-	return None
+	return getSession().model
 
 def releaseModel():
-	global model
-	if ('model' in globals()):
-		del model
+	getSession().model = None
 
 class NtEntry(object):
 	def __init__(self, nameTable, key):
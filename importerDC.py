@@ -23,9 +23,18 @@ class DCReader(EeDataReader):
 	DOC_PART         = 3
 	DOC_PRESENTATION = 4
 
+	STATE_NAMES = EeDataReader.STATE_NAMES + ('ntKeys', 'type')
+
 	def __init__(self, segment):
 		super(DCReader, self).__init__(segment)
 		segment.ntKeys = {}
+		# the dumps require all nodes to be decoded.
+		self.lazy = (getDumpFolder() is None)
+
+	def isDecodedEagerly(self, node):
+		if (self.lazy):
+			return not self.isStateless(node.typeName)
+		return True
 
 ########################################
 # usability functions
@@ -61,7 +70,7 @@ class DCReader(EeDataReader):
 			val, i = getUInt32(node.data, i)
 			u8, i  = getUInt8(node.data, i)
 			lst.append([ref, val, u8])
-		node.content += ' %s=[%s]' %(name, ','.join(['(%s,%04X,%02X)' %(r[0], r[1], r[2]) for r in lst]))
+		node.appendContent(' %s=[%s]' %(name, ','.join(['(%s,%04X,%02X)' %(r[0], r[1], r[2]) for r in lst])))
 		node.set(name, lst)
 		return i
 
@@ -76,7 +85,7 @@ class DCReader(EeDataReader):
 				a, i = getUInt32(node.data, i)
 				c.append('(%04X)' %(a))
 			lst.append(a)
-		node.content += ' %s=[%s]' % (name, ','.join(c))
+		node.appendContent(' %s=[%s]' % (name, ','.join(c)))
 		node.set(name, lst)
 		return i
 
@@ -98,10 +107,10 @@ class DCReader(EeDataReader):
 			tol = 0
 			if (len(lst) > 0):
 				tol, i = getFloat64(node.data, i)
-			node.content += " %s=(%s,[%s],%g)" %(key, IntArr2Str(meta[1:], 2), s, tol)
+			node.appendContent(" %s=(%s,[%s],%g)" %(key, IntArr2Str(meta[1:], 2), s, tol))
 		else:
 			tol = None
-			node.content += " %s=(%s,[%s])" %(key, IntArr2Str(meta[1:], 2), s)
+			node.appendContent(" %s=(%s,[%s])" %(key, IntArr2Str(meta[1:], 2), s))
 		node.set(key, {'meta': meta, 'values': lst, 'tolerance': tol})
 		return i
 	'''
@@ -1285,14 +1294,14 @@ class DCReader(EeDataReader):
 		if (getFileVersion() > 2018): i += 4 # ???
 		cnt, i = getUInt32(node.data, i)
 		lst = []
-		node.content += u" txt=["
+		node.appendContent(u" txt=[")
 		sep = u""
 		for j in range(cnt):
 			txt, i = getLen32Text16(node.data, i)
-			node.content += u"%s'%s'" %(sep, txt)
+			node.appendContent(u"%s'%s'" %(sep, txt))
 			sep = u","
 			lst.append(txt)
-		node.content += u"]"
+		node.appendContent(u"]")
 		return i
 
 	def Read_BE8CEB3C(self, node): # RadiusModelDimension
@@ -1464,7 +1473,7 @@ class DCReader(EeDataReader):
 			i = node.ReadUInt32(i, 'u32_1')
 		else:
 			i = node.ReadChildRef(i, 'wrapper')
-			node.content += " u32_1=0000"
+			node.appendContent(" u32_1=0000")
 		return i
 
 	def Read_EC7B8A2B(self, node):
@@ -1695,7 +1704,7 @@ class DCReader(EeDataReader):
 		else:
 			node.set('u32_0', 0)
 			node.set('u32_1', 0)
-			node.content += " u32_0=0000 u32_1=0000"
+			node.appendContent(" u32_0=0000 u32_1=0000")
 		i = node.ReadUInt8(i, 'u8_0')
 		i = self.skipBlockSize(i)
 		return i
@@ -1824,7 +1833,7 @@ class DCReader(EeDataReader):
 		if (len(node.get('indexRefs')) > 0):
 			i = node.ReadSInt32(i, 's32_0')
 		else:
-			node.content +=' s32_0=-1'
+			node.appendContent(' s32_0=-1')
 			node.set('s32_0', -1)
 		return i
 
@@ -2565,7 +2574,7 @@ class DCReader(EeDataReader):
 				txt, i = getLen32Text16(node.data, i)
 				u8, i  = getUInt8(node.data, i)
 				lst.append([ref, txt, u8])
-			node.content += ' lst3=[%s]' %(','.join(["[%s,'%s',%02X]" %(r[0], r[1], r[2]) for r in lst]))
+			node.appendContent(' lst3=[%s]' %(','.join(["[%s,'%s',%02X]" %(r[0], r[1], r[2]) for r in lst])))
 			node.set('lst3', lst)
 			i = node.ReadUInt32(i, 'u32_2')
 		else:
@@ -2759,7 +2768,7 @@ class DCReader(EeDataReader):
 				id2, i = getUUID(node.data, i)
 				u32, i = getUInt32(node.data, i)
 				lst5.append([id1, id2, u32])
-			node.content += ' lst5=[%s]' %(','.join(['(%s,%s,%04X)' %(r[0], r[1], r[2]) for r in lst5]))
+			node.appendContent(' lst5=[%s]' %(','.join(['(%s,%s,%04X)' %(r[0], r[1], r[2]) for r in lst5])))
 			i = node.ReadCrossRef(i, 'ref_5')
 			i = node.ReadList6(i, importerSegNode._TYP_MAP_U32_U32_, 'lst6')
 			i = node.ReadUInt8(i, 'u8_1')
@@ -4486,7 +4495,7 @@ class DCReader(EeDataReader):
 		i = node.ReadUInt32(i, 'cnt_lst0')
 		a0 = Struct("<LddbH").unpack_from(node.data, i)
 		i += 23
-		node.content += u" a0=(%04X,%g,%g,%2X,%03X)" %a0
+		node.appendContent(u" a0=(%04X,%g,%g,%2X,%03X)" %a0)
 		node.set('a0', a0)
 		i = node.ReadCrossRef(i, 'ref_0')
 		return i
@@ -4581,7 +4590,7 @@ class DCReader(EeDataReader):
 		if (getFileVersion() > 2011):
 			i = node.ReadUInt32(i, 'u32_1')
 		else:
-			node.content += ' u32_1=0000'
+			node.appendContent(' u32_1=0000')
 			node.set('u32_1', 0)
 		return i
 
@@ -4821,7 +4830,7 @@ class DCReader(EeDataReader):
 			i = node.ReadUInt32(i, 'u32_4')
 		elif (cnt == 0):
 			node.set('u32_4', 0)
-			node.content += ' u32_4=0000'
+			node.appendContent(' u32_4=0000')
 		i = node.ReadFloat64_3D(i, 'pos') # start z
 		i = node.ReadFloat64_3D(i, 'dir') # direction
 		i = node.ReadFloat64_3D(i, 'point') # start point
@@ -5014,7 +5023,7 @@ class DCReader(EeDataReader):
 				i = node.ReadUInt32(i, 'u32_4')
 			elif (cnt == 0):
 				node.set('u32_4', 0)
-				node.content += ' u32_4=0000'
+				node.appendContent(' u32_4=0000')
 			i = node.ReadFloat64A(i, (len(node.data) - i) / 8, 'a1')
 		return i
 
@@ -5183,7 +5192,7 @@ class DCReader(EeDataReader):
 			i = node.ReadUInt32(i, 'u32_0')
 			i = node.ReadList2(i, importerSegNode._TYP_FLOAT64_, 'lst1')
 		else:
-			node.content += ' u32_0=0000 lst1=[]'
+			node.appendContent(' u32_0=0000 lst1=[]')
 			node.set('u32_0', 0)
 			node.set('lst1', [])
 		if (vers > 2019):
@@ -5293,7 +5302,7 @@ class DCReader(EeDataReader):
 
 		a2 = Struct('<LLLd').unpack_from(node.data, i)
 		i += 20
-		node.content += " a2=(%04X,%04X,%04X,%g)" %(a2[0], a2[1], a2[2], a2[3])
+		node.appendContent(" a2=(%04X,%04X,%04X,%g)" %(a2[0], a2[1], a2[2], a2[3]))
 		node.set('a2', a2)
 		i = self.readTypedList(node, i, 'a3',    3, 1, False)
 		i = self.readTypedList(node, i, 'a4',    3, 1, False)
@@ -5307,7 +5316,7 @@ class DCReader(EeDataReader):
 		i = node.ReadFloat64(i, 'f64_1')
 		a7 = Struct('<LBLLLd').unpack_from(node.data, i)
 		i += 25
-		node.content += " a7=(%04X,%1X,%04X,%04X,%04X,%g)" %(a7[0], a7[1], a7[2], a7[3], a7[4], a7[5])
+		node.appendContent(" a7=(%04X,%1X,%04X,%04X,%04X,%g)" %(a7[0], a7[1], a7[2], a7[3], a7[4], a7[5]))
 		node.set('a7', a7)
 		i = self.readTypedList(node, i, 'a3_',    3, 1, False)
 		i = self.readTypedList(node, i, 'a4_',    3, 1, False)
@@ -5316,7 +5325,7 @@ class DCReader(EeDataReader):
 		i = self.readTypedList(node, i, 'a6_',    3, 2, True)
 		a8 = Struct('<Ldddd').unpack_from(node.data, i)
 		i += 36
-		node.content += " a8=(%04X,%g,%g,%g,%g)" %(a8[0], a8[1], a8[2], a8[3], a8[4])
+		node.appendContent(" a8=(%04X,%g,%g,%g,%g)" %(a8[0], a8[1], a8[2], a8[3], a8[4]))
 		node.set('a8', a8)
 		return i
 
@@ -5792,7 +5801,7 @@ class DCReader(EeDataReader):
 			u32, i = getUInt32(node.data, i)
 			f64, i = getFloat64(node.data, i)
 			lst.append([u32, f64])
-		node.content += ' lst1=[%s]' %(','.join(['(%04X,%g)'%(r[0], r[1]) for r in lst]))
+		node.appendContent(' lst1=[%s]' %(','.join(['(%04X,%g)'%(r[0], r[1]) for r in lst])))
 		node.set('lst1', lst)
 		i = node.ReadUInt8(i, 'u8_0')
 		return i
@@ -5857,7 +5866,7 @@ class DCReader(EeDataReader):
 			key, i = getLen32Text16(node.data, i)
 			val, i = getLen32Text16(node.data, i)
 			lst0[key] = val
-		node.content += ' lst0={%s}' %(','.join(['%s:%s' %(k, v) for k, v in lst0.items()]))
+		node.appendContent(' lst0={%s}' %(','.join(['%s:%s' %(k, v) for k, v in lst0.items()])))
 		node.set('lst0', lst0)
 		i = node.ReadList2(i, importerSegNode._TYP_NODE_X_REF_, 'lst1')
 		i = node.ReadUInt32(i, 'u32_1')
@@ -5983,18 +5992,18 @@ class DCReader(EeDataReader):
 		cnt, i = getUInt32(node.data, i)
 		lst = []
 		sep = ''
-		node.content += ' lst0=['
+		node.appendContent(' lst0=[')
 		for j in range(cnt):
 			u32, i = getUInt32(node.data, i)
 			u8, i  = getUInt8(node.data, i)
-			node.content += '%s[%04X,%02X,' %(sep, u32, u8)
+			node.appendContent('%s[%04X,%02X,' %(sep, u32, u8))
 			tmp = u"lst0[%02X][2]" %(j)
 			i = node.ReadList2(i, importerSegNode._TYP_UINT32_, tmp)
 			lst.append([u32, u8, node.get(tmp)])
 			node.delete(tmp)
 			sep = ','
-			node.content += ']'
-		node.content += ']'
+			node.appendContent(']')
+		node.appendContent(']')
 		node.set('lst0', lst)
 		return i
 
@@ -6226,7 +6235,7 @@ class DCReader(EeDataReader):
 			i += 38
 			lst.append(a)
 		node.set('lst2', lst)
-		node.content += u" lst2=[%s]" %(",".join(['(%04X,%04X,%03X,%02X,%g,%03X,%03X,%03X,%02X,%g,%03X,%03X)' %(a[0], a[1], a[2], a[3], a[4], a[5], a[6], a[7], a[8], a[9], a[10], a[11]) for a in lst]))
+		node.appendContent(u" lst2=[%s]" %(",".join(['(%04X,%04X,%03X,%02X,%g,%03X,%03X,%03X,%02X,%g,%03X,%03X)' %(a[0], a[1], a[2], a[3], a[4], a[5], a[6], a[7], a[8], a[9], a[10], a[11]) for a in lst])))
 		return i
 
 	def Read_0645C2A5(self, node):
@@ -6305,7 +6314,7 @@ class DCReader(EeDataReader):
 		i = self.skipBlockSize(i)
 		a1 = Struct("<LLLBLH").unpack_from(node.data, i)
 		i += 19
-		node.content += " a1=(%04X,%04X,%04X,%02X,%04X,%03X)" %a1
+		node.appendContent(" a1=(%04X,%04X,%04X,%02X,%04X,%03X)" %a1)
 		return i
 
 	def Read_2892C3E0(self, node):
@@ -6432,7 +6441,7 @@ class DCReader(EeDataReader):
 		if (node.get('a2')[2] == 1):
 			i = node.ReadUInt32A(i, 3, 'a3')
 		else:
-			node.content += ' a3=[0000,0000,0000]'
+			node.appendContent(' a3=[0000,0000,0000]')
 			node.set('a3', [0,0,0])
 		return i
 
@@ -6496,7 +6505,7 @@ class DCReader(EeDataReader):
 			a = s(node.data, i)
 			i += 13
 			lst.append(a)
-		node.content += ' lst2=[%s]' %(','.join(['(%02X,%g,%03X,%03X)' %(a[0], a[1], a[2], a[3]) for a in lst]))
+		node.appendContent(' lst2=[%s]' %(','.join(['(%02X,%g,%03X,%03X)' %(a[0], a[1], a[2], a[3]) for a in lst])))
 		node.set('lst2', lst)
 		return i
 
@@ -6665,7 +6674,7 @@ class DCReader(EeDataReader):
 			key, i = getLen32Text16(node.data, i)
 			val, i = getLen32Text16(node.data, i)
 			lst0[key] = val
-		node.content += ' lst0={%s}' %(','.join(["('%s': '%s')" %(k, v) for k, v in lst0.items()]))
+		node.appendContent(' lst0={%s}' %(','.join(["('%s': '%s')" %(k, v) for k, v in lst0.items()])))
 		node.set('lst0', lst0)
 		i = node.ReadUInt16(i, 'u16_1')
 		return i
@@ -6691,7 +6700,7 @@ class DCReader(EeDataReader):
 			f, i = getFloat64(node.data, i)
 			a, i = getUInt16A(node.data, i, 2)
 			lst0.append([f, a[0], a[1]])
-		node.content += ' lst0=[%s]' %(','.join(['(%g,%03X,%03X)' %(r[0], r[1], r[2]) for r in lst0]))
+		node.appendContent(' lst0=[%s]' %(','.join(['(%g,%03X,%03X)' %(r[0], r[1], r[2]) for r in lst0])))
 		node.set('lst0', lst0)
 		i = node.ReadList2(i, importerSegNode._TYP_UINT32_, 'lst1')
 		i = node.ReadUInt8(i, 'u8_2')
@@ -6776,14 +6785,14 @@ class DCReader(EeDataReader):
 		size = hdr[1]
 		if (size > 0):
 			i += 8
-			buffer = node.data[i:i+size]
+			buffer = bytes(node.data[i:i+size])
+			node.set('workbook', open_workbook(file_contents=buffer))
 			dumpFolder = getDumpFolder()
 			if (not (dumpFolder is None)):
 				filename = u"%s/%s_%04X.xls" %(dumpFolder, node.typeName, node.index)
 				with open(filename, 'wb') as xls:
 					xls.write(buffer)
 					node.set('filename', filename)
-					node.set('workbook', open_workbook(file_contents=buffer))
 			# logInfo(u"    INFO - found workbook: stored as %s!", filename)
 		i += size
 		i = node.ReadList2(i, importerSegNode._TYP_UINT32_, 'lst0')
@@ -6819,7 +6828,7 @@ class DCReader(EeDataReader):
 		if (getFileVersion() > 2010):
 			i = node.ReadUInt8(i, 'idx')
 		else:
-			node.content += u" idx=00"
+			node.appendContent(u" idx=00")
 		i = node.ReadCrossRef(i, 'ref_1')
 		i = node.ReadUInt32(i, 'n_1')
 		return i
@@ -6850,7 +6859,7 @@ class DCReader(EeDataReader):
 			i = node.ReadParentRef(i)
 			i = node.ReadUInt32(i, 'index')
 			self.segment.indexNodes[node.get('index')] = node
-			content = node.content
+			content = node.markContent()
 			j = i
 			i = node.ReadUInt16(i, 'u16_1')
 			i = node.ReadUInt16(i, 'u16_2')
@@ -6863,7 +6872,7 @@ class DCReader(EeDataReader):
 					i = node.ReadUInt32A(i, 3, 'a1')
 					i = node.ReadFloat64A(i, 9, 'a2')
 				else:
-					node.content = content
+					node.resetContent(content)
 					i = j
 					i = node.ReadSInt32(i, 's32_0')
 					i = node.ReadUInt32(i, 'u32_0')
@@ -7048,7 +7057,7 @@ class DCReader(EeDataReader):
 			i = node.ReadLen32Text16(i, 'txt0')
 			i = node.ReadCrossRef(i, 'ref_2')
 		else:
-			node.content += " txt0='FlatPattern'"
+			node.appendContent(" txt0='FlatPattern'")
 			node.set('txt0', 'FlatPattern')
 		return i
 
@@ -7731,7 +7740,7 @@ class DCReader(EeDataReader):
 			a = s(node.data, i)
 			i += 78
 			lst.append((ref, a[0], a[1], a[2:5], a[5:8], a[8:11]))
-		node.content += ' lst0={%s}' %(','.join(['[%04X,%03X,(%s),(%s),(%s)]' %(r[1], r[2], FloatArr2Str(r[3]), FloatArr2Str(r[4]), FloatArr2Str(r[5])) for r in lst]))
+		node.appendContent(' lst0={%s}' %(','.join(['[%04X,%03X,(%s),(%s),(%s)]' %(r[1], r[2], FloatArr2Str(r[3]), FloatArr2Str(r[4]), FloatArr2Str(r[5])) for r in lst])))
 		node.set('lst0', lst)
 		i = node.ReadUInt32(i, 'u32_2')
 		return i
@@ -7748,7 +7757,7 @@ class DCReader(EeDataReader):
 			ref, i = self.ReadNodeRef(node, i, [j, 0], importerSegNode.REF_CHILD, 'lst0')
 			a, i = getUInt32A(node.data, i, 3)
 			lst.append([ref, a])
-		node.content += ' lst0={%s}' %(','.join(['[%s,%s]' %(r[0], IntArr2Str(r[1],4)) for r in lst]))
+		node.appendContent(' lst0={%s}' %(','.join(['[%s,%s]' %(r[0], IntArr2Str(r[1],4)) for r in lst])))
 		node.set('lst0', lst)
 		return i
 
@@ -7785,11 +7794,11 @@ class DCReader(EeDataReader):
 		lstJ = []
 		s1   = Struct("<dddLddddddddd").unpack_from
 		s2   = Struct("<BL").unpack_from
-		node.content += u" lst=["
+		node.appendContent(u" lst=[")
 		sepJ = ""
 		for j in range(cntJ):
 			a1 = s1(node.data, i)
-			node.content += u"%s(%g,%g,%g) %04X (%g,%g,%g) (%g,%g,%g) (%g,%g,%g) [" %(sepJ, a1[0], a1[1], a1[2], a1[3], a1[4], a1[5], a1[6], a1[7], a1[8], a1[9], a1[10], a1[11], a1[12])
+			node.appendContent(u"%s(%g,%g,%g) %04X (%g,%g,%g) (%g,%g,%g) (%g,%g,%g) [" %(sepJ, a1[0], a1[1], a1[2], a1[3], a1[4], a1[5], a1[6], a1[7], a1[8], a1[9], a1[10], a1[11], a1[12]))
 			i += 100
 			cntM, i = getUInt32(node.data, i)
 			lstM = []
@@ -7803,8 +7812,8 @@ class DCReader(EeDataReader):
 					lstN.append(a2)
 				dummy.append(",".join(["(%s,%s)" %(a2[0], a2[1]) for a2 in lstN]))
 				lstM.append(lstN)
-			node.content += ",".join(["[%s]" %a2 for a2 in dummy])
-			node.content += u"]"
+			node.appendContent(",".join(["[%s]" %a2 for a2 in dummy]))
+			node.appendContent(u"]")
 			lstJ.append(a1 + (lstM,))
 		node.set('lst', lstM)
 		return i
@@ -7883,7 +7892,7 @@ class DCReader(EeDataReader):
 			elif (t == 1):
 				f, i = getUInt32A(node.data, i, 2)
 				lst.append(f)
-		node.content += ' edges=[%s]' %(','.join(['(%s)' %(str(f)) for f in lst]))
+		node.appendContent(' edges=[%s]' %(','.join(['(%s)' %(str(f)) for f in lst])))
 		node.set('edges', lst)
 		return i
 
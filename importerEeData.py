@@ -25,7 +25,7 @@ class EeDataReader(NameTableReader):
 		for j in range(cnt):
 			a, i = getUInt32A(node.data, i, 3) # list-index, ASM-ref, number
 			lst.append(a)
-		node.content += u" lst0=[%s]" %(u",".join([u"(%02X,%03X,%04X)" % (a[0], a[1], a[2]) for an in lst]))
+		node.appendContent(u" lst0=[%s]" %(u",".join([u"(%02X,%03X,%04X)" % (a[0], a[1], a[2]) for an in lst])))
 		node.set('lst0', lst)
 		return i
 
@@ -63,5 +63,5 @@ class FBAttributeReader(SegmentReader):
 		elif (t == 4):
 			i = node.ReadList2(i, importerSegNode._TYP_UINT8_, 'data')
 		else:
-			logError("    ERROR> Don't know what to do with %d in Read_28C25C45!" %(t))
+			logError("    ERROR> Don't know what to do with %d in Read_28C25C45!", t)
 		return i
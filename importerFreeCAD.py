@@ -157,6 +157,27 @@ def unsupportedNode(node):
 	node.setGeometry(None)
 	return None
 
+def recomputeShapes(*objects):
+	'''
+	Recomputes the objects and the objects they depend on, so that their shapes are up to date.
+	objects: The objects whose shapes are required.
+	'''
+	doc = FreeCAD.ActiveDocument
+	objects = [obj for obj in objects if (obj is not None)]
+	if (len(objects) > 0):
+		try:
+			doc.recompute(objects)
+			return
+		except TypeError:
+			pass # older FreeCAD versions can only recompute the whole document.
+	try:
+		touched = doc.isTouched()
+	except:
+		touched = True
+	if (touched):
+		doc.recompute()
+	return
+
 def newObject(className, name):
 	obj = FreeCAD.ActiveDocument.addObject(className, InventorViewProviders.getObjectName(name))
 	if (obj is not None):
@@ -350,6 +371,7 @@ def getCountDir(length, count, direction, fitted):
 
 def setDefaultViewObjectValues(geo):
 	if (geo  is None): return
+	if (not FreeCAD.GuiUp): return
 	geo.ViewObject.AngularDeflection = 28.5                    # double
 	geo.ViewObject.BoundingBox       = False                   # bool
 	geo.ViewObject.Deviation         = 0.5                     # double
@@ -369,6 +391,7 @@ def setDefaultViewObjectValues(geo):
 def adjustViewObject(newGeo, baseGeo):
 	if (newGeo  is None): return
 	if (baseGeo is None): return
+	if (not FreeCAD.GuiUp): return
 	newGeo.ViewObject.DisplayMode  = baseGeo.ViewObject.DisplayMode
 	newGeo.ViewObject.DrawStyle    = baseGeo.ViewObject.DrawStyle
 	newGeo.ViewObject.Lighting     = baseGeo.ViewObject.Lighting
@@ -486,7 +509,7 @@ def getFaceIndex(face, shape):
 	return -1
 
 def adjustBodyColor(entity, body):
-	if (body):
+	if (body and FreeCAD.GuiUp):
 		color = getBodyColor(body)
 		if (color):
 			if not (type(entity) is list):
@@ -509,7 +532,7 @@ def adjustBodyColor(entity, body):
 				entity.ViewObject.Transparency = 100 - int(color.alpha * 100)
 
 def adjustFxColor(entity, nodColor):
-	if (entity is not None):
+	if ((entity is not None) and FreeCAD.GuiUp):
 		if (nodColor is not None):
 			color = getColor(nodColor.name)
 			if (color is not None):
@@ -521,7 +544,7 @@ def adjustFxColor(entity, nodColor):
 	return
 
 def __hide__(geo):
-	if (geo is not None):
+	if ((geo is not None) and FreeCAD.GuiUp):
 		geo.ViewObject.Visibility = False
 	return
 
@@ -1035,7 +1058,7 @@ class FreeCADImporter(object):
 		if (entity is not None):
 			# create an entity that can be featured (e.g. loft, sweep, ...)
 			section = newObject('Part::Feature', participant.name)
-			FreeCAD.ActiveDocument.recompute()
+			recomputeShapes(entity)
 
 			# FIXME: Howto convert Inventor-Indices to FreeCAD-Indices?
 			if (wireIndex == 0):   wireIndex = 1
@@ -1057,6 +1080,7 @@ class FreeCADImporter(object):
 					creator    = item.segment.indexNodes[creatorIdx]
 					node       = self.getGeometry(creator)
 					if (node is not None):
+						recomputeShapes(node)
 						wireIndex = edgeId.get('wireIndex')
 						if (wireIndex < len(node.Shape.Wires)):
 							edge = node.Shape.Wires[wireIndex]
@@ -1167,7 +1191,7 @@ class FreeCADImporter(object):
 	#	elif (typ[0: 5] == 'Block'):
 	#	elif (typ[0: 5] == 'Image'):
 		else:
-			logWarning(u"    ... Don't know how to create edge from %s.%s" %(edge.__class__.__module__, edge.__class__.__name__))
+			logWarning(u"    ... Don't know how to create edge from %s.%s", edge.__class__.__module__, edge.__class__.__name__)
 		if (edge is not None):
 			if (hasattr(boundarySketch, 'addGeometry')):
 				boundarySketch.addGeometry(edge)
@@ -1240,6 +1264,7 @@ class FreeCADImporter(object):
 				if (geometry is not None):
 					edgeAttrs = acis.get(idxRef)
 					if (not edgeAttrs is None):
+						recomputeShapes(geometry)
 						acisEdges = edgeAttrs.getEdges()
 						idxEdge   = findFcEdgeIndex(geometry.Shape, acisEdges)
 						if (idxEdge is not None):
@@ -1271,6 +1296,7 @@ class FreeCADImporter(object):
 				geometry   = self.getGeometry(creator) # ensure that the creator is already available!
 				if (geometry is not None):
 					faceAttrs = acis[idxRef]
+					recomputeShapes(geometry)
 					acisFaces = faceAttrs.getFaces()
 					idxFace   = findFcFaceIndex(geometry.Shape, acisFaces)
 					if (idxFace is None):
@@ -1332,7 +1358,7 @@ class FreeCADImporter(object):
 
 	def getEdges(self, wire):
 		if (wire is not None):
-			FreeCAD.ActiveDocument.recompute()
+			recomputeShapes(wire)
 			count = len(wire.Shape.Edges)
 			return ['Edge%i' %(i) for i in range(1, count + 1)]
 
@@ -1342,6 +1368,7 @@ class FreeCADImporter(object):
 		lx, ly, lz = 0, 0, 0
 		node = self.getBodyNode(body)
 		if (node):
+			recomputeShapes(node.geometry)
 			box = node.geometry.Shape.BoundBox
 			if (not isEqual1D(dir.x, 0)): lx = box.XLength * box.XLength
 			if (not isEqual1D(dir.y, 0)): ly = box.YLength * box.YLength
@@ -1667,6 +1694,7 @@ class FreeCADImporter(object):
 		return True
 
 	def createRevolve(self, name, angle1, angle2, source, axis, base, solid, positive):
+		recomputeShapes(source)
 		revolution = newObject('Part::Revolution', name)
 		setParameter(revolution, 'Angle', (angle1, angle2), getGRAD)
 		revolution.Source = source
@@ -2145,7 +2173,7 @@ class FreeCADImporter(object):
 			self.Create_Sketch_Node(sketch, g.node)
 
 		# need to recompute otherwise FreeCAD messes up directions for other constraints!
-		FreeCAD.ActiveDocument.recompute()
+		recomputeShapes(sketch)
 
 		for d in dims:
 			self.Create_Sketch_Node(sketch, d.node)
@@ -2356,7 +2384,7 @@ class FreeCADImporter(object):
 			solid      = (surface is None)
 
 			if (boundary):
-				FreeCAD.ActiveDocument.recompute()
+				recomputeShapes(boundary)
 				if (extend1.get('value') == 1): # 'DirectionAxis' => AngleExtent
 					if (angle2 is None):
 						if (direction.get('value') == 0): # positive
@@ -2855,6 +2883,7 @@ class FreeCADImporter(object):
 					if (source):
 						sourceGeos[source.Label]    = source
 						sourceOffsets[source.Label] = getMM(faceOffset.get('offset'))
+		recomputeShapes(*sourceGeos.values())
 		for key in sourceGeos.keys():
 			source = sourceGeos[key]
 			thickenGeo = self.createEntity(thickenNode, 'Part::Offset')
@@ -3908,7 +3937,9 @@ class FreeCADImporter(object):
 
 		adjustFxColor(fxNode.geometry, fxNode.get('fxColor'))
 
-		FreeCAD.ActiveDocument.recompute()
+		# deferred: recompute only if a later feature requires shapes and finally after all features are created.
+		if (not isRecomputeDeferred()):
+			FreeCAD.ActiveDocument.recompute()
 		return
 
 	def addSketch_Spline3D_Curve(self, bezierNode, sketchObj):
@@ -4142,6 +4173,8 @@ class FreeCADImporter(object):
 
 	def importModel(self, root):
 		dc = getModel().getDC()
+		# the references of deferred nodes are resolved when the tree is built.
+		getModel().getGraphics().tree
 		doc = dc.tree.getFirstChild('Document')
 		if (doc is not None):
 			self.root           = root
@@ -19,9 +19,18 @@ __url__        = "https://www.github.com/jmplonka/InventorLoader"
 
 class GraphicsReader(EeSceneReader):
 
+	STATE_NAMES = EeSceneReader.STATE_NAMES + ('meshes', 'bodies', 'faces', 'objects3D')
+
 	def __init__(self, segment):
 		super(GraphicsReader, self).__init__(segment)
 		segment.meshes = {}
+		# the dumps require all nodes to be decoded.
+		self.lazy = (getDumpFolder() is None)
+
+	def isDecodedEagerly(self, node):
+		if (self.lazy):
+			return not self.isStateless(node.typeName)
+		return True
 
 	def ReadIndexDC(self, node, i):
 		i = node.ReadUInt32(i, 'indexDC')
@@ -171,7 +180,7 @@ class GraphicsReader(EeSceneReader):
 		else:
 			node.set('a3', [0, 0, 0])
 			node.set('f64_0', 0.0)
-			node.content += u" a3=[0000,0000,0000] f64_0=0.0"
+			node.appendContent(u" a3=[0000,0000,0000] f64_0=0.0")
 #			i = node.ReadLen32Text16(i, 'txt2')
 		return i
 
@@ -190,7 +199,7 @@ class GraphicsReader(EeSceneReader):
 		if (getFileVersion() > 2017):
 			i = node.ReadList2(i, importerSegNode._TYP_NODE_X_REF_, 'lst0')
 		else:
-			node.content += u" lst0={}"
+			node.appendContent(u" lst0={}")
 		return i
 
 	def Read_C3608DE7(self, node):
@@ -240,7 +249,7 @@ class GraphicsReader(EeSceneReader):
 		if (getFileVersion() > 2017):
 			i = node.ReadList2(i, importerSegNode._TYP_SINT32_, 'lst1')
 		else:
-			node.content += u" lst1=[]"
+			node.appendContent(u" lst1=[]")
 		return i
 
 	def Read_F9C49549(self, node):
@@ -299,7 +308,7 @@ class GraphicsReader(EeSceneReader):
 			u32, i = getUInt32(node.data, i)
 			lst.append(u32)
 			node.set('lst0', lst)
-			node.content += u" lst0=[%04X]" %(u32)
+			node.appendContent(u" lst0=[%04X]" %(u32))
 		i = self.skipBlockSize(i)
 		i = node.ReadUInt32A(i, 2, 'a2')
 		i = node.ReadColorRGBA(i,  'Color.c0')
@@ -492,7 +501,7 @@ class GraphicsReader(EeSceneReader):
 		i = self.ReadHeaderAttribute(node)
 		a = Struct('<ffffhfhhfffBLLL').unpack_from(node.data, i)
 		i += 47
-		node.content += u" a0=(%g,%g,%g,%g,%03X,%g,%03X,%03X,%g,%g,%g,%02X,%04X,%04X,%04X)" %a
+		node.appendContent(u" a0=(%g,%g,%g,%g,%03X,%g,%03X,%03X,%g,%g,%g,%02X,%04X,%04X,%04X)" %a)
 		node.set('a0', a)
 		return i
 
@@ -537,8 +546,8 @@ class GraphicsReader(EeSceneReader):
 			i = node.ReadList2(i, importerSegNode._TYP_UINT32_, 'lst3')
 		else:
 			cnt, i = getUInt32(node.data, i)
-			lst3, i = getUInt8A(node.data, i, cnt)
-			node.content += " lst3=[%s]" %(','.join('%04X' %(n) for n in lst3))
+			lst3, i = getArray(node.data, i, 'B', cnt)
+			node.appendContent(" lst3=[%s]" %(','.join('%04X' %(n) for n in lst3)))
 			node.set('lst3', lst3)
 		i = node.ReadUInt32(i, 'u32_2')
 		i = node.ReadFloat64(i, 'f0')
@@ -577,7 +586,7 @@ class GraphicsReader(EeSceneReader):
 		i = self.Read_ColorAttr(i, node)
 		i = self.skipBlockSize(i)
 		a1 = Struct('<HfHh').unpack_from(node.data, i)
-		node.content += " a1=[%03X,%g,%03X,%d]" %(a1[0], a1[1], a1[2], a1[3])
+		node.appendContent(" a1=[%03X,%g,%03X,%d]" %(a1[0], a1[1], a1[2], a1[3]))
 		i += 10
 		node.set('a1', a1)
 		i = node.ReadUInt8(i, 'u8_1')
@@ -595,7 +604,7 @@ class GraphicsReader(EeSceneReader):
 		i = self.Read_ColorAttr(i, node)
 		i = self.skipBlockSize(i)
 		a1 = Struct('<HfHh').unpack_from(node.data, i)
-		node.content += " a1=[%03X,%g,%03X,%d]" %(a1[0], a1[1], a1[2], a1[3])
+		node.appendContent(" a1=[%03X,%g,%03X,%d]" %(a1[0], a1[1], a1[2], a1[3]))
 		i += 10
 		node.set('a1', a1)
 		i = node.ReadUInt8(i, 'u8_1')
@@ -611,7 +620,7 @@ class GraphicsReader(EeSceneReader):
 		if (getFileVersion() < 2020): i += 8 # skip 00 00 00 00 00 00 00 00
 		a = Struct('<LHLLLLL').unpack_from(node.data, i)
 		i += 26
-		node.content += u" a1=[%04X,%03X,%04X,%04X,%04X,%04X,%04X]" %a
+		node.appendContent(u" a1=[%04X,%03X,%04X,%04X,%04X,%04X,%04X]" %a)
 		node.set('a1', a)
 		i = node.ReadList2(i, importerSegNode._TYP_F64_F64_U32_U8_U8_U16_, 'lst0')
 		i = node.ReadFloat64_2D(i, 'a2')
@@ -828,7 +837,7 @@ class GraphicsReader(EeSceneReader):
 		i = node.ReadFloat64A(i, 6, 'box') # bounding box
 		a = Struct('<dHHH').unpack_from(node.data, i)
 		i += 8+6
-		node.content += u" a0=(%g,%03X,%03X,%03X)" %a
+		node.appendContent(u" a0=(%g,%03X,%03X,%03X)" %a)
 		node.set('a1', a)
 		i = node.ReadList2(i, importerSegNode._TYP_NODE_X_REF_, 'outlines')
 		i = node.ReadList2(i, importerSegNode._TYP_TRANSFORMATIONS_, 'transformations')
@@ -863,7 +872,7 @@ class GraphicsReader(EeSceneReader):
 		if (node.get('u32_1') == 1):
 			i = node.ReadFloat64A(i, 6, 'a2')
 		else:
-			node.content += ' a2=()'
+			node.appendContent(' a2=()')
 		cnt, i = getUInt32(node.data, i)
 		i = self.ReadFloat64A(node, i, cnt, 'a3', 3)
 		i = node.ReadFloat64A(i, 6, 'box')
@@ -10,7 +10,6 @@ import importerUtils, Acis, importerClasses
 from importerUtils   import canImport, logInfo, logWarning, logError, logAlways
 from olefile         import isOleFile
 from importerFreeCAD import createGroup
-from pivy            import coin
 
 __author__     = "Jens M. Plonka"
 __copyright__  = 'Copyright 2018, Germany'
@@ -34,6 +33,10 @@ def insertGroup(doc, filename):
 	return root
 
 def read(doc, filename, readProperties):
+	importerUtils.refreshLogLevels()
+	# nothing of a previous import must leak into this one.
+	importerUtils.newSession()
+	Acis.setContext(Acis.AcisContext())
 	name, ext = os.path.splitext(filename)
 	ext = ext.lower()
 	if (ext == '.ipt'):
@@ -70,12 +73,13 @@ def isFileValid(filename):
 	return canImport()
 
 def releaseMemory():
-	importerUtils._thumbnail = None
+	importerUtils.getSession().thumbnail = None
 	Acis.releaseMemory()
 	importerClasses.releaseModel()
 
 def adjustView(doc):
 	if (FreeCAD.GuiUp):
+		from pivy import coin
 		# adjust camara position and orientation
 		g = FreeCADGui.getDocument(doc.Name)
 		v = g.ActiveView
@@ -102,7 +106,8 @@ def insert(filename, docname, skip = [], only = [], root = None):
 				group = insertGroup(doc, name)
 				reader.create3dModel(group, doc)
 			releaseMemory()
-			FreeCADGui.SendMsgToActiveView("ViewFit")
+			if (FreeCAD.GuiUp):
+				FreeCADGui.SendMsgToActiveView("ViewFit")
 			logInfo(u"DONE!")
 		except:
 			open(filename, skip, only, root)
@@ -5,7 +5,13 @@ importerReader.py:
 Simple approach to read/analyse Autodesk (R) Invetor (R) files.
 '''
 
-import sys, os, uuid, datetime, re, zlib, operator, glob, struct, codecs, xlrd, FreeCAD, Import_IPT, importerOle10Nateive
+import sys, os, uuid, datetime, re, zlib, operator, glob, struct, codecs, traceback, xlrd, FreeCAD, Import_IPT, importerOle10Nateive
+import multiprocessing
+from itertools            import islice
+from collections          import deque
+from multiprocessing      import cpu_count
+from multiprocessing.pool import ThreadPool
+from importerCache        import pickleNodes, unpickleNodes
 from importerClasses     import *
 from importerSegment     import SegmentReader
 from importerApp         import AppReader
@@ -30,9 +36,6 @@ __author__     = 'Jens M. Plonka'
 __copyright__  = 'Copyright 2018, Germany'
 __url__        = "https://www.github.com/jmplonka/InventorLoader"
 
-# The model representing the content of the imported file
-model = None
-
 KEY_SUM_INFO_AUTHOR      = 0x04
 KEY_SUM_INFO_COMMENT     = 0x06
 KEY_SUM_INFO_MODIFYER    = 0x08
@@ -81,6 +84,14 @@ SEG_TYPE_READERS = {
 #	SEG_SHEET_SM_DL    : SheetSmReader,
 }
 
+# Segment types each import strategy requires to build the 3D model.
+# The application segment is always required as it defines the colors.
+STRATEGY_SEGMENTS = {
+	STRATEGY_SAT:    SEGMENTS_APP + SEGMENTS_BRP,
+	STRATEGY_STEP:   SEGMENTS_APP + SEGMENTS_BRP,
+	STRATEGY_NATIVE: SEGMENTS_APP + SEGMENTS_BRP + SEGMENTS_DOC + SEGMENTS_GRX,
+}
+
 # F29F85E0-4FF9-1068-AB91-08002B27B3D9
 Inventor_Summary_Information = {
 	 2: "Title",
@@ -187,6 +198,16 @@ Inventor_Piping_Style_Properties = {
 	3: u"Name"
 }
 
+PROPERTY_SETS = {
+	'\x05Aaalpg0m0wzvuhc41dwauxbwJc': Inventor_Document_Summary_Information,
+	'\x05Zrxrt4arFafyu34gYa3l3ohgHg': Inventor_Summary_Information,
+	'\x05Qz4dgm1gRjudbpksAayal4qdGf': Design_Tracking_Control,
+	'\x05PypkizqiUjudbposAayal4qdGf': Design_Tracking_Properties,
+	'\x05Qm0qv30hP3udrkgvAaitm1o20d': Private_Model_Information,
+	'\x05Ynltsm4aEtpcuzs1Lwgf30tmXf': Inventor_User_Defined_Properties,
+	'\x05C3vnhh4uFrpeuhcsBpg4yptkTb': Inventor_Piping_Style_Properties,
+}
+
 def getProperty(properties, key):
 	value = properties.get(key, '')
 	if (type(value) is str):
@@ -231,6 +252,33 @@ def ReadInventorSummaryInformation(doc, properties, path):
 				getModel().iProperties[name][key] = (Inventor_Summary_Information.get(key, key), val)
 	return
 
+def ProbeProperties(properties, path):
+	'''
+	Returns the name and the values of the property set without touching the model.
+	'''
+	name = getProperty(properties, KEY_SET_NAME)
+	if ((name is None ) or (len(name)==0)):
+		name = path[-1][1:]
+	keynames  = PROPERTY_SETS.get(path[-1], {})
+	values    = {}
+	thumbnail = None
+	for key in sorted(properties.keys()):
+		if ((key != KEY_CODEPAGE) and (key != KEY_SET_NAME) and (key != KEY_LANGUAGE_CODE)):
+			val = getProperty(properties, key)
+			if (val is not None):
+				if ((keynames is Inventor_Summary_Information) and (key in (KEY_THUMBNAIL_1, KEY_THUMBNAIL_2))):
+					val = thumbnail = Thumbnail(val)
+				values[key] = (keynames.get(key, key), val)
+	return name, values, thumbnail
+
+def ProbeRSeMetaDataM(dataM, name, sizeB):
+	'''
+	Reads only the uncompressed header of the segment's meta data.
+	'''
+	info = SegmentInfo(name, sizeB)
+	ReadRSeMetaDataHeader(dataM, info)
+	return info
+
 def ReadOtherProperties(properties, path, keynames={}):
 	name, keys = getPropertySetName(properties, path)
 
@@ -626,7 +674,7 @@ def ReadRSeMetaDataBlocksType(value, data, offset):
 def ReadRSeMetaDataSection5(value, data, offset, size):
 	#index section 4
 	sec = RSeStorageSection5(value)
-	sec.indexSec4, i = getUInt16A(data, offset, size / 2)
+	sec.indexSec4, i = getArray(data, offset, 'H', size // 2)
 	secSize, i = getUInt32(data, i)
 	return i
 
@@ -742,16 +790,40 @@ def ReadRSeMetaDataSectionB(value, data, offset, size, cnt):
 def findSegment(segRef):
 	return getModel().RSeDb.segInfo.segments.get(segRef)
 
+def getRequiredSegmentTypes(strategy):
+	'''
+	Returns the list of segment types that have to be read for the given strategy.
+	Returns None if all segments have to be read, e.g. for analysing the file's content.
+	'''
+	if (readAllSegments()):
+		return None
+	return STRATEGY_SEGMENTS.get(strategy, None)
+
+def isSegmentRequired(seg, required):
+	if (required is None):
+		return True
+	if (seg.segment is None):
+		# segment's type is unknown => better read it!
+		return True
+	return seg.type in required
+
 def getReader(seg):
 	logInfo(u"%2d: '%s' ('%s')", seg.index, seg.file, seg.name)
 	seg.AcisList = []
 	reader = SEG_TYPE_READERS.get(seg.type, None)
 	if (reader is None):
-		logError(u"    NO READER DEFINED FOR %s '%s'" %(seg.type, seg.name))
+		logError(u"    NO READER DEFINED FOR %s '%s'", seg.type, seg.name)
 		return SegmentReader(seg)
 	return reader(seg)
 
-def ReadRSeMetaDataB(dataB, seg):
+def inflateRSeMetaDataB(dataB):
+	i = 0
+	uid, i = getUUID(dataB, i)
+	n, i = getUInt16(dataB, i)
+	z = zlib.decompressobj()
+	return z.decompress(dataB[i:])
+
+def ReadRSeSegmentData(data, seg):
 	reader = getReader(seg)
 	if (reader):
 		newFile = None
@@ -759,25 +831,158 @@ def ReadRSeMetaDataB(dataB, seg):
 		if (not (dumpFolder is None)):
 			newFile = codecs.open(u"%s/%s.log" %(dumpFolder, seg.name), 'wb', 'utf8')
 			newFile.write('[%s]\n' %(getFileVersion()))
-		i = 0
-		uid, i = getUUID(dataB, i)
-		n, i = getUInt16(dataB, i)
-		z = zlib.decompressobj()
-		data = z.decompress(dataB[i:])
 
 		reader.ReadSegmentData(newFile, data)
 		if (not (newFile is None)):
 			newFile.close()
 	return
 
-def ReadRSeMetaDataM(dataM, name):
+def ReadRSeMetaDataB(dataB, seg):
+	ReadRSeSegmentData(inflateRSeMetaDataB(dataB), seg)
+	return
+
+class _MessageSink(object):
+	'''
+	Log sink that keeps the messages of a worker process - they are logged by the importer's process.
+	'''
+	def __init__(self):
+		self.messages = []
+	def PrintMessage(self, msg): self.messages.append(('PrintMessage', msg))
+	def PrintWarning(self, msg): self.messages.append(('PrintWarning', msg))
+	def PrintError(self, msg):   self.messages.append(('PrintError',   msg))
+
+def isSelfContained(seg):
+	# reading the application segments sets the colors of the session, the segments with
+	# ACIS data share the ACIS context (e.g. the DC attributes) with each other and the import.
+	return not (seg.isApp() or seg.isBRep() or seg.isDC())
+
+def _getSharedObjects(seg):
+	# the objects of the importer's process that are referenced by a segment read in a worker process.
+	return tuple(obj for obj in (seg, seg.segment, getSession()) if (obj is not None))
+
+def _getProcessContext():
+	# the workers inherit the segments' data - only forked processes can be used.
+	if (sys.platform == 'win32'):
+		return None
+	if (sys.version_info.major < 3):
+		return multiprocessing
+	if ('fork' in multiprocessing.get_all_start_methods()):
+		return multiprocessing.get_context('fork')
+	return None
+
+_elements = []
+
+def _readSegmentInProcess(index):
+	seg, dataB = _elements[index]
+	sink = _MessageSink()
+	setLogSink(sink)
+	ReadRSeMetaDataB(dataB, seg)
+	if (len(seg.AcisList) > 0):
+		# the segment isn't self-contained => the importer's process has to read it.
+		return None
+	return pickleNodes(dict(seg.__dict__), _getSharedObjects(seg)), sink.messages
+
+def _mergeSegment(seg, result):
+	state, messages = result
+	sink = getLogSink()
+	for method, msg in messages:
+		getattr(sink, method)(msg)
+	seg.__dict__.update(unpickleNodes(state, _getSharedObjects(seg)))
+
+def _readRSeMetaDataBsInProcesses(elements):
+	global _elements
+	context = _getProcessContext()
+	indices = [index for index, (seg, dataB) in enumerate(elements) if ((seg is not None) and isSelfContained(seg))]
+	if ((context is None) or (len(indices) == 0) or (cpu_count() < 2)):
+		return False
+	_elements = elements
+	try:
+		workers = min(len(indices), cpu_count())
+		pool    = context.Pool(workers)
+	except:
+		# e.g. a daemonic worker process of the batch converter can't have children.
+		_elements = []
+		return False
+	try:
+		# only a window of parsed segments is kept in memory.
+		indices = iter(indices)
+		pending = deque([(index, pool.apply_async(_readSegmentInProcess, (index,))) for index in islice(indices, workers)])
+		for seg, dataB in elements:
+			if (seg is None):
+				dataB()
+			elif (not isSelfContained(seg)):
+				ReadRSeMetaDataB(dataB, seg)
+			else:
+				index, result = pending.popleft()
+				for following in islice(indices, 1):
+					pending.append((following, pool.apply_async(_readSegmentInProcess, (following,))))
+				try:
+					result = result.get()
+				except:
+					logWarning(u"    Can't read '%s' in a worker process - reading it again:", seg.name)
+					logWarning(traceback.format_exc())
+					result = None
+				if (result is None):
+					ReadRSeMetaDataB(dataB, seg)
+				else:
+					_mergeSegment(seg, result)
+	finally:
+		pool.terminate()
+		_elements = []
+	return True
+
+def _readRSeMetaDataBsInThreads(elements):
+	streams = [dataB for seg, dataB in elements if (seg is not None)]
+	workers = min(len(streams), cpu_count())
+	pool    = ThreadPool(workers)
+	try:
+		# only a window of inflated streams is kept in memory.
+		streams = iter(streams)
+		pending = deque([pool.apply_async(inflateRSeMetaDataB, (dataB,)) for dataB in islice(streams, workers)])
+		for seg, dataB in elements:
+			if (seg is None):
+				dataB()
+			else:
+				data = pending.popleft().get()
+				for dataB in islice(streams, 1):
+					pending.append(pool.apply_async(inflateRSeMetaDataB, (dataB,)))
+				ReadRSeSegmentData(data, seg)
+	finally:
+		pool.terminate()
+	return
+
+def ReadRSeMetaDataBs(elements):
+	'''
+	Reads the B-streams of all the segments and the embeddings in between.
+	elements: list of tuples (segment, B-stream data) or (None, function reading an embedding).
+	The self-contained segments are read by worker processes and merged in the given order.
+	If no worker processes can be used, the next few B-streams are inflated concurrently
+	(zlib releases the GIL) while the elements are read one after the other.
+	'''
+	streams = [dataB for seg, dataB in elements if (seg is not None)]
+	if (len(streams) < 2):
+		for seg, dataB in elements:
+			if (seg is None):
+				dataB()
+			else:
+				ReadRSeMetaDataB(dataB, seg)
+		return
+	if (not _readRSeMetaDataBsInProcesses(elements)):
+		_readRSeMetaDataBsInThreads(elements)
+	return
+
+def ReadRSeMetaDataHeader(dataM, value):
 	i = 0
-	value = Segment()
 	value.txt1,  i = getLen32Text8(dataM, i)
 	value.ver,   i = getUInt16(dataM, i)
 	value.arr1,  i = getUInt16A(dataM, i, 8)
 	value.name,  i = getLen32Text16(dataM, i)
 	value.segID, i = getUUID(dataM, i)
+	return i
+
+def ReadRSeMetaDataM(dataM, name):
+	value = Segment()
+	i = ReadRSeMetaDataHeader(dataM, value)
 
 	value.segment = findSegment(value.segID)
 	if (value.segment is not None):
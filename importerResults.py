@@ -34,10 +34,10 @@ class ResultReader(SegmentReader):
 			if (getFileVersion() > 2016):
 				i = node.ReadList6(i, importerSegNode._TYP_MAP_KEY_MAP_APP_1_, 'lst5')
 			else:
-				node.content += ' lst5={}'
+				node.appendContent(' lst5={}')
 				i += 1
 		else:
-			node.content += ' lst4={} lst5={}'
+			node.appendContent(' lst4={} lst5={}')
 			i += 1
 		i = node.ReadList4(i, importerSegNode._TYP_RESULT_5_, 'lst6')
 		i = node.ReadList4(i, importerSegNode._TYP_RESULT_4_, 'lst7')
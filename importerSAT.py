@@ -5,16 +5,20 @@ importerSAT.py:
 Collection of classes necessary to read and analyse Autodesk (R) Invetor (R) files.
 '''
 
-import os, sys, tokenize, FreeCAD, Part, re, traceback, datetime, ImportGui, io
-from importerUtils   import logInfo, logWarning, logError, getUInt8A, getUInt32, chooseImportStrategyAcis, STRATEGY_SAT, setDumpFolder, getDumpFolder
+import os, sys, tokenize, FreeCAD, Part, re, traceback, datetime, Import, io, hashlib
+from importerUtils   import logInfo, logWarning, logError, getUInt8A, getUInt32, chooseImportStrategyAcis, STRATEGY_SAT, setDumpFolder, getDumpFolder, isShapeCacheEnabled
 from Acis2Step       import export
 from math            import fabs
-from Acis            import TAG_ENTITY_REF, getReader, setReader, AcisReader, AcisChunkPosition, setVersion, createNode, init
+from Acis            import TAG_ENTITY_REF, getReader, setReader, AcisReader, AcisChunkPosition, setVersion, createNodes, createAllNodes, init
+from importerCache   import loadModel, saveModel, loadShape, saveShape, getImporterVersion, getModelVariant
 
 __author__     = 'Jens M. Plonka'
 __copyright__  = 'Copyright 2018, Germany'
 __url__        = "https://www.github.com/jmplonka/InventorLoader"
 
+if (FreeCAD.GuiUp):
+	import ImportGui
+
 lumps = 0
 wires = 0
 
@@ -127,16 +131,48 @@ def buildBody(root, node):
 
 def _resolveNodes(acis):
 	init()
-	bodies = []
-	doAdd  = True
-	for entity in acis.getEntities():
-		node = createNode(entity)
-		if (node):
-			if (doAdd and (entity.name == 'body')):
-				bodies.append(node)
-			if (entity.name in ['Begin-of-ACIS-History-Data', 'End-of-ACIS-data']):
-				doAdd = False
-	return bodies
+	return createNodes(acis)
+
+def _getShapeKey(acis):
+	sha = hashlib.sha1()
+	sha.update(getImporterVersion().encode('utf8'))
+	sha.update((u"%s" %(acis.header)).encode('utf8'))
+	sha.update(acis.digest.encode('utf8'))
+	return sha.hexdigest()
+
+def _getLumpFaces(lump):
+	return [face for shell in lump.getShells() for face in shell.getFaces()]
+
+def loadShapes(acis, bodies):
+	'''
+	Assigns the cached shapes to the faces of the bodies' lumps.
+	Returns the key of the ACIS data and the lumps that have to be built.
+	'''
+	if (not isShapeCacheEnabled()):
+		return None, []
+	key = _getShapeKey(acis)
+	missing = []
+	for body in bodies:
+		for lump in body.getLumps():
+			faces = _getLumpFaces(lump)
+			compound = loadShape("%s_%d" %(key, lump.index))
+			if ((compound is not None) and (len(compound.childShapes()) == len(faces))):
+				for face, shapes in zip(faces, compound.childShapes()):
+					children = shapes.childShapes()
+					if (len(children) > 0):
+						face.shape = children[0]
+			else:
+				missing.append(lump)
+	return key, missing
+
+def saveShapes(key, lumps):
+	'''
+	Stores the faces' shapes of each lump as one compound to keep shared edges and vertices.
+	'''
+	for lump in lumps:
+		shapes = [Part.Compound([] if (face.shape is None) else [face.shape]) for face in _getLumpFaces(lump)]
+		saveShape("%s_%d" %(key, lump.index), Part.Compound(shapes))
+	return
 
 def importModel(root):
 	global lumps, wires
@@ -144,16 +180,28 @@ def importModel(root):
 	lumps = 0
 	acis = getReader()
 	bodies = _resolveNodes(acis)
+	key, missing = loadShapes(acis, bodies)
 	for body in bodies:
 		buildBody(root, body)
+	saveShapes(key, missing)
 	return
 
 def convertModel(group, docName):
 	global _fileName
 	acis = getReader()
 	bodies = _resolveNodes(acis)
+	key, missing = loadShapes(acis, bodies)
 	stepfile = export(acis.name, acis.header, bodies)
-	ImportGui.insert(stepfile, docName)
+	saveShapes(key, missing)
+	try:
+		if (FreeCAD.GuiUp):
+			ImportGui.insert(stepfile, docName)
+		else:
+			Import.insert(stepfile, docName)
+	finally:
+		if (getDumpFolder() is None):
+			# STEP file was only temporarily required for FreeCAD's STEP importer
+			os.remove(stepfile)
 
 def readText(fileName):
 	global _fileName
@@ -161,10 +209,16 @@ def readText(fileName):
 
 	result = False
 	setDumpFolder(fileName)
+	reader = loadModel(fileName, 'acis', getModelVariant())
+	if (reader is not None):
+		setReader(reader)
+		return True
 	with open(fileName, 'rU') as file:
 		reader = AcisReader(file)
 		reader.name, trash = os.path.splitext(os.path.basename(fileName))
 		result = reader.readText()
+	if (result):
+		saveModel(fileName, 'acis', reader, getModelVariant())
 
 	return result
 
@@ -174,6 +228,11 @@ def readBinary(fileName):
 
 	result = False
 	setDumpFolder(fileName)
+	reader = loadModel(fileName, 'acis', getModelVariant())
+	if (reader is not None):
+		setReader(reader)
+		dumpSat(reader.name, reader)
+		return True
 	with open(fileName, 'rb') as file:
 		reader = AcisReader(file)
 		reader.name, trash = os.path.splitext(os.path.basename(fileName))
@@ -181,6 +240,8 @@ def readBinary(fileName):
 		if (result):
 			name, trash = os.path.splitext(os.path.basename(fileName))
 			dumpSat(name, reader)
+	if (result):
+		saveModel(fileName, 'acis', reader, getModelVariant())
 	return result
 
 def create3dModel(group, doc):
@@ -194,28 +255,33 @@ def create3dModel(group, doc):
 	return
 
 def dumpSat(name, acis, use_dump_folder = True):
+	dumpFolder = getDumpFolder()
+	if (dumpFolder is None):
+		return
+
 	header     = acis.header
 	history    = acis.history
 	entities   = acis.getEntities()
-	dumpFolder = getDumpFolder()
 	historyIdx = None
 
 	if (history):
 		historyIdx = history.index
 
-	if (dumpFolder):
-		if (use_dump_folder):
-			satFile = os.path.join(dumpFolder, "%s.sat" %(name))
-		else:
-			satFile = name
-		with io.open(satFile, 'wt', encoding='utf-8') as sat:
-			sat.write(header.__str__())
-			for record in entities:
-				if (record.index == historyIdx):
-					sat.write(u"%r\n"%(history.getRecord()))
-					for ds in history.delta_states:
-						sat.write(u"%s\n"%(ds.getRecord()))
-					sat.write(u"End-of-ACIS-History-Section\n")
-				sat.write(u"%s\n"%(record))
-			sat.write(u"End-of-ACIS-data\n")
+	# the records are written with the values parsed by their nodes.
+	createAllNodes(acis)
+
+	if (use_dump_folder):
+		satFile = os.path.join(dumpFolder, "%s.sat" %(name))
+	else:
+		satFile = name
+	with io.open(satFile, 'wt', encoding='utf-8') as sat:
+		sat.write(header.__str__())
+		for record in entities:
+			if (record.index == historyIdx):
+				sat.write(u"%r\n"%(history.getRecord()))
+				for ds in history.delta_states:
+					sat.write(u"%s\n"%(ds.getRecord()))
+				sat.write(u"End-of-ACIS-History-Section\n")
+			sat.write(u"%s\n"%(record))
+		sat.write(u"End-of-ACIS-data\n")
 	return
@@ -6,7 +6,7 @@ Simple approach to read/analyse Autodesk (R) Invetor (R) part file's (IPT) brows
 The importer can read files from Autodesk (R) Invetor (R) Inventro V2010 on. Older versions will fail!
 '''
 
-from importerClasses        import AbstractData, Header0, Angle, GraphicsFont, Lightning, ModelerTxnMgr, NtEntry, ParameterNode, AbstractValue
+from importerClasses        import AbstractData, _getSlots, Header0, Angle, GraphicsFont, Lightning, ModelerTxnMgr, NtEntry, ParameterNode, AbstractValue
 from importerUtils          import *
 from math                   import log10, pi
 from importerTransformation import Transformation3D
@@ -218,137 +218,195 @@ TYP_MAP_FUNC = {
 	_TYP_MAP_KEY_MAP_APP_1_:    'getMapKeyMapApp1',
 }
 
+# The attributes set by decoding the node's data - accessing one of them decodes a deferred node.
+_DECODED_SLOTS = ('typeName', 'name', '_content', 'references', 'properties', 'visible', 'construction')
+
 class SecNode(AbstractData):
+	__slots__ = ('offset', 'reader', 'session', 'deferred', 'typeName', 'data', 'parent', 'isAttr', 'dimensioningVisible', 'sketchEdges', 'associativeIDs', 'Entry', 'Item', 'TypeName', 'numref', 'object3D', 'surface', 'edge', 'outline')
 
 	def __init__(self):
 		super(SecNode, self).__init__()
-		self.analysed = False
+		self.deferred = False
+
+	def defer(self):
+		'''
+		Postpones decoding the node's data by its reader until one of the decoded attributes is accessed.
+		'''
+		for name in _DECODED_SLOTS:
+			delattr(self, name)
+		# the reader depends on the file's version and block size.
+		self.session  = getSession()
+		self.deferred = True
+
+	def decode(self):
+		'''
+		Decodes the data of a deferred node.
+		'''
+		if (self.deferred):
+			self.deferred     = False
+			self.name         = None
+			self._content     = []
+			self.references   = []
+			self.properties   = {}
+			self.visible      = False
+			self.construction = False
+			self.typeName     = '%08X' %(self.uid.time_low)
+			previous = setSession(self.session)
+			try:
+				self.reader.HandleBlock(self)
+			finally:
+				setSession(previous)
+			self.data    = None
+			self.reader  = None
+			self.session = None
+
+	def __getattr__(self, name):
+		# only called for attributes that are not set => decode the data of a deferred node now.
+		if ((name != 'deferred') and self.deferred):
+			self.decode()
+			return getattr(self, name)
+		raise AttributeError(name)
+
+	def __getstate__(self):
+		if (not self.deferred):
+			return super(SecNode, self).__getstate__()
+		# keep the node deferred - accessing the decoded attributes would decode it.
+		state = {}
+		for name in _getSlots(self.__class__):
+			if (name not in _DECODED_SLOTS):
+				try:
+					state[name] = object.__getattribute__(self, name)
+				except AttributeError:
+					pass
+		# the data is a view of the segment's buffer that can't be pickled.
+		state['data'] = bytes(self.data)
+		return state
 
 	def ReadUInt8(self, offset, name):
 		x, i = getUInt8(self.data, offset)
 		self.set(name, x)
-		self.content += ' %s=%02X' %(name, x)
+		self.appendContent(' %s=%02X', name, x)
 		return i
 
 	def ReadUInt8A(self, offset, n, name):
 		x, i = getUInt8A(self.data, offset, n)
 		self.set(name, x)
-		self.content += ' %s=[%s]' %(name, ",".join(["%02X" % h for h in x]))
+		self.appendContent(lambda name, x: ' %s=[%s]' %(name, ",".join(["%02X" % h for h in x])), name, x)
 		return i
 
 	def ReadUInt16(self, offset, name):
 		x, i = getUInt16(self.data, offset)
 		self.set(name, x)
-		self.content += ' %s=%03X' %(name, x)
+		self.appendContent(' %s=%03X', name, x)
 		return i
 
 	def ReadUInt16A(self, offset, n, name):
 		x, i = getUInt16A(self.data, offset, n)
 		self.set(name, x)
-		self.content += ' %s=[%s]' %(name, ",".join(["%03X" % h for h in x]))
+		self.appendContent(lambda name, x: ' %s=[%s]' %(name, ",".join(["%03X" % h for h in x])), name, x)
 		return i
 
 	def ReadSInt16(self, offset, name):
 		x, i = getSInt16(self.data, offset)
 		self.set(name, x)
-		self.content += ' %s=%d' %(name, x)
+		self.appendContent(' %s=%d', name, x)
 		return i
 
 	def ReadSInt16A(self, offset, n, name):
 		x, i = getSInt16A(self.data, offset, n)
 		self.set(name, x)
-		self.content += ' %s=[%s]' %(name, ",".join(["%d" % d for d in x]))
+		self.appendContent(lambda name, x: ' %s=[%s]' %(name, ",".join(["%d" % d for d in x])), name, x)
 		return i
 
 	def ReadUInt32(self, offset, name):
 		x, i = getUInt32(self.data, offset)
 		self.set(name, x)
-		self.content += ' %s=%04X' %(name, x)
+		self.appendContent(' %s=%04X', name, x)
 		return i
 
 	def ReadUInt32A(self, offset, n, name):
 		x, i = getUInt32A(self.data, offset, n)
 		self.set(name, x)
-		self.content += ' %s=[%s]' %(name, ",".join(["%04X" % h for h in x]))
+		self.appendContent(lambda name, x: ' %s=[%s]' %(name, ",".join(["%04X" % h for h in x])), name, x)
 		return i
 
 	def ReadSInt32(self, offset, name):
 		x, i = getSInt32(self.data, offset)
 		self.set(name, x)
-		self.content += ' %s=%d' %(name, x)
+		self.appendContent(' %s=%d', name, x)
 		return i
 
 	def ReadSInt32A(self, offset, n, name):
 		x, i = getSInt32A(self.data, offset, n)
 		self.set(name, x)
-		self.content += ' %s=[%s]' %(name, ",".join(["%d" % d for d in x]))
+		self.appendContent(lambda name, x: ' %s=[%s]' %(name, ",".join(["%d" % d for d in x])), name, x)
 		return i
 
 	def ReadFloat32(self, offset, name):
 		x, i = getFloat32(self.data, offset)
 		self.set(name, x)
-		self.content += ' %s=%g' %(name, x)
+		self.appendContent(' %s=%g', name, x)
 		return i
 
 	def ReadFloat32A(self, offset, n, name):
 		x, i = getFloat32A(self.data, offset, n)
 		self.set(name, x)
-		self.content += ' %s=(%s)' %(name, ",".join(["%g" % g for g in x]))
+		self.appendContent(lambda name, x: ' %s=(%s)' %(name, ",".join(["%g" % g for g in x])), name, x)
 		return i
 
 	def ReadFloat32_2D(self, offset, name):
 		x, i = getFloat32_2D(self.data, offset)
 		self.set(name, x)
-		self.content += ' %s=(%g,%g)' %(name, x[0], x[1])
+		self.appendContent(lambda name, x: ' %s=(%g,%g)' %(name, x[0], x[1]), name, x)
 		return i
 
 	def ReadFloat32_3D(self, offset, name):
 		x, i = getFloat32_3D(self.data, offset)
 		self.set(name, x)
-		self.content += ' %s=(%g,%g,%g)' %(name, x[0], x[1], x[1])
+		self.appendContent(lambda name, x: ' %s=(%g,%g,%g)' %(name, x[0], x[1], x[1]), name, x)
 		return i
 
 	def ReadFloat64(self, offset, name):
 		x, i = getFloat64(self.data, offset)
 		self.set(name, x)
-		self.content += ' %s=%g' %(name, x)
+		self.appendContent(' %s=%g', name, x)
 		return i
 
 	def ReadFloat64A(self, offset, n, name):
 		x, i = getFloat64A(self.data, offset, n)
 		self.set(name, x)
-		self.content += ' %s=(%s)' %(name, ",".join(["%g" % g for g in x]))
+		self.appendContent(lambda name, x: ' %s=(%s)' %(name, ",".join(["%g" % g for g in x])), name, x)
 		return i
 
 	def ReadFloat64_2D(self, offset, name):
 		v, i = getFloat64_2D(self.data, offset)
 		self.set(name, v)
-		self.content += ' %s=(%g,%g)' %(name, v.x, v.y)
+		self.appendContent(' %s=(%g,%g)', name, v.x, v.y)
 		return i
 
 	def ReadFloat64_3D(self, offset, name):
 		v, i = getFloat64_3D(self.data, offset)
 		self.set(name, v)
-		self.content += ' %s=(%g,%g,%g)' %(name, v.x, v.y, v.z)
+		self.appendContent(' %s=(%g,%g,%g)', name, v.x, v.y, v.z)
 		return i
 
 	def ReadVec3D(self, offset, name, scale = 1.0):
 		v, i = getFloat64_3D(self.data, offset)
 		v *= scale
 		self.set(name, v)
-		self.content += ' %s=(%g,%g,%g)' %(name, v.x, v.y, v.z)
+		self.appendContent(' %s=(%g,%g,%g)', name, v.x, v.y, v.z)
 		return i
 
 	def ReadUUID(self, offset, name):
 		x, i = getUUID(self.data, offset)
 		self.set(name, x)
-		self.content += ' %s={%s}' %(name, x)
+		self.appendContent(' %s={%s}', name, x)
 		return i
 
 	def ReadColorRGBA(self, offset, name):
 		x, i = getColorRGBA(self.data, offset)
 		self.set(name, x)
-		self.content += ' %s=%s' %(name, x)
+		self.appendContent(' %s=%s', name, x)
 		i += getBlockSize()
 		return i
 
@@ -364,7 +422,7 @@ class SecNode(AbstractData):
 	def ReadBoolean(self, offset, name):
 		x, i = getBoolean(self.data, offset)
 		self.set(name, x)
-		self.content += ' %s=%s' %(name, x)
+		self.appendContent(' %s=%s', name, x)
 		return i
 
 	def ReadEnum16(self, offset, name, enum):
@@ -374,21 +432,21 @@ class SecNode(AbstractData):
 			self.name = e
 		else:
 			self.set(name, e)
-			self.content += ' %s=%s' %(name, e)
+			self.appendContent(' %s=%s', name, e)
 		return i
 
 	def ReadAngle(self, offset, name):
 		x, i = getFloat64(self.data, offset)
 		x = Angle(x, pi/180.0, u'\xb0')
 		self.set(name, x)
-		self.content += ' %s=%s' %(name, x)
+		self.appendContent(' %s=%s', name, x)
 		return i
 
 	def ReadLen32Text8(self, offset, name = None):
 		x, i = getLen32Text8(self.data, offset)
 		if (name):
 			self.set(name, x)
-			self.content += u" %s='%s'" %(name, x)
+			self.appendContent(u" %s='%s'", name, x)
 		else:
 			self.name = x
 		return i
@@ -397,7 +455,7 @@ class SecNode(AbstractData):
 		x, i = getText8(self.data, offset, l)
 		if (name):
 			self.set(name, x)
-			self.content += u" %s='%s'" %(name, x)
+			self.appendContent(u" %s='%s'", name, x)
 		else:
 			self.name = x
 		return i
@@ -406,7 +464,7 @@ class SecNode(AbstractData):
 		x, i = getLen32Text16(self.data, offset)
 		if (name):
 			self.set(name, x)
-			self.content += u" %s='%s'" %(name, x)
+			self.appendContent(u" %s='%s'", name, x)
 		else:
 			self.name = x
 		return i
@@ -441,76 +499,78 @@ class SecNode(AbstractData):
 		for j in range(cnt):
 			t, i = mtd(self.data, i)
 			lst.append(t)
-		self.content += u" %s=[%s]" %(name, ",".join([u"'%s'" %(t) for t in lst ]))
+		self.appendContent(lambda name, lst: u" %s=[%s]" %(name, ",".join([u"'%s'" %(t) for t in lst ])), name, lst)
 		self.set(name, lst)
 		return i
 
 	def __getList2Nums(self, name, offset, cnt, s, w, fmt, skipLen = True):
 		if (skipLen):
-			lst = Struct('<' + s * cnt).unpack_from(self.data, offset)
-			i   = offset + cnt * w
+			lst, i = getArray(self.data, offset, s, cnt)
 		else:
-			val = Struct('<' + (s+'L')*cnt).unpack_from(self.data, offset)
+			val = getStructArray(s + 'L', cnt).unpack_from(self.data, offset)
 			i   = offset + (w+4)*cnt # 4Bytes float 4Byte blocklen
 			lst = val[0::2]
 		if (len(lst) > 100):
-			self.content += u" %s=[%s,...]" %(name, u",".join([fmt %(n) for n in lst]))
+			self.appendContent(lambda name, fmt, lst: u" %s=[%s,...]" %(name, u",".join([fmt %(n) for n in lst])), name, fmt, lst)
 		else:
-			self.content += u" %s=[%s]" %(name, u",".join([fmt %(n) for n in lst]))
+			self.appendContent(lambda name, fmt, lst: u" %s=[%s]" %(name, u",".join([fmt %(n) for n in lst])), name, fmt, lst)
 
 		self.set(name, lst)
 		return i
 
 	def __getList2NumsA(self, name, offset, cnt, arraysize, s, w, fmt, skipLen = True):
 		if (skipLen):
-			val = Struct('<' + s*arraysize*cnt).unpack_from(self.data, offset)
+			val, i = getArray(self.data, offset, s, arraysize * cnt)
 			lst = reshape(val, arraysize)
-			i   = offset + (w * arraysize) * cnt
 		else:
-			val = Struct('<' + (s*arraysize+'L')*cnt).unpack_from(self.data, offset)
+			val = getStructArray(s * arraysize + 'L', cnt).unpack_from(self.data, offset)
 			lst = reshape([n for i, n in enumerate(val) if (i % (arraysize + 1)) != arraysize], arraysize)
 			i   = offset + (w * arraysize + 4) * cnt # w + 4Bytes for blocklen
 
 		if (arraysize > 1):
 			if (len(lst) > 100):
-				self.content += u" %s=[%s,...]" %(name, u",".join([u",".join([u"[%s]" %(u",".join([fmt %(n) for n in a]))]) for a in lst[:100]]))
+				self.appendContent(lambda name, fmt, lst: u" %s=[%s,...]" %(name, u",".join([u",".join([u"[%s]" %(u",".join([fmt %(n) for n in a]))]) for a in lst[:100]])), name, fmt, lst)
 			else:
-				self.content += u" %s=[%s]" %(name, u",".join([u",".join([u"[%s]" %(u",".join([fmt %(n) for n in a]))]) for a in lst] ) )
+				self.appendContent(lambda name, fmt, lst: u" %s=[%s]" %(name, u",".join([u",".join([u"[%s]" %(u",".join([fmt %(n) for n in a]))]) for a in lst] ) ), name, fmt, lst)
 		else:
 			if (len(lst) > 100):
-				self.content += u" %s=[%s,...]" %(name, u",".join([fmt %(n) for n in lst[0][:100]]))
+				self.appendContent(lambda name, fmt, lst: u" %s=[%s,...]" %(name, u",".join([fmt %(n) for n in lst[0][:100]])), name, fmt, lst)
 			else:
-				self.content += u" %s=[%s]" %(name, u",".join([fmt %(n) for n in lst[0]]))
+				self.appendContent(lambda name, fmt, lst: u" %s=[%s]" %(name, u",".join([fmt %(n) for n in lst[0]])), name, fmt, lst)
 		self.set(name, lst)
 		return i
 
 	def __getListListIntsA(self, name, typ, offset, cnt, arraysize, fmt):
 		lst = []
 		i   = offset
-		c   = self.content
+		c   = self.markContent()
 		for j in range(cnt):
 			i = self.ReadList2(i, typ, 'lst_tmp', arraysize)
 			lst.append(self.get('lst_tmp'))
 		self.delete('lst_tmp')
 		if (arraysize == 1):
-			self.content = c + u" %s={%s}" %(name, u",".join([u"(%s)" %(u",".join([fmt %(x) for x in l])) for l in lst[0]]))
+			self.resetContent(c)
+			self.appendContent(lambda name, fmt, lst: u" %s={%s}" %(name, u",".join([u"(%s)" %(u",".join([fmt %(x) for x in l])) for l in lst[0]])), name, fmt, lst)
 		else:
-			self.content = c + u" %s={%s}" %(name, u",".join([u"(%s)" %(u",".join([u"[%s]" %(FloatArr2Str(x)) for x in l])) for l in lst]))
+			self.resetContent(c)
+			self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"(%s)" %(u",".join([u"[%s]" %(FloatArr2Str(x)) for x in l])) for l in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
 	def __getListListFloatsA(self, name, typ, offset, cnt, arraysize):
 		lst = []
 		i   = offset
-		c   = self.content
+		c   = self.markContent()
 		for j in range(cnt):
 			i = self.ReadList2(i, typ, 'lst_tmp', arraysize)
 			lst.append(self.get('lst_tmp'))
 		self.delete('lst_tmp')
 		if (arraysize == 1):
-			self.content = c + u" %s={%s}" %(name, u",".join([u"(%s)" %(u",".join([u"%g" %(x) for x in l])) for l in lst]))
+			self.resetContent(c)
+			self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"(%s)" %(u",".join([u"%g" %(x) for x in l])) for l in lst])), name, lst)
 		else:
-			self.content = c + u" %s={%s}" %(name, u",".join([u"(%s)" %(u",".join([u"[%s]" %(FloatArr2Str(x)) for x in l])) for l in lst]))
+			self.resetContent(c)
+			self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"(%s)" %(u",".join([u"[%s]" %(FloatArr2Str(x)) for x in l])) for l in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -518,12 +578,12 @@ class SecNode(AbstractData):
 		try:
 			t, i = getText8(self.data, offset, cnt)
 			self.set(name, t)
-			self.content += u" %s='%s'" %(name, t)
+			self.appendContent(u" %s='%s'", name, t)
 			return i
 		except:
 			t, i = getUInt8A(self.data, offset, cnt)
 			self.set(name, t)
-			self.content += u" %s=%s" %(name, IntArr2Str(t, 2))
+			self.appendContent(lambda name, t: u" %s=%s" %(name, IntArr2Str(t, 2)), name, t)
 			return offset+cnt
 
 	def getList2Childs(self, name, offset, cnt, arraysize):
@@ -619,7 +679,7 @@ class SecNode(AbstractData):
 			i += 11
 			lst.append(val)
 			i += skip
-		self.content += u" %s={%s}" %(name, u",".join([u"(%s)" %(l) for l in lst]))
+		self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"(%s)" %(l) for l in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -652,7 +712,7 @@ class SecNode(AbstractData):
 				val.a1 = vals[16:22]
 				val.a2 = vals[22:-1]
 				lst.append(val)
-		self.content += u" %s={%s}" %(name, u",".join([u"(%s)" %(l) for l in lst]))
+		self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"(%s)" %(l) for l in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -673,7 +733,7 @@ class SecNode(AbstractData):
 				val = APP_1(self.data, i)
 				i += 24
 			lst.append(val)
-		self.content += u" %s={%s}" %(name, u",".join([u"(%g,%g,%06X,%02X,%02X,%02X,%02X)" %(a[0], a[1], a[2], a[3], a[4], a[5], a[6]) for a in lst]))
+		self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"(%g,%g,%06X,%02X,%02X,%02X,%02X)" %(a[0], a[1], a[2], a[3], a[4], a[5], a[6]) for a in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -702,7 +762,7 @@ class SecNode(AbstractData):
 			n3, i = getUInt32(self.data, i)
 			n4, i = getUInt8(self.data, i)
 			i += (skip + skip)
-			self.content += u"\n\t%d,'%s','%s',[%s],[%s],[%s],%04X,%s,%d,%X" %(n1, t1, t2, IntArr2Str(l1, 4), IntArr2Str(a1, 2), FloatArr2Str(l2), n2, c1, n3, n4)
+			self.appendContent(lambda n1, t1, t2, l1, a1, l2, n2, c1, n3, n4: u"\n\t%d,'%s','%s',[%s],[%s],[%s],%04X,%s,%d,%X" %(n1, t1, t2, IntArr2Str(l1, 4), IntArr2Str(a1, 2), FloatArr2Str(l2), n2, c1, n3, n4), n1, t1, t2, l1, a1, l2, n2, c1, n3, n4)
 			lst.append((n1, t1, t2, l1, a1, l2, l3, n2, c1, n3, n4))
 		self.set(name, lst)
 		return i
@@ -710,20 +770,21 @@ class SecNode(AbstractData):
 	def getListApp3(self, name, offset, cnt, arraysize):
 		lst  = []
 		i    = offset
-		c    = self.content
+		c    = self.markContent()
 		skip = getBlockSize()
 		for j in range(cnt):
 			n1, i = getUInt32(self.data, i)
 			t1, i = getLen32Text16(self.data, i)
 			t2, i = getLen32Text16(self.data, i)
-			c = self.content
+			c = self.markContent()
 			i = self.ReadList2(i, _TYP_FLOAT64_, 'tmp')
 			l1 = self.get('tmp')
 			self.delete('_tmp')
 			n3, i = getUInt8(self.data, i)
 			i += skip
 			lst.append((n1, t1, t2, l1, n3))
-		self.content = c + u" %s={%s}" %(name, u",".join([u"(%d,'%s','%s',%s,%02X)" %(a[0], a[1], a[2], FloatArr2Str(a[3]), a[4]) for a in lst]))
+		self.resetContent(c)
+		self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"(%d,'%s','%s',%s,%02X)" %(a[0], a[1], a[2], FloatArr2Str(a[3]), a[4]) for a in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -739,7 +800,7 @@ class SecNode(AbstractData):
 			i += 11
 			i += skip
 			lst.append((n1, n2,  n3,  f1, f2,  t1,  f3, f4, n4, n5))
-		self.content += u" %s={%s}" %(name, u",".join([u"(%d, %d, %04X, %g, %g, '%s', %g, %g, %03X, %02X)" %(a[0], a[1], a[2], a[3], a[4], a[5],  a[6], a[7], a[8], a[9]) for a in lst]))
+		self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"(%d, %d, %04X, %g, %g, '%s', %g, %g, %03X, %02X)" %(a[0], a[1], a[2], a[3], a[4], a[5],  a[6], a[7], a[8], a[9]) for a in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -755,7 +816,7 @@ class SecNode(AbstractData):
 			i += 4
 			i += skip
 			lst.append((f1, f2, n1, n2,  n3,  n4))
-		self.content += u" %s={%s}" %(name, u",".join([u"(%g, %g, %04X, %02X, %02X, %03X)" %(a[0], a[1], a[2], a[3], a[4], a[5])for a in lst]))
+		self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"(%g, %g, %04X, %02X, %02X, %03X)" %(a[0], a[1], a[2], a[3], a[4], a[5])for a in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -766,7 +827,7 @@ class SecNode(AbstractData):
 			nt, i  = getUInt32(self.data, i)
 			idx, i = getUInt32(self.data, i)
 			lst.append(NtEntry(nt, idx))
-		self.content += u" %s={%s}" %(name, u",".join([u"%r" %(e) for e in lst]))
+		self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"%r" %(e) for e in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -818,7 +879,7 @@ class SecNode(AbstractData):
 			a += a2
 			a.append(c4)
 			lst.append(a)
-		self.content += u" %s={%s}" %(name, u",".join([u"(%02X,%r,%r,%r,%g,%g,%g,%g,%g,%g,%g,%g,%g,%r)" %tuple(t) for t in lst]))
+		self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"(%02X,%r,%r,%r,%g,%g,%g,%g,%g,%g,%g,%g,%g,%r)" %tuple(t) for t in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -829,7 +890,7 @@ class SecNode(AbstractData):
 			t = Transformation3D()
 			i = t.read(self.data, i)
 			lst.append(t)
-		self.content += u" %s={%s}" %(name, u",".join([u"%r" %(t) for t in lst]))
+		self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"%r" %(t) for t in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -839,14 +900,14 @@ class SecNode(AbstractData):
 		for j in range(cnt):
 			u, i  = getUInt32A(self.data, i, 2)
 			lst.append(u)
-		self.content += u" %s={%s}" %(name, u",".join([u"(%d,%d)" %(u[0], u[1]) for u in lst]))
+		self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"(%d,%d)" %(u[0], u[1]) for u in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
 	def getListResult1(self, name, offset, cnt, arraysize):
 		lst  = []
 		i    = offset
-		c    = self.content
+		c    = self.markContent()
 		skip = getBlockSize()
 		for j in range(cnt):
 			u1, i = getUInt32(self.data, i)
@@ -862,7 +923,8 @@ class SecNode(AbstractData):
 			a2, i = getFloat64_3D(self.data, i)
 			i += skip
 			lst.append((u1, l1, u2, u3, l2, a1, a2))
-		self.content = u"%s %s={%s}" %(c, name, u",".join([u"(%04X,[%s],%04X,%04X,[%s],(%g,%g,%g)-(%g,%g,%g))" %(a[0], IntArr2Str(a[1], 4), a[2], a[3], IntArr2Str(a[4], 4), a[5].x, a[5].y, a[5].z, a[6].x, a[6].y, a[6].z) for a in lst]))
+		self.resetContent(c)
+		self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"(%04X,[%s],%04X,%04X,[%s],(%g,%g,%g)-(%g,%g,%g))" %(a[0], IntArr2Str(a[1], 4), a[2], a[3], IntArr2Str(a[4], 4), a[5].x, a[5].y, a[5].z, a[6].x, a[6].y, a[6].z) for a in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -874,7 +936,7 @@ class SecNode(AbstractData):
 			d, i = getUInt32A(self.data, i, 2)
 			i += skip
 			lst.append(d)
-		self.content += u" %s={%s}" %(name, u",".join([u"[%04X,%04X]" %(a[0], a[1]) for a in lst]))
+		self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"[%04X,%04X]" %(a[0], a[1]) for a in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -887,7 +949,7 @@ class SecNode(AbstractData):
 			d = RESULT_3(self.data, i)
 			i += 56 + skip
 			lst.append(d)
-		self.content += u" %s={%s}" %(name, u",".join([u"(%04X,%03X,%02X,%02X,(%g,%g,%g)-(%g,%g,%g))" %(a[0], a[1], a[2], a[3], a[4], a[5], a[6], a[7], a[8], a[9]) for a in lst]))
+		self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"(%04X,%03X,%02X,%02X,(%g,%g,%g)-(%g,%g,%g))" %(a[0], a[1], a[2], a[3], a[4], a[5], a[6], a[7], a[8], a[9]) for a in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -895,7 +957,7 @@ class SecNode(AbstractData):
 		lst  = []
 		i    = offset
 		skip = getBlockSize()
-		c    = self.content
+		c    = self.markContent()
 		for j in range(cnt):
 			u, i = getUInt32(self.data, i)
 			i = self.ReadList4(i, _TYP_UINT32_, name)
@@ -903,7 +965,8 @@ class SecNode(AbstractData):
 			l = self.get(name)
 			self.delete(name)
 			lst.append((u, l))
-		self.content = u"%s %s={%s}" %(c, name, u",".join([u"(%04X,[%s])" %(a[0], IntArr2Str(a[1], 3)) for a in lst]))
+		self.resetContent(c)
+		self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"(%04X,[%s])" %(a[0], IntArr2Str(a[1], 3)) for a in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -912,7 +975,7 @@ class SecNode(AbstractData):
 		i     = offset
 		skip1 = getBlockSize()
 		skip2 = 1 if (getFileVersion() > 2017) else 0
-		c    = self.content
+		c    = self.markContent()
 		for j in range(cnt):
 			u1, i = getUInt32(self.data, i)
 			i += skip2 # skip 00
@@ -922,8 +985,9 @@ class SecNode(AbstractData):
 			i += skip1
 			l = self.get(name)
 			self.delete(name)
-			lst.append((u1, u2, u3, l))
-		self.content = u"%s %s={%s}" %(c, name, u",".join([u"(%04X,%03X,%04X,%s)" %(a[0], a[1], a[2], a[3]) for a in lst]))
+			lst.append((u1, u2, u3, tuple(l)))
+		self.resetContent(c)
+		self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"(%04X,%03X,%04X,%s)" %(a[0], a[1], a[2], a[3]) for a in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -948,13 +1012,14 @@ class SecNode(AbstractData):
 	def getListListFonts(self, name, offset, cnt, arraysize):
 		lst = []
 		i   = offset
-		c   = self.content
+		c   = self.markContent()
 		for j in range(cnt):
 			tmp = u"%s[%02X][0]" %(name, j)
 			i = self.ReadList2(i, _TYP_FONT_, tmp, arraysize)
 			lst.append(self.get(tmp))
 			self.delete(tmp)
-		self.content = c + u" %s=(%s)" %(name, u",".join([u"(%s)" %(l) for l in lst]))
+		self.resetContent(c)
+		self.appendContent(lambda name, lst: u" %s=(%s)" %(name, u",".join([u"(%s)" %(l) for l in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -978,13 +1043,13 @@ class SecNode(AbstractData):
 	def getListListChars(self, name, offset, cnt, arraysize):
 		lst = []
 		i   = offset
-		s   = self.content
+		s   = self.markContent()
 		for j in range(cnt):
 			i = self.ReadList2(i, _TYP_CHAR_, 'tmp')
 			lst.append(self.get('tmp'))
 			self.delete('tmp')
 		self.set(name, lst)
-		self.content = s
+		self.resetContent(s)
 		return i
 
 	def getListResults(self, name, offset, cnt, arraysize):
@@ -998,7 +1063,7 @@ class SecNode(AbstractData):
 			i += skip
 			lst.append(r)
 		self.set(name, list)
-		self.content += u" %s={%s}" %(name, u",".join([u"(%s)" %(r) for r in lst]))
+		self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"(%s)" %(r) for r in lst])), name, lst)
 		return i
 
 	def __getArrayNodes(self, name, offset, cnt, typ):
@@ -1012,7 +1077,7 @@ class SecNode(AbstractData):
 
 	def getArrayU32(self, name, offset, cnt):
 		lst, i = getUInt32A(self.data, offset, cnt)
-		self.content += u" %s=[%s]" %(name, u",".join([u"%04X" %(n) for n in lst]))
+		self.appendContent(lambda name, lst: u" %s=[%s]" %(name, u",".join([u"%04X" %(n) for n in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -1061,7 +1126,7 @@ class SecNode(AbstractData):
 			key, i = getUInt16(self.data, i)
 			val, i = getUInt16(self.data, i)
 			lst[key] = val
-		self.content += u" %s=[%s]" % (name, u",".join([u"[%03X:%03X]" %(key, lst[key]) for key in lst]))
+		self.appendContent(lambda name, lst: u" %s=[%s]" % (name, u",".join([u"[%03X:%03X]" %(key, lst[key]) for key in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -1072,7 +1137,7 @@ class SecNode(AbstractData):
 			key, i = getUInt32(self.data, i)
 			val, i = getUInt8(self.data, i)
 			lst[key] = val
-		self.content += u" %s=[%s]" % (name, u",".join([u"[%04X:%02X]" %(key, lst[key]) for key in lst]))
+		self.appendContent(lambda name, lst: u" %s=[%s]" % (name, u",".join([u"[%04X:%02X]" %(key, lst[key]) for key in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -1083,7 +1148,7 @@ class SecNode(AbstractData):
 			key, i = getUInt32(self.data, i)
 			val, i = getUInt32(self.data, i)
 			lst[key] = val
-		self.content += u" %s=[%s]" % (name, u",".join([u"[%04X:%04X]" %(key, lst[key]) for key in lst]))
+		self.appendContent(lambda name, lst: u" %s=[%s]" % (name, u",".join([u"[%04X:%04X]" %(key, lst[key]) for key in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -1094,7 +1159,7 @@ class SecNode(AbstractData):
 			key, i = getUInt32(self.data, i)
 			val, i = getFloat64(self.data, i)
 			lst[key] = val
-		self.content += u" %s=[%s]" % (name, u",".join([u"[%04X:%g]" %(key, lst[key]) for key in lst]))
+		self.appendContent(lambda name, lst: u" %s=[%s]" % (name, u",".join([u"[%04X:%g]" %(key, lst[key]) for key in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -1159,7 +1224,7 @@ class SecNode(AbstractData):
 			key = self.get(name)
 			val, i = getUInt32A(self.data, i, 2)
 			lst[key] = val
-		self.content += u" %s=[%s]" % (name, u",".join([u"[%s:(%s)]" %(key, IntArr2Str(lst[key], 4)) for key in lst]))
+		self.appendContent(lambda name, lst: u" %s=[%s]" % (name, u",".join([u"[%s:(%s)]" %(key, IntArr2Str(lst[key], 4)) for key in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -1171,15 +1236,14 @@ class SecNode(AbstractData):
 			key = self.get(name)
 			val, i = getFloat64(self.data, i)
 			lst[key] = val
-		self.content += u" %s=[%s]" % (name, u",".join([u"[%s: %g]" %(key, lst[key]) for key in lst]))
+		self.appendContent(lambda name, lst: u" %s=[%s]" % (name, u",".join([u"[%s: %g]" %(key, lst[key]) for key in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
 	def	getMapXRefXRefL(self, name, offset, cnt):
 		lst = {}
 		i   = offset
-		c = self.content
-		self.content = u""
+		c = self.markContent()
 		for j in range(cnt):
 			i = self.ReadCrossRef(i, name, j)
 			key = self.get(name)
@@ -1188,7 +1252,8 @@ class SecNode(AbstractData):
 			i = self.ReadList2(i, _TYP_NODE_X_REF_, tmp)
 			lst[key] = self.get(tmp)
 			self.delete(tmp)
-		self.content = c + u" %s=[%s]" % (name, u",".join([u"[%s: (%s)]" %(getIndex(key), u"),(".join([u"%s" %(getIndex(h)) for h in lst[key]])) for key in lst]))
+		self.resetContent(c)
+		self.appendContent(lambda name, lst: u" %s=[%s]" % (name, u",".join([u"[%s: (%s)]" %(getIndex(key), u"),(".join([u"%s" %(getIndex(h)) for h in lst[key]])) for key in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -1199,7 +1264,7 @@ class SecNode(AbstractData):
 			key, i = getUUID(self.data, i)
 			val, i = getUInt32(self.data, i)
 			lst[key] = val
-		self.content += u" %s={%s}" %(name, u",".join([u"[{%s}:%04X]" %(key, lst[key]) for key in lst]))
+		self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"[{%s}:%04X]" %(key, lst[key]) for key in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -1250,7 +1315,7 @@ class SecNode(AbstractData):
 			key, i = getLen32Text8(self.data, i)
 			val, i = getFloat32_3D(self.data, i)
 			lst[key] = val
-		self.content += u" %s={%s}" %(name, u",".join([u"'%s':%g,%g,%g]" %(key, lst[key][0], lst[key][1], lst[key][2]) for key in lst]))
+		self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"'%s':%g,%g,%g]" %(key, lst[key][0], lst[key][1], lst[key][2]) for key in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -1281,15 +1346,14 @@ class SecNode(AbstractData):
 			key, i = getLen32Text16(self.data, i)
 			val, i = getUInt32(self.data, i)
 			lst[key] = val
-		self.content += u" %s={%s}" %(name, u",".join([u"'%s':%04X" %(key, lst[key]) for key in lst]))
+		self.appendContent(lambda name, lst: u" %s={%s}" %(name, u",".join([u"'%s':%04X" %(key, lst[key]) for key in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
 	def	getMapMdlTxnMgr(self, name, offset, cnt):
 		lst = []
 		i   = offset
-		c = self.content
-		self.content = u""
+		c = self.markContent()
 		skip = getBlockSize()
 		for j in range(cnt):
 			val = ModelerTxnMgr()
@@ -1300,7 +1364,8 @@ class SecNode(AbstractData):
 			val.lst = self.get('tmp')
 			self.delete('tmp')
 			lst.append(val)
-		self.content = c + u" %s=[%s]" % (name, u",".join([u"[(%s)]" %(val) for val in lst]))
+		self.resetContent(c)
+		self.appendContent(lambda name, lst: u" %s=[%s]" % (name, u",".join([u"[(%s)]" %(val) for val in lst])), name, lst)
 		self.set(name, lst)
 		return i
 
@@ -1327,7 +1392,7 @@ class SecNode(AbstractData):
 			i = self.ReadList6(i, _TYP_MAP_KEY_APP_1_, name)
 			m = self.get(name)
 			lst[key] = (u, m)
-		self.content += u" %s={%s}" %(name, ",".join([u"(%04X:%r" %(key, val) for key, val in lst.items()]))
+		self.appendContent(lambda name, lst: u" %s={%s}" %(name, ",".join([u"(%04X:%r" %(key, val) for key, val in lst.items()])), name, lst)
 		return i
 
 	def getMapTxt16UInt32_7(self, name, offset, cnt):
@@ -1338,7 +1403,7 @@ class SecNode(AbstractData):
 			key, i = getLen32Text16(self.data, i)
 			a, i = getUInt32A(self.data, i, 7)
 			lst[key] = a
-		self.content += u" %s={%s}" %(name, ",".join([u"('%s':[%03X,%03X,%03X,%03X,%03X,%03X,%03X])" %(key, a[0], a[1], a[2], a[3], a[4], a[5], a[6]) for key, a in lst.items()]))
+		self.appendContent(lambda name, lst: u" %s={%s}" %(name, ",".join([u"('%s':[%03X,%03X,%03X,%03X,%03X,%03X,%03X])" %(key, a[0], a[1], a[2], a[3], a[4], a[5], a[6]) for key, a in lst.items()])), name, lst)
 		return i
 
 	def ReadList2(self, offset, typ, name, arraySize = 1):
@@ -1497,6 +1562,7 @@ class SecNode(AbstractData):
 		return None
 
 class SecNodeRef(object):
+	__slots__ = ('index', 'mask', 'type', 'number', '_data', 'attrName')
 
 	def __init__(self, m, refType, name):
 		self.index    = (m & 0x7FFFFFFF)
@@ -1504,7 +1570,6 @@ class SecNodeRef(object):
 		self.type     = refType
 		self.number   = 0
 		self._data    = None
-		self.analysed = False
 		self.attrName = name
 
 	@property
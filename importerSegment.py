@@ -11,7 +11,7 @@ from importerClasses        import *
 from importerTransformation import Transformation2D, Transformation3D
 from importerSegNode        import isList, CheckList, SecNode, SecNodeRef, _TYP_NODE_REF_, _TYP_UINT32_A_, REF_PARENT, REF_CHILD, REF_CROSS
 from importerUtils          import *
-from Acis                   import clearEntities, AcisReader, setVersion, TAG_ENTITY_REF, getInteger, createNode, getNameMatchAttributes, getDcAttributes
+from Acis                   import clearEntities, AcisReader, setVersion, TAG_ENTITY_REF, getInteger, createNodes, getNameMatchAttributes, getDcAttributes
 from importerSAT            import dumpSat
 from uuid                   import UUID
 import importerUtils
@@ -27,19 +27,42 @@ _fmt_new = False
 def resolveEntityReferences(node):
 	acis = node.get('SAT')
 	try:
-		# create a node for each entity
-		for entity in acis.getEntities():
-			createNode(entity)
+		# create the nodes of the bodies and the registering attributes - all others are created on demand
+		createNodes(acis)
 
 		dumpSat("%04X" %(node.index), acis)
-		# resolve the roll-back information from the history
-		acis.history.resolveDeltaStates()
-		dumpHistory(node.index, acis.history)
+		# resolve the roll-back information from the history - if it wasn't skipped
+		if (acis.history is not None):
+			acis.history.resolveDeltaStates()
+			dumpHistory(node.index, acis.history)
 	except:
 		logError(traceback.format_exc())
 
 def Read_Dummy(self, node): return 0
 
+def _usesNames(cls, code, names, visited):
+	# checks the names used by the code, the reader's methods it calls and its lambdas or comprehensions.
+	for name in code.co_names:
+		if (name in names):
+			return True
+		if (name not in visited):
+			visited.add(name)
+			method = getattr(cls, name, None)
+			func   = getattr(method, '__func__', method)
+			if (hasattr(func, '__code__') and _usesNames(cls, func.__code__, names, visited)):
+				return True
+	for const in code.co_consts:
+		if (hasattr(const, 'co_names') and _usesNames(cls, const, names, visited)):
+			return True
+	return False
+
+_stateless = {}
+
+def _strUnreadData(data):
+	if (sys.version_info.major < 3):
+		return u"\taX=[%s]" %(" ".join(["%02X" % ord(c) for c in data]))
+	return u"\taX=[%s]" %(" ".join(["%02X" % c for c in data]))
+
 def dumpHistory(nodeIdx, history):
 	dumpFolder = getDumpFolder()
 	if (not (dumpFolder is None)):
@@ -62,7 +85,7 @@ def checkReadAll(node, i, l):
 
 def dumpData(file, data, offset, end):
 	if (offset < end):
-		arr8, dummy = getUInt8A(data, offset, end - offset)
+		arr8, dummy = getArray(data, offset, 'B', end - offset)
 		if (not file is None):
 			file.write('\t[%s]\n' %(IntArr2Str(arr8, 2)))
 	return
@@ -145,26 +168,40 @@ def __dumpBranch(file, ref, branch, level, prefix):
 		file.write(u"\n")
 	return
 
-def buildBranch(parent, file, data, level, ref):
-	parent.append(data.node)
-
-	if (data.analysed == False):
-		__dumpBranch(file, ref, data.node.__str__(), level, '')
-		data.analysed = True
-		for childRef in data.references:
-			if (not childRef.analysed):
-				childRef.analysed = True
+def walkBranch(parent, data, visited):
+	'''
+	Iterates depth first over the branch of the data - without recursion, as the branches can be deeply nested.
+	Yields (parent, node, level, ref, first) for each occurrence of a node within the branch.
+	first is False for nodes that already occurred and for cross references.
+	visited: The data and references already walked - shared by all branches of a tree.
+	'''
+	if (data in visited):
+		yield parent, data.node, 0, None, False
+		return
+	visited.add(data)
+	yield parent, data.node, 0, None, True
+	stack = [(parent, data.node, iter(data.references))]
+	while (stack):
+		grandParent, node, refs = stack[-1]
+		level = len(stack)
+		for childRef in refs:
+			if (childRef not in visited):
+				visited.add(childRef)
 				child = childRef._data
 				if (child is not None):
 					if (childRef.type == REF_CHILD):
-						buildBranch(data.node, file, child, level + 1, childRef)
+						if (child in visited):
+							yield node, child.node, level, childRef, False
+						else:
+							visited.add(child)
+							yield node, child.node, level, childRef, True
+							stack.append((node, child.node, iter(child.references)))
+							break
 					elif (childRef.type == REF_CROSS):
-						node = childRef.node
-						if (node is not None):
-							parent.append(childRef.node)
-							__dumpBranch(file, childRef, node.getRefText(), level + 1, '*')
-	else:
-		__dumpBranch(file, ref, data.node.getRefText(), level, '*')
+						if (childRef.node is not None):
+							yield grandParent, childRef.node, level, childRef, False
+		else:
+			stack.pop()
 	return
 
 def resolveReferences(nodes):
@@ -226,7 +263,7 @@ def resolveParentNodes(nodes):
 				ref.type = REF_CROSS
 	return
 
-def buildTree(file, nodes):
+def buildTree(nodes):
 	# link the node's references with the corresponding nodes
 	resolveReferences(nodes)
 
@@ -235,28 +272,69 @@ def buildTree(file, nodes):
 
 	# now the tree can be build
 	roots = DataNode(None)
+	visited = set()
 	for node in nodes.values():
 		if (node.parent is None):
-			buildBranch(roots, file, node, 0, None)
+			for parent, child, level, ref, first in walkBranch(roots, node, visited):
+				parent.append(child)
 	return roots
 
+def dumpTree(file, nodes):
+	'''
+	Writes the tree of the nodes - the nodes have to be resolved by buildTree before.
+	'''
+	visited = set()
+	for node in nodes.values():
+		if (node.parent is None):
+			for parent, child, level, ref, first in walkBranch(None, node, visited):
+				if (first):
+					__dumpBranch(file, ref, child.__str__(), level, '')
+				else:
+					__dumpBranch(file, ref, child.getRefText(), level, '*')
+	return
+
 def readTypedFloatArr(data, offset, size = 1):
 	n, i = getUInt32(data, offset)
 	a, i = getUInt32A(data, i, 2)
-	b, i = getFloat64A(data, i, n * size)
+	b, i = getArray(data, i, 'd', n * size)
 	if (size > 1):
 		b = reshape(b, size)
 	return (a, b), i
 
 class SegmentReader(object):
+	# The attributes of the reader or segment and the functions that register nodes or set colors.
+	STATE_NAMES = ('elementNodes', 'indexNodes', 'nodeCounter', 'AcisList', 'acis', 'setColor', 'setColorDefault')
 
 	def __init__(self, segment):
 		self.segment = segment
 		self.nodeCounter = 0
+		self.deferred    = 0
 
 	def postRead(self):
 		for node in self.segment.elementNodes.values():
-			node.data = None
+			if (not node.deferred):
+				node.data = None
+
+	def isDecodedEagerly(self, node):
+		'''
+		Returns False if decoding the node's data can be postponed until the node is first accessed.
+		Only nodes whose decoding doesn't affect other nodes or the segment can be deferred.
+		'''
+		return True
+
+	def isStateless(self, typeName):
+		'''
+		Returns True if the handler of the type and the methods it calls don't use one of the
+		STATE_NAMES - decoding such nodes can be deferred.
+		'''
+		key = (self.__class__, typeName)
+		stateless = _stateless.get(key)
+		if (stateless is None):
+			method = getattr(self.__class__, 'Read_%s' %(typeName), None)
+			func   = getattr(method, '__func__', method)
+			stateless = hasattr(func, '__code__') and not _usesNames(self.__class__, func.__code__, self.STATE_NAMES, set())
+			_stateless[key] = stateless
+		return stateless
 
 	def ReadNodeRef(self, node, offset, number, type, name):
 		m, i = getUInt32(node.data, offset)
@@ -310,15 +388,12 @@ class SegmentReader(object):
 		i = node.ReadUInt32A(i, 2, 'Float32Arr_' + name)
 
 		lst = []
-		l2  = []
 		for j in range(cnt0):
 			a1, i = getFloat32_2D(node.data, i)
 			lst.append(a1)
-			vec = FloatArr2Str(a1)
-			l2.append('(%s)' %(vec))
 
-		if (len(l2) > 0):
-			node.content += ' {%s}' %(','.join(l2))
+		if (len(lst) > 0):
+			node.appendContent(lambda lst: ' {%s}' %(','.join(['(%s)' %(FloatArr2Str(a)) for a in lst])), lst)
 		node.set(name, lst)
 		return i
 
@@ -327,7 +402,7 @@ class SegmentReader(object):
 		for j in range(cnt):
 			a, i = getFloat64A(node.data, i, size)
 			lst.append(a)
-		node.content += ' %s=[%s]' %(name, ','.join(['(%s)' %(FloatArr2Str(a)) for a in lst]))
+		node.appendContent(lambda name, lst: ' %s=[%s]' %(name, ','.join(['(%s)' %(FloatArr2Str(a)) for a in lst])), name, lst)
 		node.set(name, lst)
 		return i
 
@@ -336,15 +411,12 @@ class SegmentReader(object):
 		i = node.ReadUInt32A(i, 2, 'Float64Arr_' + name)
 
 		lst = []
-		l2 = []
 		for j in range(cnt0):
 			a1, i = getFloat64A(node.data, i, size)
 			lst.append(a1)
-			vec = FloatArr2Str(a1)
-			l2.append('(%s)' %(vec))
 
-		if (len(l2) > 0):
-			node.content += ' {%s}' %(','.join(l2))
+		if (len(lst) > 0):
+			node.appendContent(lambda lst: ' {%s}' %(','.join(['(%s)' %(FloatArr2Str(a)) for a in lst])), lst)
 		node.set(name, lst)
 		return i
 
@@ -395,7 +467,7 @@ class SegmentReader(object):
 		for j in range(cnt):
 			edge, i = self.ReadEdge(node, i)
 			lst.append(edge)
-		node.content += ' edges=[%s]' %(','.join(['(%s)' %(e) for e in lst]))
+		node.appendContent(lambda lst: ' edges=[%s]' %(','.join(['(%s)' %(e) for e in lst])), lst)
 		node.set('edges', lst)
 		node.delete('tmp')
 		return i
@@ -407,7 +479,7 @@ class SegmentReader(object):
 		val = Transformation2D()
 		i = val.read(node.data, offset)
 		node.set('transformation', val)
-		node.content += u" transformation=%r" %(val)
+		node.appendContent(u" transformation=%r", val)
 		return i
 
 	def ReadTransformation3D(self, node, offset, name='transformation'):
@@ -417,7 +489,7 @@ class SegmentReader(object):
 		val = Transformation3D()
 		i = val.read(node.data, offset)
 		node.set(name, val)
-		node.content += u" %s=%r" %(name, val)
+		node.appendContent(u" %s=%r", name, val)
 		return i
 
 	def Read_5F9D0021(self, node): # SystemOfUnitsCollection
@@ -584,15 +656,13 @@ class SegmentReader(object):
 			logError(traceback.format_exc())
 
 		try:
-			node.data = node.data[i:]
-			if (len(node.data) > 0):
-				if (sys.version_info.major < 3):
-					s = " ".join(["%02X" % ord(c) for c in node.data])
-				else:
-					s = " ".join(["%02X" % c for c in node.data])
-				node.content += u"\taX=[%s]" %(s)
+			# the unread rest is only shown in the dumps - the node's data is a view into the segment's buffer.
+			if (getDumpFolder() is not None):
+				unread = node.data[i:]
+				if (len(unread) > 0):
+					node.appendContent(_strUnreadData, bytes(unread))
 		except:
-			logError(u"ERROR in %s.Read_%s: %s", self.__module____name__, node.typeName, traceback.format_exc())
+			logError(u"ERROR in %s.Read_%s: %s", self.__module__, node.typeName, traceback.format_exc())
 
 		return
 
@@ -609,12 +679,16 @@ class SegmentReader(object):
 		n, i = getUInt32(data, node.offset)
 		node.uid = getNodeUID((n & 0xFF), self.segment)
 		node.typeName = '%08X' % (node.uid.time_low)
-		node.data = data[i:i + node.size]
-		self.HandleBlock(node)
+		node.data = getDataView(data, i, node.size)
+		if (self.isDecodedEagerly(node)):
+			self.HandleBlock(node)
+		else:
+			node.defer()
+			self.deferred += 1
 		return node
 
 	def skipBlockSize(self, offset, l = 1):
-		return offset + l * importerUtils._block_size
+		return offset + l * getBlockSize()
 
 	def ReadRefU32AList(self, node, offset, name, size, type):
 		cnt, i = getUInt32(node.data, offset)
@@ -647,7 +721,7 @@ class SegmentReader(object):
 		else:
 			if (i + 4 == len(node.data)): return i + 4
 		txt, ignore = getText8(node.data, i, 15) # 'ACIS BinaryFile' or from 20214 on 'ASM BinaryFile4'
-		node.content += " fmt='%s'" %(txt)
+		node.appendContent(" fmt='%s'", txt)
 		node.set('fmt', txt)
 		e = len(node.data) - 17
 		vers = getFileVersion()
@@ -687,7 +761,7 @@ class SegmentReader(object):
 		if (getFileVersion() > 2017):
 			i = node.ReadUInt16A(i, 3, 'a3')
 		else:
-			node.content += u" a3=[000,000,000]"
+			node.appendContent(u" a3=[000,000,000]")
 			node.set('a3', [0,0,0])
 		return i
 
@@ -747,22 +821,30 @@ class SegmentReader(object):
 
 	def ReadSegmentData(self, file, buffer):
 		self.nodeCounter = 0
+		self.deferred    = 0
 		self.segment.elementNodes = {}
 		self.segment.indexNodes   = {}
 
 		i = 0
+		view = getDataView(buffer)
 
 		for sec in self.segment.sec1:
 			if (sec.flags == 1):
 				start = i
-				data = self.ReadBlock(buffer, i, sec.length)
+				data = self.ReadBlock(view, i, sec.length)
 				i += data.size + 4
 				l, i = getUInt32(buffer, i)
 				i = self.ReadTrailer(buffer, i)
 				if ((l != 0) and (sec.length != l)):
-					logError('%s: BLOCK[%04X] - incorrect block size %X != 	%X found for offset %X for %s!' %(self.__class__.__name__, data.index, l, u32_0, start, data.typeName))
+					logError('%s: BLOCK[%04X] - incorrect block size %X != 	%X found for offset %X for %s!', self.__class__.__name__, data.index, l, u32_0, start, data.typeName)
 
-		self.segment.tree = buildTree(file, self.segment.elementNodes)
+		if (self.deferred > 0):
+			# building the tree requires the references of all nodes => build it on demand.
+			self.segment.deferTree(buildTree)
+		else:
+			self.segment.tree = buildTree(self.segment.elementNodes)
+			if (file is not None):
+				dumpTree(file, self.segment.elementNodes)
 		self.postRead()
 
 		return
@@ -5,11 +5,12 @@ importerUtils.py:
 Collection of functions necessary to read and analyse Autodesk (R) Invetor (R) files.
 '''
 
-import os, sys, datetime, FreeCADGui, json, shutil, re
+import os, sys, datetime, FreeCAD, FreeCADGui, json, shutil, re, threading
 from PySide.QtCore import *
 from PySide.QtGui  import *
 from uuid          import UUID
 from struct        import Struct, unpack_from, pack
+from array         import array
 from FreeCAD       import Vector as VEC, Console, ParamGet
 from olefile       import OleFileIO
 
@@ -150,70 +151,136 @@ UUID_NAMES = {
 
 ENCODING_FS      = 'utf8'
 
-_fileVersion     = None
-_fileBeta        = -1
+# defaults for new sessions - set once the environment (e.g. installed workbenches) is known.
 _can_import      = True
 _use_sheet_metal = True
-_block_size      = 0
 
 __prmPrefOW__ = ParamGet("User parameter:BaseApp/Preferences/OutputWindow")
 __prmPrefIL__ = ParamGet("User parameter:BaseApp/Preferences/Mod/InventorLoader")
 
-# The file the be imported
-_inventor_file = None
-_dump_folder   = None
+class ImportSession(object):
+	'''
+	The state of importing a file: the file, its version, the dump folder, the model, ...
+	Each thread has its own current session => several files can be read concurrently.
+	'''
+	def __init__(self):
+		self.inventorFile = None # The file the be imported
+		self.dumpFolder   = None
+		self.fileVersion  = None
+		self.fileBeta     = -1
+		self.blockSize    = 0
+		self.author       = ''
+		self.description  = None
+		self.colorDefault = None
+		self.colors       = dict(_colorPalette) # The colors defined by the file - initially the palette
+		self.canImport    = _can_import
+		self.sheetMetal   = _use_sheet_metal
+		self.thumbnail    = None
+		self.model        = None # The model representing the content of the imported file
+		self.strategy     = None # Overrides the preferred strategy if set - not persistent
+		self.dumpEnabled  = None # Overrides the preferred dumping if set - not persistent
+		self.deferRecompute = None # Overrides the preferred recomputing if set - not persistent
+		self.modelCache   = None # Overrides the preferred model cache usage if set - not persistent
+		self.shapeCache   = None # Overrides the preferred shape cache usage if set - not persistent
+
+	def __getstate__(self):
+		# only pickled for deferred nodes => the file's version and block size are required, not the model.
+		state = self.__dict__.copy()
+		state['dumpFolder'] = None
+		state['thumbnail']  = None
+		state['model']      = None
+		return state
+
+_sessions = threading.local()
+
+def getSession():
+	try:
+		return _sessions.current
+	except AttributeError:
+		session = ImportSession()
+		_sessions.current = session
+		return session
+
+def setSession(session):
+	'''
+	Makes the session the current one of this thread and returns the previous one.
+	'''
+	previous = getSession()
+	_sessions.current = session
+	return previous
+
+def newSession():
+	'''
+	Starts a new session for this thread - nothing of previous imports is kept
+	except the overridden preferences.
+	'''
+	previous = getattr(_sessions, 'current', None)
+	session = ImportSession()
+	if (previous is not None):
+		session.strategy    = previous.strategy
+		session.dumpEnabled = previous.dumpEnabled
+		session.deferRecompute = previous.deferRecompute
+		session.modelCache     = previous.modelCache
+		session.shapeCache     = previous.shapeCache
+	_sessions.current = session
+	return session
 
 STRATEGY_SAT    = 0
 STRATEGY_NATIVE = 1
 STRATEGY_STEP   = 2
-__strategy__ = __prmPrefIL__.GetInt("strategy", STRATEGY_SAT)
 
 IS_CELL_REF = re.compile('^[a-z](\d+)?$', re.IGNORECASE)
 IS_BETA     = re.compile('^.* Beta(\d+) .*$', re.IGNORECASE)
-_author = ''
-_description = None
-_colorDefault = None
 
 with open(os.path.join(os.path.dirname(os.path.abspath(__file__)),"colors.json")) as colorPalette:
-	_colorNames = json.load(colorPalette)
-	for n in _colorNames:
+	_colorPalette = json.load(colorPalette)
+	for n in _colorPalette:
 		if (not n.startswith('_')):
-			rgb =  _colorNames[n]
+			rgb =  _colorPalette[n]
 			r   = int(rgb[1:3], 0x10) / 255.0
 			g   = int(rgb[3:5], 0x10) / 255.0
 			b   = int(rgb[5:7], 0x10) / 255.0
-			_colorNames[n] = (r, g, b)
+			_colorPalette[n] = (r, g, b)
 
 def setColorDefault(r, g, b):
-	global _colorDefault
-	_colorDefault = (r, g, b)
+	getSession().colorDefault = (r, g, b)
 
 def getColorDefault():
-	global _colorDefault
-	return _colorDefault
+	return getSession().colorDefault
 
 def getColor(name):
-	global _colorNames, _colorDefault
-
-	return _colorNames.get(name, _colorDefault)
+	session = getSession()
+	return session.colors.get(name, session.colorDefault)
 
 def setColor(name, r, g, b):
-	global _colorNames
-	_colorNames[name] = (r, g, b)
+	getSession().colors[name] = (r, g, b)
+
+def getColors():
+	return dict(getSession().colors)
+
+def setColors(colors):
+	getSession().colors.update(colors)
 
 def getStrategy():
-	global __strategy__
+	strategy = getSession().strategy
+	if (strategy is None):
+		strategy = __prmPrefIL__.GetInt("strategy", STRATEGY_SAT)
 	v = getFileVersion()
 	if (v is None):
-		return __strategy__
+		return strategy
 
-	return STRATEGY_SAT if (v < 2010) else __strategy__
+	return STRATEGY_SAT if (v < 2010) else strategy
 
 def setStrategy(newStrategy):
-	global __strategy__
-	__strategy__ = newStrategy
 	__prmPrefIL__.SetInt("strategy", newStrategy)
 
+def overrideStrategy(strategy):
+	'''
+	Overrides the preferred strategy for this thread's imports without changing the preferences.
+	strategy: The strategy to be used or None to use the preferred one again.
+	'''
+	getSession().strategy = strategy
+
 def isStrategySat():
 	return getStrategy() == STRATEGY_SAT
 
@@ -224,22 +291,23 @@ def isStrategyNative():
 	return getStrategy() == STRATEGY_NATIVE
 
 def setAuthor(author):
-	global _author
-	_author = author
+	getSession().author = author
 	return
 
 def getAuthor():
-	return _author
+	return getSession().author
 
 def setDescription(description):
-	global _description
-	_description = description
+	getSession().description = description
 	return
 
 def getDescription():
-	return _description
+	return getSession().description
 
 def chooseImportStrategyAcis():
+	if (not FreeCAD.GuiUp):
+		# headless mode (e.g. batch conversion) => use the preselected strategy.
+		return STRATEGY_STEP if (getStrategy() == STRATEGY_STEP) else STRATEGY_SAT
 	btnCnvrt = QPushButton('&Convert to STEP')
 	btnNativ = btnDefault = QPushButton('&nativ')
 	msgBox   = QMessageBox()
@@ -260,6 +328,9 @@ def chooseImportStrategyAcis():
 	return strategy
 
 def chooseImportStrategy():
+	if (not FreeCAD.GuiUp):
+		# headless mode (e.g. batch conversion) => use the preselected strategy.
+		return getStrategy()
 	btnCnvrt = QPushButton('&Convert to STEP')
 	btnSat   = QPushButton('&SAT')
 	btnNativ = QPushButton('&nativ')
@@ -288,23 +359,101 @@ def chooseImportStrategy():
 	setStrategy(strategy)
 	return strategy
 
+def readAllSegments():
+	return __prmPrefIL__.GetBool('Others.ReadAllSegments', False)
+
+def setReadAllSegments(readAll):
+	__prmPrefIL__.SetBool('Others.ReadAllSegments', readAll)
+
+def readAcisHistory():
+	return __prmPrefIL__.GetBool('Others.ReadAcisHistory', False)
+
+def setReadAcisHistory(read):
+	__prmPrefIL__.SetBool('Others.ReadAcisHistory', read)
+
+def isAcisHistoryRequired():
+	'''
+	Returns True if ACIS history sections have to be decoded - otherwise they are skipped while reading.
+	'''
+	return readAcisHistory() or (getDumpFolder() is not None)
+
+def isDumpEnabled():
+	dump = getSession().dumpEnabled
+	if (dump is None):
+		return __prmPrefIL__.GetBool('Others.DumpData', True)
+	return dump
+
+def setDumpEnabled(dump):
+	__prmPrefIL__.SetBool('Others.DumpData', dump)
+
+def overrideDumpEnabled(dump):
+	'''
+	Overrides the preferred dumping for this thread's imports without changing the preferences.
+	dump: True or False or None to use the preferred one again.
+	'''
+	getSession().dumpEnabled = dump
+
+def isModelCacheEnabled():
+	enabled = getSession().modelCache
+	if (enabled is None):
+		return __prmPrefIL__.GetBool('Others.ModelCache', False)
+	return enabled
+
+def setModelCacheEnabled(enabled):
+	__prmPrefIL__.SetBool('Others.ModelCache', enabled)
+
+def isShapeCacheEnabled():
+	enabled = getSession().shapeCache
+	if (enabled is None):
+		return __prmPrefIL__.GetBool('Others.ShapeCache', False)
+	return enabled
+
+def setShapeCacheEnabled(enabled):
+	__prmPrefIL__.SetBool('Others.ShapeCache', enabled)
+
+def overrideCacheEnabled(models, shapes):
+	'''
+	Overrides the preferred cache usage for this thread's imports without changing the preferences.
+	models: True or False or None to use the preferred one again for parsed models.
+	shapes: True or False or None to use the preferred one again for built shapes.
+	'''
+	session = getSession()
+	session.modelCache = models
+	session.shapeCache = shapes
+
+def isRecomputeDeferred():
+	defer = getSession().deferRecompute
+	if (defer is None):
+		return __prmPrefIL__.GetBool('Others.DeferRecompute', False)
+	return defer
+
+def setRecomputeDeferred(defer):
+	__prmPrefIL__.SetBool('Others.DeferRecompute', defer)
+
+def overrideRecomputeDeferred(defer):
+	'''
+	Overrides the preferred recomputing for this thread's imports without changing the preferences.
+	defer: True or False or None to use the preferred one again.
+	'''
+	getSession().deferRecompute = defer
+
 def setCanImport(canImport):
 	global _can_import
 	_can_import = canImport
+	getSession().canImport = canImport
 	return
 
 def canImport():
-	global _can_import
-	return _can_import
+	return getSession().canImport
 
 def setUseSheetMetal(sheetMetal):
 	global _use_sheet_metal
 	_use_sheet_metal = sheetMetal
+	getSession().sheetMetal = sheetMetal
 	return
 
 def useSheetMetal():
-	global _use_sheet_metal
-	return _use_sheet_metal
+	return getSession().sheetMetal
 
 class Thumbnail(object):
 	def __init__(self, data):
@@ -344,21 +493,19 @@ class Thumbnail(object):
 		icon.loadFromData(QByteArray(self.getData()))
 		return icon
 
-_thumbnail = None
 def writeThumbnail(data):
-	global _thumbnail
-	_thumbnail = Thumbnail(data)
+	thumbnail = Thumbnail(data)
+	getSession().thumbnail = thumbnail
 
 	dumpFolder = getDumpFolder()
 	if ((not (dumpFolder is None)) and ParamGet("User parameter:BaseApp/Preferences/Mod/InventorLoader").GetBool('Others.DumpThumbnails', True)):
-		with open(u"%s/_.%s" %(dumpFolder, _thumbnail.type.lower()), 'wb') as thumbnail:
-			thumbnail.write(_thumbnail.getData())
+		with open(u"%s/_.%s" %(dumpFolder, thumbnail.type.lower()), 'wb') as file:
+			file.write(thumbnail.getData())
 
-	return _thumbnail
+	return thumbnail
 
 def getThumbnailImage():
-	global _thumbnail
-	return _thumbnail
+	return getSession().thumbnail
 
 UINT8      = Struct('<B').unpack_from
 SINT8      = Struct('<b').unpack_from
@@ -377,6 +524,80 @@ FLOAT64_2D = Struct('<dd').unpack_from
 FLOAT64_3D = Struct('<ddd').unpack_from
 DATETIME   = Struct('<Q').unpack_from
 
+# typecodes of array.array with the same size as the struct's little endian standard sizes.
+ARRAY_TYPECODES = {'B': 'B', 'b': 'b', 'H': 'H', 'h': 'h', 'f': 'f', 'd': 'd'}
+ARRAY_TYPECODES['L'] = 'I' if (array('I').itemsize == 4) else 'L'
+ARRAY_TYPECODES['l'] = 'i' if (array('i').itemsize == 4) else 'l'
+
+# the number of cached structs - the lengths of the lists are arbitrary.
+STRUCT_CACHE_SIZE = 256
+
+_structs = {}
+def getStructArray(pattern, count):
+	'''
+	Returns the cached struct that unpacks 'count' times the pattern (e.g. 'fL').
+	The cache is cleared if it exceeds STRUCT_CACHE_SIZE structs.
+	'''
+	key = (pattern, count)
+	s = _structs.get(key)
+	if (s is None):
+		if (len(_structs) >= STRUCT_CACHE_SIZE):
+			_structs.clear()
+		s = Struct('<%d%s' %(count, pattern)) if (len(pattern) == 1) else Struct('<' + pattern * count)
+		_structs[key] = s
+	return s
+
+def getDataView(data, offset = 0, size = None):
+	'''
+	Returns a read-only view of the binary data - slices of the view don't copy the data.
+	Args:
+		data
+			A binary string or a view of it.
+		offset
+			The zero based offset of the view.
+		size
+			The size of the view - None for the rest of the data.
+	Returns:
+		The view of the data.
+	'''
+	if (size is None):
+		size = len(data) - offset
+	if (sys.version_info.major < 3):
+		return buffer(data, offset, size)
+	return memoryview(data)[offset:offset + size]
+
+def getArray(data, offset, typecode, size):
+	'''
+	Returns a typed array (array.array) of little endian values.
+	All values are decoded at once - no python object is created per element.
+	Args:
+		data
+			A binary string.
+		offset
+			The zero based offset of the array.
+		typecode
+			The struct's format character of the values (e.g. 'H', 'L' or 'f').
+		size
+			The size of the array.
+	Returns:
+		The typed array of values at offset.
+		The new position in the 'stream'.
+	The fixed size readers (getUInt16A, getFloat64A, ...) still return tuples: they read
+	a few values that are used as tuples (e.g. as format args or concatenated) and for
+	a few values unpacking a struct is faster than creating an array. Lists of arbitrary
+	length should be read with getArray.
+	'''
+	val = array(ARRAY_TYPECODES[typecode])
+	end = int(offset + val.itemsize * size)
+	assert end <= len(data), "Trying to read '%s' array beyond data end (%d, %X > %X)" %(typecode, size, end, len(data))
+	if (sys.version_info.major < 3):
+		val.fromstring(data[offset:end])
+	else:
+		val.frombytes(memoryview(data)[offset:end])
+	if (sys.byteorder == 'big'):
+		val.byteswap()
+	return val, end
+
 def getBoolean(data, offset):
 	'''
 	Returns a single boolean value.
@@ -440,7 +661,7 @@ def getUInt8A(data, offset, size):
 	'''
 	end = int(offset + size)
 	assert end <= len(data), "Trying to read UInt8 array beyond data end (%d, %X > %X)" %(size, end, len(data))
-	val = unpack_from('<' +'B'*int(size), data, offset)
+	val = getStructArray('B', int(size)).unpack_from(data, offset)
 	return val, end
 
 def getUInt16(data, offset):
@@ -472,7 +693,7 @@ def getUInt16A(data, offset, size):
 		The array of unsigned 16-Bit values at offset.
 		The new position in the 'stream'.
 	'''
-	val = unpack_from('<' +'H'*int(size), data, offset)
+	val = getStructArray('H', int(size)).unpack_from(data, offset)
 	return val, int(offset + 2 * size)
 
 def getSInt16(data, offset):
@@ -504,7 +725,7 @@ def getSInt16A(data, offset, size):
 		The array of unsigned 32-Bit values at offset.
 		The new position in the 'stream'.
 	'''
-	val = unpack_from('<' +'h'*int(size), data, offset)
+	val = getStructArray('h', int(size)).unpack_from(data, offset)
 	return val, int(offset + 2 * size)
 
 def getUInt32(data, offset):
@@ -551,7 +772,7 @@ def getUInt32A(data, offset, size):
 		The array of unsigned 32-Bit values at offset.
 		The new position in the 'stream'.
 	'''
-	val = unpack_from('<' +'L'*int(size), data, offset)
+	val = getStructArray('L', int(size)).unpack_from(data, offset)
 	return val, int(offset + 4 * size)
 
 def getSInt32(data, offset):
@@ -598,7 +819,7 @@ def getSInt32A(data, offset, size):
 		The array of signed 32-Bit values at offset.
 		The new position in the 'stream'.
 	'''
-	val = unpack_from('<' + 'l'*int(size), data, offset)
+	val = getStructArray('l', int(size)).unpack_from(data, offset)
 	return val, int(offset + 4 * size)
 
 def getFloat32(data, offset):
@@ -631,8 +852,7 @@ def getFloat32A(data, offset, size):
 		The array of double precision float values from a list of single ones at offset.
 		The new position in the 'stream'.
 	'''
-	singles = unpack_from('<' + 'f'*int(size), data, offset)
-	val = [float(s) for s in singles]
+	val = list(getStructArray('f', int(size)).unpack_from(data, offset))
 	return val, int(offset + 4 * size)
 
 def getFloat32_2D(data, index):
@@ -672,7 +892,7 @@ def getFloat64A(data, offset, size):
 		The array of double precision float values at offset.
 		The new position in the 'stream'.
 	'''
-	val = unpack_from('<' + 'd'*int(size), data, offset)
+	val = getStructArray('d', int(size)).unpack_from(data, offset)
 	return val, int(offset + 8 * size)
 
 def getFloat64_2D(data, index):
@@ -701,7 +921,7 @@ def getUUID(data, offset):
 		The new position in the 'stream'.
 	'''
 	end = offset + 16
-	val = UUID(bytes_le=data[offset:end])
+	val = UUID(bytes_le=bytes(data[offset:end]))
 	return val, end
 
 def getDateTime(data, offset):
@@ -724,7 +944,7 @@ def getDateTime(data, offset):
 def getText8(data, offset, l):
 	i = offset
 	end = i + l
-	txt = data[i: end].decode(ENCODING_FS)
+	txt = bytes(data[i: end]).decode(ENCODING_FS)
 
 	if (txt[-1:] == '\0'):
 		txt = txt[:-1]
@@ -747,7 +967,7 @@ def getLen32Text8(data, offset):
 def getLen32Text16(data, offset):
 	l, i = getUInt32(data, offset)
 	end = i + 2 * l
-	txt = data[i: end].decode('UTF-16LE')
+	txt = bytes(data[i: end]).decode('UTF-16LE')
 	if (txt[-1:] == '\0'):
 		txt = txt[:-1]
 
@@ -813,34 +1033,78 @@ def _log(caller, method, msg, args):
 		Console.PrintError("msg   = " + msg)
 		if (len(args) > 0): Console.PrintError("*args = (%s)" %(",".join(args)))
 
+class NullSink(object):
+	'''
+	Log sink that discards all messages.
+	'''
+	def PrintMessage(self, msg): return
+	def PrintWarning(self, msg): return
+	def PrintError(self, msg):   return
+
+# The enabled log levels are cached - the preferences are only read if they change.
+_logSink    = Console
+_logInfo    = False
+_logWarning = False
+_logError   = True
+
+def refreshLogLevels():
+	global _logInfo, _logWarning, _logError
+	active = not isinstance(_logSink, NullSink)
+	_logInfo    = active and __prmPrefOW__.GetBool("checkLogging", False)
+	_logWarning = active and __prmPrefOW__.GetBool("checkWarning", False)
+	_logError   = active and __prmPrefOW__.GetBool("checkError", True)
+
+def setLogSink(sink):
+	'''
+	Routes all messages to the sink (an object like FreeCAD.Console) - None discards them.
+	'''
+	global _logSink
+	_logSink = NullSink() if (sink is None) else sink
+	refreshLogLevels()
+
+def getLogSink():
+	return _logSink
+
+class _LogLevelObserver(object):
+	def onChange(self, grp, name):
+		if (name in ('checkLogging', 'checkWarning', 'checkError')):
+			refreshLogLevels()
+
+_logObserver = _LogLevelObserver()
+try:
+	__prmPrefOW__.Attach(_logObserver)
+except:
+	pass # parameter group can't be observed => levels will be refreshed for each import.
+refreshLogLevels()
+
 def setLoggingInfo(val):
 	__prmPrefOW__.SetInt("checkLogging", val)
+	refreshLogLevels()
 def setLoggingWarn(val):
 	__prmPrefOW__.SetInt("checkWarning", val)
+	refreshLogLevels()
 def setLoggingError(val):
 	__prmPrefOW__.SetInt("checkError", val)
+	refreshLogLevels()
 
 def logInfo(msg, *args):
-	if (__prmPrefOW__.GetBool("checkLogging", False)): _log("logInfo",    Console.PrintMessage, msg, args)
+	if (_logInfo):    _log("logInfo",    _logSink.PrintMessage, msg, args)
 def logWarning(msg, *args):
-	if (__prmPrefOW__.GetBool("checkWarning", False)): _log("logWarning", Console.PrintWarning, msg, args)
+	if (_logWarning): _log("logWarning", _logSink.PrintWarning, msg, args)
 def logError(msg, *args):
-	if (__prmPrefOW__.GetBool("checkError", True)):    _log("logError",   Console.PrintError,   msg, args)
+	if (_logError):   _log("logError",   _logSink.PrintError,   msg, args)
 
 def logAlways(msg, *args):
-	_log("logAlways", Console.PrintMessage, msg, args)
+	_log("logAlways", _logSink.PrintMessage, msg, args)
 
 def getFileVersion():
-	global _fileVersion
-	return _fileVersion
+	return getSession().fileVersion
 
 def getFileBeta():
-	global _fileBeta
-	return _fileBeta
+	return getSession().fileBeta
 
 def getBlockSize():
-	global _block_size
-	return _block_size
+	return getSession().blockSize
 
 def getProperty(ole, path, key):
 	p = ole.getproperties([path], convert_time=True)
@@ -853,44 +1117,51 @@ def getProperty(ole, path, key):
 	except:
 		return None
 
-def setFileVersion(ole):
-	global _fileVersion, _fileBeta, _block_size
-
-	v = None
+def getInventorVersion(ole):
+	'''
+	Returns the Inventor version, the beta number (-1 for releases), the build number
+	and the version text (None for files older than 2010) of the OLE file.
+	'''
 	b = getProperty(ole, '\x05Qz4dgm1gRjudbpksAayal4qdGf', 0x16)
 
 	if (b is not None):
 		if ((b // 10000000) == 14):
-			_fileVersion = 2010
+			version = 2010
 		else:
-			_fileVersion = 2009
+			version = 2009
 	else:
 		b = 0
-		_fileVersion = 2008
-	_fileBeta = -1
+		version = 2008
+	fileBeta = -1
 	v = getProperty(ole, '\x05PypkizqiUjudbposAayal4qdGf', 0x43)
 	if (v is not None):
-		_fileVersion = int(float(v[0:v.index(' ')])) # float because of service pack numbers!
+		version = int(float(v[0:v.index(' ')])) # float because of service pack numbers!
 		beta = IS_BETA.search(v)
 		if (beta):
-			_fileBeta = int(beta.group(1))
+			fileBeta = int(beta.group(1))
+			if (fileBeta < 2) and (version < 2018):
+				version -= 1
+		if (version == 134): # early version of 2010
+			version = 2010
+	return version, fileBeta, b, v
+
+def setFileVersion(ole):
+	session = getSession()
+
+	session.fileVersion, session.fileBeta, b, v = getInventorVersion(ole)
+	if (v is not None):
+		if (session.fileBeta >= 0):
 			logWarning("   File was created with a BETA version (%s) - patching file version!", v)
-			if (_fileBeta < 2) and (_fileVersion < 2018):
-				_fileVersion -= 1
-		if (_fileVersion == 134): # early version of 2010
-			_fileVersion = 2010
 		logInfo(u"    created with Autodesk Inventor %s", v)
 	else:
-		logInfo(u"    created with Autodesk Inventor %s (Build %d)", _fileVersion, b)
-	_block_size = 4 if (_fileVersion < 2011) else 0
+		logInfo(u"    created with Autodesk Inventor %s (Build %d)", session.fileVersion, b)
+	session.blockSize = 4 if (session.fileVersion < 2011) else 0
 
 def getInventorFile():
-	global _inventor_file
-	return _inventor_file
+	return getSession().inventorFile
 
 def getDumpFolder():
-	global _dump_folder
-	return _dump_folder
+	return getSession().dumpFolder
 
 def cleanDumpFolder():
 	folder = getDumpFolder()
@@ -902,17 +1173,21 @@ def cleanDumpFolder():
 			shutil.rmtree(p)
 
 def setDumpFolder(anyInputFile):
-	global _dump_folder
+	session = getSession()
+	session.dumpFolder = None
+	if (not isDumpEnabled()):
+		# production mode: don't touch the file system at all!
+		return
 	fileParts = os.path.splitext(anyInputFile)
-	_dump_folder = u"%s_%s" %(fileParts[0], fileParts[1][1:])
+	session.dumpFolder = u"%s_%s" %(fileParts[0], fileParts[1][1:])
 
-	if (os.path.exists(_dump_folder)):
+	if (os.path.exists(session.dumpFolder)):
 		cleanDumpFolder()
 	else:
 		try:
-			os.mkdir(_dump_folder)
+			os.mkdir(session.dumpFolder)
 		except:
-			_dump_folder = None
+			session.dumpFolder = None
 			# can't create folder, e.g. insuficien usr right.
 			tmp = os.getenv('TEMP')
 			if ((tmp is None) or (not os.path.exists(tmp))):
@@ -927,31 +1202,29 @@ def setDumpFolder(anyInputFile):
 						if (not os.path.exists(tmp)):
 							try:
 								os.mkdir(tmp)
-								logWarning(u"Can't locate system's TEMP folder! - using '%s'" %(tmp))
+								logWarning(u"Can't locate system's TEMP folder! - using '%s'", tmp)
 							except:
 								tmp = None
 			if (not tmp is None):
 				ifile = os.path.splitext(os.path.basename(anyInputFile))
-				_dump_folder = os.path.join(tmp, "%s_%s" %(ifile[0], ifile[1][1:]))
+				session.dumpFolder = os.path.join(tmp, "%s_%s" %(ifile[0], ifile[1][1:]))
 				try:
-					if (not os.path.exists(_dump_folder)):
-						os.mkdir(_dump_folder)
+					if (not os.path.exists(session.dumpFolder)):
+						os.mkdir(session.dumpFolder)
 					else:
 						cleanDumpFolder()
 				except:
-					_dump_folder = None
-			if (_dump_folder is None):
+					session.dumpFolder = None
+			if (session.dumpFolder is None):
 				logWarning(u"Can't locate any dump folder! Ignoring dump files!")
 			else:
-				logWarning(u"Using TEMP folder for dumping files: '%s'" %(_dump_folder))
+				logWarning(u"Using TEMP folder for dumping files: '%s'", session.dumpFolder)
 
 
 def setInventorFile(file):
-	global _inventor_file
-	global _dump_folder
-
-	_inventor_file = os.path.abspath(file)
-	setDumpFolder(_inventor_file)
+	session = getSession()
+	session.inventorFile = os.path.abspath(file)
+	setDumpFolder(session.inventorFile)
 	return OleFileIO(file)
 
 def isString(value):
@@ -1035,7 +1308,7 @@ def calcAliasname(name):
 def _addEmpty(node, indexes, list):
 	for i in indexes:
 		name = 'lst%d' %(i)
-		node.content += ' %s=[]' %(name)
+		node.appendContent(' %s=[]' %(name))
 		node.set(name, list)
 
 def addEmptyLists(node, indexes):
@@ -1048,4 +1321,4 @@ def reshape(nums, size):
 #	from numpy import reshape as np_reshape
 #	return np_reshape(values, (-1, size))
 	if size == 1: return nums
-	return [[nums[size * i + j] for j in range(size)] for i in range(len(nums) // size)]
+	return [list(nums[i:i + size]) for i in range(0, len(nums) - len(nums) % size, size)]
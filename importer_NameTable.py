@@ -27,7 +27,7 @@ class NameTableReader(SegmentReader): # for BRep and DC
 		idx, i = getUInt32(node.data, i)
 		entry  = NtEntry(nt, idx)
 		node.set(name, entry)
-		node.content += u" %s=[%r]" %(name, entry)
+		node.appendContent(u" %s=[%r]" %(name, entry))
 		return i
 
 	def ReadNtEntryList(self, node, offset, name):
@@ -37,7 +37,7 @@ class NameTableReader(SegmentReader): # for BRep and DC
 			nt, i  = getUInt32(node.data, i)
 			idx, i = getUInt32(node.data, i)
 			lst.append(NtEntry(nt, idx))
-		node.content += ' %s=[%s]' %(name, ','.join(['[%r]' %(e) for e in lst]))
+		node.appendContent(' %s=[%s]' %(name, ','.join(['[%r]' %(e) for e in lst])))
 		node.set(name, lst)
 		return i
 
@@ -49,7 +49,7 @@ class NameTableReader(SegmentReader): # for BRep and DC
 			idx, i  = getUInt32(node.data, i)
 			val, i  = getUInt8(node.data, i)
 			lst.append([NtEntry(nt, idx), val])
-		node.content += ' %s={%s}' %(name, ','.join(['(%r:%02X)' %(e[0], e[1]) for e in lst]))
+		node.appendContent(' %s={%s}' %(name, ','.join(['(%r:%02X)' %(e[0], e[1]) for e in lst])))
 		node.set(name, lst)
 		return i
 
@@ -61,7 +61,7 @@ class NameTableReader(SegmentReader): # for BRep and DC
 			idx, i = getUInt32(node.data, i)
 			val, i = getFloat64(node.data, i)
 			lst.append([NtEntry(nt, idx), val])
-		node.content += ' %s=[%s]' %(name, ','.join(['(%r,%g)' %(r[0], r[1]) for r in lst]))
+		node.appendContent(' %s=[%s]' %(name, ','.join(['(%r,%g)' %(r[0], r[1]) for r in lst])))
 		node.set(name, lst)
 		return i
 
@@ -94,7 +94,7 @@ class NameTableReader(SegmentReader): # for BRep and DC
 			a1, i = getUInt32A(node.data, i, 3)
 			a2, i = getUInt32A(node.data, i, size)
 			lst.append([a1, a2])
-		node.content += ' %s=[%s]' %(name, ','.join(['(%s,[%s])' %(IntArr2Str(a1, 4), IntArr2Str(a2, 4)) for a1, a2 in lst]))
+		node.appendContent(' %s=[%s]' %(name, ','.join(['(%s,[%s])' %(IntArr2Str(a1, 4), IntArr2Str(a2, 4)) for a1, a2 in lst])))
 		node.set(name, lst)
 		return i
 
@@ -162,11 +162,9 @@ class NameTableReader(SegmentReader): # for BRep and DC
 		i = self.ReadRefU32ARefU32List(node, i, 'lst1', 2)
 		i = self.ReadRefU32ARefU32List(node, i, 'lst2', 1)
 		cnt, i = getUInt32(node.data, i)
-		sep = ''
-		node.content += ' lst3=['
 		lst = []
 		# remember node content as it will be overwritten by ReadList2!
-		c = node.content
+		c = node.markContent()
 		for j in range(cnt):
 			u32_0, i = getUInt32(node.data, i)
 			i = node.ReadList2(i, _TYP_UINT32_A_, 'tmp', 2)
@@ -174,11 +172,10 @@ class NameTableReader(SegmentReader): # for BRep and DC
 			u32_1, i = getUInt32(node.data, i)
 			i = node.ReadList2(i, _TYP_UINT32_A_, 'tmp', 2) # this is ref + uint!
 			lst1 = node.get('tmp')
-			c += '%s[%04X,%s,%04X,%s]' %(sep, u32_0, Int2DArr2Str(lst0, 4), u32_1, Int2DArr2Str(lst1, 4))
 			lst.append([u32_0, lst0, u32_1, lst1])
-			sep = ','
 		node.delete('tmp')
-		node.content = c + ']'
+		node.resetContent(c)
+		node.appendContent(lambda lst: ' lst3=[%s]' %(','.join(['[%04X,%s,%04X,%s]' %(a[0], Int2DArr2Str(a[1], 4), a[2], Int2DArr2Str(a[3], 4)) for a in lst])), lst)
 		node.set('lst3', lst)
 		return i
 
@@ -277,7 +274,7 @@ class NameTableReader(SegmentReader): # for BRep and DC
 		i = self.ReadNtEntry(node, i, 'edge')
 		i = self.skipBlockSize(i)
 		i = node.ReadUInt32A(i, 3, 'a1')
-		node.content += u" a2=[] a3=[] a4=[] a5=[0000,0000,0000]"
+		node.appendContent(u" a2=[] a3=[] a4=[] a5=[0000,0000,0000]")
 		node.set('a2', [])
 		node.set('a3', [])
 		node.set('a4', [])
@@ -397,7 +394,7 @@ class NameTableReader(SegmentReader): # for BRep and DC
 		for j in range(cnt):
 			a, i = getUInt32A(node.data, i, 7)
 			lst.append(a)
-		node.content += ' lst2=[%s]' %(','.join(['[%s]' %("," .join(["%04X" %(m) for m in a])) for a in lst]))
+		node.appendContent(' lst2=[%s]' %(','.join(['[%s]' %("," .join(["%04X" %(m) for m in a])) for a in lst])))
 		node.set('lst2', lst)
 		return i
 